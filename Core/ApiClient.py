@@ -0,0 +1,95 @@
+import time
+
+from googleapiclient.errors import HttpError
+from Core.Quota import QuotaExhausted
+from Core.Resilience import CircuitBreaker, RetryPolicy, ENDPOINT_TIMEOUTS, DEFAULT_TIMEOUT, is_transient
+
+class ApiClient:
+    """
+    Thin proxy around the googleapiclient `youtube` Resource.
+    Call sites keep the usual `client.search().list(...).execute()` chain,
+    but every execute() is routed through ApiClient.execute so it can be
+    metered against the quota ledger, sent over the shared HTTP pool, and
+    retried/short-circuited by the resilience layer (Core.Resilience).
+    """
+    def __init__(self, service, ledger, transport=None, breaker=None, retry=None):
+        self.service = service
+        self.ledger = ledger
+        self.transport = transport
+        self.breaker = breaker or CircuitBreaker()
+        self.retry = retry or RetryPolicy()
+
+    def __getattr__(self, name):
+        factory = getattr(self.service, name)
+        def resource(*args, **kwargs):
+            return _Resource(self, name, factory(*args, **kwargs))
+        return resource
+
+    def execute(self, request, endpoint, **kwargs):
+        """
+        Sends the request with bounded, jittered retries on transient errors.
+        Raises CircuitOpenError right away while the breaker is open.
+        """
+        delays = self.retry.delays()
+        while True:
+            if not self.ledger.can_afford(endpoint):
+                raise QuotaExhausted(f"Daily API quota too low for {endpoint}")
+            self.breaker.before_call()
+            try:
+                result = self._send(request, endpoint, **kwargs)
+            except Exception as e:
+                if not is_transient(e):
+                    # The server answered (4xx, quota...): the link itself is fine
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                delay = next(delays, None)
+                if delay is None or self.breaker.is_open():
+                    raise
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    def _send(self, request, endpoint, **kwargs):
+        # The API bills every call that reaches it, error status or not; a
+        # timeout, DNS failure or refused connection never got there and is free
+        try:
+            if self.transport is None or "http" in kwargs:
+                result = request.execute(**kwargs)
+            else:
+                self.transport.prepare(request)
+                with self.transport.connection(ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)) as http:
+                    result = request.execute(http=http, **kwargs)
+        except HttpError as e:
+            self.ledger.charge(endpoint)
+            if e.resp.status == 403 and (b"quotaExceeded" in e.content or b"dailyLimitExceeded" in e.content):
+                self.ledger.mark_exhausted()
+            raise
+        self.ledger.charge(endpoint)
+        return result
+
+class _Resource:
+    def __init__(self, client, name, resource):
+        self._client = client
+        self._name = name
+        self._resource = resource
+
+    def __getattr__(self, method):
+        func = getattr(self._resource, method)
+        def build_request(*args, **kwargs):
+            return _Request(self._client, f"{self._name}.{method}", func(*args, **kwargs))
+        return build_request
+
+class _Request:
+    def __init__(self, client, endpoint, request):
+        self._client = client
+        self.endpoint = endpoint
+        self.request = request
+
+    def __getattr__(self, name):
+        # headers, uri, etc. of the wrapped HttpRequest
+        return getattr(self.request, name)
+
+    def execute(self, **kwargs):
+        return self._client.execute(self.request, self.endpoint, **kwargs)
@@ -0,0 +1,178 @@
+import json
+import os
+import random
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse, parse_qs
+
+import httplib2
+
+# Query parameters that don't change which data comes back
+IGNORED_PARAMS = ("key", "alt", "prettyPrint", "fields")
+
+def replay_settings(config):
+    """
+    Replay settings from config["api_replay"], overridden by the environment:
+    YT_API_REPLAY (off/replay/record), YT_API_FIXTURES (dir),
+    YT_API_LATENCY_MS and YT_API_ERROR_RATE (0.0-1.0).
+    """
+    settings = {"mode": "off", "fixtures": None, "latency_ms": 0, "error_rate": 0.0}
+    settings.update(config.get("api_replay") or {})
+    env = os.environ
+    if env.get("YT_API_REPLAY"):
+        settings["mode"] = env["YT_API_REPLAY"]
+    if env.get("YT_API_FIXTURES"):
+        settings["fixtures"] = env["YT_API_FIXTURES"]
+    try:
+        if env.get("YT_API_LATENCY_MS"):
+            settings["latency_ms"] = int(env["YT_API_LATENCY_MS"])
+        if env.get("YT_API_ERROR_RATE"):
+            settings["error_rate"] = float(env["YT_API_ERROR_RATE"])
+    except ValueError:
+        pass
+    return settings
+
+def _request_key(uri):
+    """(endpoint, params) for a Data API URI, e.g. ('search', {'q': 'x', ...})."""
+    parsed = urlparse(uri)
+    endpoint = parsed.path.rstrip("/").rsplit("/", 1)[-1]
+    params = {k: v[0] for k, v in parse_qs(parsed.query).items() if k not in IGNORED_PARAMS}
+    return endpoint, params
+
+class FixtureStore:
+    """
+    Recorded API responses, one JSON file per endpoint (fixtures/api/search.json...),
+    each a list of {"params": {...}, "status": int, "body": {...}}.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def _path(self, endpoint):
+        return os.path.join(self.directory, f"{endpoint}.json")
+
+    def _load(self, endpoint):
+        if endpoint not in self.entries:
+            try:
+                with open(self._path(endpoint), "r", encoding="utf-8") as f:
+                    self.entries[endpoint] = json.load(f)
+            except (OSError, ValueError):
+                self.entries[endpoint] = []
+        return self.entries[endpoint]
+
+    def lookup(self, endpoint, params):
+        """Returns (status, body) for the best recorded match, or (404, error body)."""
+        with self.lock:
+            entries = self._load(endpoint)
+            for entry in entries:
+                if entry["params"] == params:
+                    return entry.get("status", 200), entry["body"]
+
+            if endpoint == "videos" and "id" in params:
+                # Any batch of IDs can be assembled from individually recorded items
+                known = {}
+                for entry in entries:
+                    for item in entry["body"].get("items", []):
+                        known[item["id"]] = item
+                ids = params["id"].split(",")
+                return 200, {"items": [known[v] for v in ids if v in known]}
+
+            if params.get("pageToken"):
+                return 200, {"items": []} # Unknown page: end the listing
+            for entry in entries:
+                if entry.get("status", 200) == 200:
+                    return 200, entry["body"] # Fixture always answers something
+
+        return 404, {"error": {"code": 404, "message": f"No recorded response for {endpoint}"}}
+
+    def record(self, endpoint, params, status, body):
+        with self.lock:
+            entries = [e for e in self._load(endpoint) if e["params"] != params]
+            entries.append({"params": params, "status": status, "body": body})
+            self.entries[endpoint] = entries
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                tmp_path = self._path(endpoint) + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(entries, f, indent=1)
+                os.replace(tmp_path, self._path(endpoint))
+            except OSError:
+                pass
+
+class ReplayHttp:
+    """httplib2.Http stand-in that answers from a FixtureStore."""
+    def __init__(self, store, latency_ms=0, error_rate=0.0, rng=None):
+        self.store = store
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.rng = rng or random.Random()
+        self.timeout = None
+        self.connections = {}
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        if self.latency_ms:
+            delay = self.latency_ms / 1000.0
+            if self.timeout and delay > self.timeout:
+                time.sleep(self.timeout)
+                raise socket.timeout("timed out")
+            time.sleep(delay)
+
+        if self.error_rate and self.rng.random() < self.error_rate:
+            # Half the injected failures are timeouts, half server errors
+            if self.rng.random() < 0.5:
+                raise socket.timeout("timed out (injected)")
+            status, data = 503, {"error": {"code": 503, "message": "Backend Error (injected)"}}
+        else:
+            status, data = self.store.lookup(*_request_key(uri))
+
+        resp = httplib2.Response({"status": str(status), "content-type": "application/json; charset=UTF-8"})
+        return resp, json.dumps(data).encode("utf-8")
+
+class RecordingHttp:
+    """Wraps a real transport and stores every successful response."""
+    def __init__(self, http, store):
+        self.http = http
+        self.store = store
+
+    def __getattr__(self, name):
+        return getattr(self.http, name)
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        resp, content = self.http.request(uri, method, body=body, headers=headers, **kwargs)
+        if method == "GET" and resp.status == 200:
+            try:
+                self.store.record(*_request_key(uri), 200, json.loads(content.decode("utf-8")))
+            except ValueError:
+                pass
+        return resp, content
+
+class ReplayTransport:
+    """
+    Drop-in for HttpPool in ApiClient.
+    mode "replay" serves fixtures (offline, with optional latency/error injection);
+    mode "record" sends requests over `pool` and saves the responses as fixtures.
+    """
+    def __init__(self, directory, mode="replay", pool=None, latency_ms=0, error_rate=0.0):
+        self.store = FixtureStore(directory)
+        self.mode = mode
+        self.pool = pool
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.rng = random.Random()
+
+    def prepare(self, request):
+        if self.pool is not None:
+            self.pool.prepare(request)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        if self.mode == "record":
+            with self.pool.connection(timeout) as http:
+                yield RecordingHttp(http, self.store)
+            return
+        http = ReplayHttp(self.store, self.latency_ms, self.error_rate, self.rng)
+        http.timeout = timeout
+        yield http
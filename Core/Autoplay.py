@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from Core.FormatCache import best_audio
+
+class AutoplayQueue:
+    """
+    In-memory pool of upcoming autoplay tracks, filled in the background.
+    While a track plays, prime() makes sure the pool holds candidates (one
+    related search per refill, only below the low-water mark) and that the
+    head candidate already has its metadata and a direct stream URL, so the
+    next track can start without a "Finding next song..." pause.
+    The pool belongs to the track that seeded it and the autoplay tracks
+    served from it; starting any other track drops it.
+    """
+    def __init__(self, app, low_water=2):
+        self.app = app
+        self.low_water = low_water
+        self.pool = deque()
+        self.lock = threading.Lock()
+        # Single worker: refills and stream lookups never race each other
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="yt-autoplay")
+        self.refill_future = None
+        self.refill_seed = None
+        self.seed_id = None # Track the pool's candidates were found for
+        self.chain = set() # The seed plus the autoplay tracks served from its pool
+
+    def prime(self, video_id, title, reseed=False):
+        """
+        Called when a track starts: refill if low, then resolve the next-up
+        candidate. reseed=True (a track the user picked) starts a new pool.
+        """
+        with self.lock:
+            self._follow(video_id, reseed)
+            self._drop_played(video_id)
+            if len(self.pool) < self.low_water and not self._refilling():
+                self._submit_refill(video_id, title)
+        self.executor.submit(self._resolve_head)
+
+    def take(self, video_id, title, wait=True):
+        """
+        Returns the next candidate ({id, title, duration, stream_url...}) or None.
+        If the pool is empty, waits for the running (or a new) refill when wait is True.
+        """
+        with self.lock:
+            self._follow(video_id)
+            self._drop_played(video_id)
+            if self.pool:
+                return self._pop()
+            if not wait:
+                return None
+            if not self._refilling():
+                self._submit_refill(video_id, title)
+            fut = self.refill_future
+
+        try:
+            fut.result()
+        except Exception:
+            return None
+        with self.lock:
+            self._drop_played(video_id)
+            return self._pop() if self.pool else None
+
+    def clear(self):
+        with self.lock:
+            self.pool.clear()
+            self.seed_id = None
+            self.chain = set()
+
+    def _follow(self, video_id, reseed=False):
+        # A track outside the current chain makes the pool's candidates stale
+        if reseed or video_id not in self.chain:
+            self.pool.clear()
+            self.seed_id = video_id
+            self.chain = {video_id}
+
+    def _pop(self):
+        candidate = self.pool.popleft()
+        self.chain.add(candidate["id"])
+        return candidate
+
+    def _submit_refill(self, video_id, title):
+        self.refill_seed = self.seed_id
+        self.refill_future = self.executor.submit(self._refill, self.seed_id, video_id, title)
+
+    def _refilling(self):
+        # A refill still running for an older seed doesn't count
+        return self.refill_future is not None and not self.refill_future.done() and self.refill_seed == self.seed_id
+
+    def _drop_played(self, current_id):
+        recent = set(self.app.recent_history_ids(20))
+        recent.add(current_id)
+        self.pool = deque(c for c in self.pool if c["id"] not in recent)
+
+    def _refill(self, seed, video_id, title):
+        candidates = self.app.get_related_candidates(video_id, title)
+        if not candidates:
+            return
+
+        # Durations/titles from the metadata cache (or one batched lookup)
+        details = {}
+        try:
+            if self.app.search_backends["api"].available():
+                missing = self.app.metadata_cache.missing([c["id"] for c in candidates])
+                if missing:
+                    self.app.resolver.resolve(missing)
+            details = self.app.metadata_cache.get_many([c["id"] for c in candidates])
+        except Exception:
+            pass
+
+        with self.lock:
+            if seed != self.seed_id:
+                return # The user moved on while this search ran
+            known = {c["id"] for c in self.pool}
+            for c in candidates:
+                if c["id"] in known:
+                    continue
+                info = details.get(c["id"], {})
+                self.pool.append({
+                    "id": c["id"],
+                    "title": info.get("title", c["title"]),
+                    "duration": c.get("duration") or info.get("duration")
+                })
+        self._resolve_head()
+
+    def _resolve_head(self):
+        with self.lock:
+            head = self.pool[0] if self.pool else None
+        if head and not self._stream_valid(head):
+            try:
+                self._resolve_stream(head)
+            except Exception:
+                pass # mpv will resolve the watch URL itself
+
+    @staticmethod
+    def _stream_valid(candidate):
+        return candidate.get("stream_url") and candidate.get("stream_expires", 0) > time.time() + 60
+
+    def _resolve_stream(self, candidate):
+        # Shared with the video player and downloads (one extraction per video)
+        info = self.app.format_cache.get(candidate["id"])
+        stream = best_audio(info)
+        if not stream:
+            return
+        candidate["stream_expires"] = self.app.format_cache.expires_at(candidate["id"])
+        candidate["stream_headers"] = stream.get("http_headers") or info.get("http_headers") or {}
+        if info.get("duration"):
+            candidate["duration"] = float(info["duration"])
+        candidate["stream_url"] = stream["url"]
@@ -0,0 +1,77 @@
+import threading
+import time
+
+class BandwidthScheduler:
+    """
+    Shares the link between streaming playback and background downloads.
+    The player reports mpv's cache health (paused-for-cache and
+    demuxer-cache-duration, read over IPC); downloads call throttle() from
+    their yt-dlp progress hooks with the bytes they just received, and it
+    sleeps the calling thread for as long as the total rate is over the cap.
+    The hooks fire for plain HTTP downloads and for every DASH/HLS fragment
+    thread alike, so one shared bucket caps all of them together and a
+    change of cap applies to downloads already running.
+    While playback is starving (stalled on the cache, or less than
+    `low_cache` seconds buffered) downloads drop to `starving_rate` bytes/s
+    in total, and they stay there until the buffer is back above
+    `high_cache` seconds. Otherwise they get the user's `limit` (0 = no cap).
+    """
+    BURST = 0.5 # Seconds of traffic allowed through before sleeping
+    STEP = 0.25 # Longest single sleep, so a lifted cap is noticed quickly
+
+    def __init__(self, limit=0, low_cache=5.0, high_cache=15.0, starving_rate=64 * 1024, report_timeout=5.0):
+        self.limit = limit
+        self.low_cache = low_cache
+        self.high_cache = high_cache
+        self.starving_rate = starving_rate
+        self.report_timeout = report_timeout
+        self.lock = threading.Lock()
+        self.starving = False
+        self.last_report = 0
+        self.bucket_lock = threading.Lock()
+        self.debt = 0.0 # Bytes received beyond what the current rate has paid off
+        self.paid_at = time.monotonic()
+
+    def report_playback(self, paused_for_cache, cache_seconds):
+        """Called from the player loop while a network stream plays."""
+        with self.lock:
+            self.last_report = time.monotonic()
+            if paused_for_cache or (cache_seconds is not None and cache_seconds < self.low_cache):
+                self.starving = True
+            elif cache_seconds is None or cache_seconds >= self.high_cache:
+                self.starving = False
+
+    def playback_stopped(self):
+        with self.lock:
+            self.starving = False
+            self.last_report = 0
+
+    def is_throttling(self):
+        with self.lock:
+            # A player that stopped reporting (crashed, local file) no longer needs protecting
+            return self.starving and time.monotonic() - self.last_report < self.report_timeout
+
+    def total_rate(self):
+        """Current cap for all downloads together in bytes/s (None = unlimited)."""
+        if self.is_throttling():
+            return min(self.starving_rate, self.limit) if self.limit else self.starving_rate
+        return self.limit or None
+
+    def throttle(self, nbytes, cancelled=None):
+        """Accounts for `nbytes` just downloaded and sleeps while over the cap."""
+        with self.bucket_lock:
+            self.debt += nbytes
+        while True:
+            rate = self.total_rate()
+            with self.bucket_lock:
+                now = time.monotonic()
+                if rate is None:
+                    self.debt = 0.0
+                    self.paid_at = now
+                    return
+                self.debt = max(0.0, self.debt - (now - self.paid_at) * rate)
+                self.paid_at = now
+                excess = self.debt - rate * self.BURST
+            if excess <= 0 or (cancelled and cancelled()):
+                return
+            time.sleep(min(excess / rate, self.STEP))
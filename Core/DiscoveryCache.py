@@ -0,0 +1,99 @@
+import json
+import os
+import time
+
+DISCOVERY_URL = "https://www.googleapis.com/discovery/v1/apis/youtube/v3/rest"
+
+class DiscoveryCache:
+    """
+    Keeps the YouTube v3 discovery document on disk so the API client can be
+    built with build_from_document() instead of fetching it on every launch.
+    The stored copy is revalidated (ETag + revision) once it is older than max_age.
+    """
+    def __init__(self, path, max_age=7 * 24 * 3600):
+        self.path = path
+        self.max_age = max_age
+        self.meta = None
+
+    def _read(self):
+        if self.meta is None and os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.meta = json.load(f)
+            except:
+                self.meta = None
+        return self.meta
+
+    def _write(self, document, revision, etag, fetched_at=None):
+        self.meta = {
+            "fetched_at": time.time() if fetched_at is None else fetched_at,
+            "revision": revision,
+            "etag": etag,
+            "document": document
+        }
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.meta, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _revision(document):
+        try:
+            return json.loads(document).get("revision")
+        except ValueError:
+            return None
+
+    def document(self):
+        """
+        Returns the discovery document (JSON string) without touching the network
+        when possible: disk copy first, then the copy bundled with googleapiclient.
+        """
+        meta = self._read()
+        if meta and meta.get("document"):
+            return meta["document"]
+
+        try:
+            from googleapiclient.discovery_cache import get_static_doc
+            document = get_static_doc("youtube", "v3")
+        except Exception:
+            document = None
+
+        if document:
+            # Seed the cache but mark it old so the next refresh revalidates it
+            self._write(document, self._revision(document), None, fetched_at=0)
+            return document
+
+        return self.refresh()
+
+    def is_stale(self):
+        meta = self._read()
+        return not meta or time.time() - meta.get("fetched_at", 0) > self.max_age
+
+    def refresh(self):
+        """
+        Revalidates the stored document against Google's discovery service.
+        Returns the current document, or None if nothing could be loaded.
+        """
+        from googleapiclient.http import build_http
+
+        meta = self._read() or {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+
+        resp, content = build_http().request(DISCOVERY_URL, "GET", headers=headers)
+        if resp.status == 304 and meta.get("document"):
+            self._write(meta["document"], meta.get("revision"), meta.get("etag"))
+            return meta["document"]
+        if resp.status != 200:
+            return meta.get("document")
+
+        document = content.decode("utf-8")
+        revision = self._revision(document)
+        if revision and revision == meta.get("revision"):
+            document = meta["document"] # Same version: keep the copy we already parse
+        self._write(document, revision, resp.get("etag"))
+        return document
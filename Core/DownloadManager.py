@@ -0,0 +1,550 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import yt_dlp
+from Core.Library import title_key, AUDIO_EXTENSIONS
+
+class _QuietLogger:
+    """Keeps yt-dlp from printing over the UI; errors surface as job.error."""
+    def debug(self, msg): pass
+    def info(self, msg): pass
+    def warning(self, msg): pass
+    def error(self, msg): pass
+
+class DownloadCancelled(Exception):
+    pass
+
+# Qualities used for bulk downloads (no per-track prompt); MP4 heights are caps
+DOWNLOAD_PROFILES = {
+    "high": {"mp3": "320", "mp4": "<=1080"},
+    "standard": {"mp3": "192", "mp4": "<=720"},
+    "small": {"mp3": "128", "mp4": "<=480"}
+}
+DEFAULT_PROFILE = "standard"
+
+def format_bytes(num):
+    for unit in ("B", "KB", "MB", "GB"):
+        if num < 1024 or unit == "GB":
+            return f"{num:.0f} {unit}" if unit == "B" else f"{num:.1f} {unit}"
+        num /= 1024
+
+def format_eta(seconds):
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+class DownloadManager:
+    """
+    Background download queue.
+    Jobs are rows in the library's download_jobs table, so anything still
+    queued (or cut off mid-download) when the app exits is picked up again
+    on the next launch. `workers` threads take jobs from an in-memory queue
+    and run yt-dlp with a progress hook that only updates the job dict;
+    the UI reads summary() / jobs_snapshot() whenever it redraws.
+
+    The same table is the download state journal: while a job runs, its
+    partial (.part) file and byte count are written every JOURNAL_INTERVAL
+    seconds. yt-dlp continues a .part file with a byte-range request when
+    the same output name is downloaded again, so an interrupted or failed
+    job that left bytes on disk resumes where it stopped instead of
+    starting over.
+    """
+    JOURNAL_INTERVAL = 2.0
+    MAX_FAILURES = 3 # Failed attempts before a job is no longer resumed on launch
+    def __init__(self, library, download_dir, ffmpeg_locator, workers=2, format_cache=None, scheduler=None, fragments=4):
+        self.library = library
+        self.format_cache = format_cache
+        self.scheduler = scheduler # BandwidthScheduler: speed caps that yield to playback
+        self.fragments = fragments
+        self.conn = library.conn
+        self.db_lock = library.lock
+        self.download_dir = download_dir
+        self.ffmpeg_locator = ffmpeg_locator
+        self._ffmpeg_path = None
+        self.lock = threading.Lock()
+        self.jobs = {} # job id -> job dict (this session + restored)
+        self.batches = [] # bulk downloads started this session
+        self.pending = queue.Queue()
+
+        self._create_table()
+        self._restore()
+        for i in range(max(1, workers)):
+            threading.Thread(target=self._worker, daemon=True, name=f"yt-download-{i}").start()
+
+    def _create_table(self):
+        with self.db_lock:
+            with self.conn:
+                self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS download_jobs ("
+                    " id INTEGER PRIMARY KEY AUTOINCREMENT, video_id TEXT NOT NULL, title TEXT NOT NULL,"
+                    " kind TEXT NOT NULL, quality TEXT, status TEXT NOT NULL, error TEXT, created_at REAL NOT NULL)"
+                )
+                self.conn.execute("CREATE INDEX IF NOT EXISTS idx_download_jobs_status ON download_jobs(status)")
+                columns = {row[1] for row in self.conn.execute("PRAGMA table_info(download_jobs)")}
+                for column, decl in (("part_path", "TEXT"), ("part_bytes", "INTEGER"), ("total_bytes", "INTEGER"), ("updated_at", "REAL"),
+                                       ("part_paths", "TEXT"), ("failures", "INTEGER NOT NULL DEFAULT 0")):
+                    if column not in columns:
+                        self.conn.execute(f"ALTER TABLE download_jobs ADD COLUMN {column} {decl}")
+
+    def _restore(self):
+        """
+        Re-queues jobs left over from the last run: queued ones, ones cut off
+        mid-download, and failed ones that still have partial bytes on disk
+        (until they have failed MAX_FAILURES times - a removed or private
+        video never comes back). Everything else that finished is forgotten.
+        """
+        with self.db_lock:
+            rows = self.conn.execute(
+                "SELECT id, video_id, title, kind, quality, created_at, status, part_path, part_bytes, total_bytes, part_paths, failures "
+                "FROM download_jobs ORDER BY id"
+            ).fetchall()
+        resume, forget, seen = [], [], set()
+        for row in rows:
+            status, part_path, failures = row[6], row[7], row[11] or 0
+            has_partial = bool(part_path) and os.path.exists(part_path)
+            wanted = status in ("queued", "running") or (status == "failed" and has_partial and failures < self.MAX_FAILURES)
+            if wanted and (row[1], row[3]) not in seen:
+                seen.add((row[1], row[3]))
+                resume.append(row)
+            else:
+                forget.append((row[0],))
+                if status == "failed" and has_partial and failures >= self.MAX_FAILURES:
+                    # Given up on: its partial files would otherwise stay forever
+                    self._remove_partials(self._load_part_paths(row[10], part_path))
+
+        with self.db_lock:
+            with self.conn:
+                self.conn.executemany("DELETE FROM download_jobs WHERE id = ?", forget)
+                self.conn.executemany("UPDATE download_jobs SET status = 'queued', error = NULL WHERE id = ?", [(r[0],) for r in resume])
+        for job_id, video_id, title, kind, quality, created_at, _, part_path, part_bytes, total_bytes, part_paths, failures in resume:
+            job = self._new_job(job_id, video_id, title, kind, quality, created_at)
+            job["failures"] = failures or 0
+            job["part_paths"] = self._load_part_paths(part_paths, part_path)
+            if part_path and os.path.exists(part_path):
+                job.update({"part_path": part_path, "resume_from": part_bytes or 0, "total": total_bytes})
+            self.jobs[job_id] = job
+            self.pending.put(job_id)
+
+    def _new_job(self, job_id, video_id, title, kind, quality, created_at):
+        return {
+            "id": job_id, "video_id": video_id, "title": title, "kind": kind, "quality": quality,
+            "status": "queued", "downloaded": 0, "total": None, "speed": 0, "phase": "", "bytes_done": 0,
+            "error": None, "created_at": created_at, "cancel": False,
+            "part_path": None, "part_paths": [], "resume_from": 0, "journaled_at": 0, "failures": 0,
+            "filepath": None
+        }
+
+    def _set_status(self, job, status, error=None):
+        with self.lock:
+            job["status"] = status
+            job["error"] = error
+            if status == "failed":
+                job["failures"] += 1
+        with self.db_lock:
+            try:
+                with self.conn:
+                    self.conn.execute("UPDATE download_jobs SET status = ?, error = ?, failures = ? WHERE id = ?", (status, error, job["failures"], job["id"]))
+            except sqlite3.Error:
+                pass
+
+    # --- Queueing ---
+
+    def enqueue(self, video_id, title, kind="mp3", quality=None):
+        """
+        Adds a download and returns at once.
+        `kind` is "mp3", "mp4" or "audio" (native codec, no re-encoding).
+        `quality` is the MP3 bitrate ("192") or the MP4 height ("720", "<=720"
+        for a cap; None = best). Returns the job, or None if the same download
+        is already queued/running.
+        """
+        jobs = self._add_jobs([{"id": video_id, "title": title}], kind, quality)
+        return jobs[0] if jobs else None
+
+    def enqueue_many(self, items, kind="mp3", quality=None, label="Batch"):
+        """
+        Queues {id, title} items as one batch (one transaction, however long
+        the list). Returns the batch, or None if nothing new was queued.
+        """
+        jobs = self._add_jobs(items, kind, quality)
+        if not jobs:
+            return None
+        batch = {"label": label, "job_ids": [j["id"] for j in jobs], "started_at": time.time()}
+        with self.lock:
+            self.batches.append(batch)
+        return batch
+
+    def _add_jobs(self, items, kind, quality):
+        quality = None if quality is None else str(quality)
+        with self.lock:
+            busy = {j["video_id"] for j in self.jobs.values() if j["kind"] == kind and j["status"] in ("queued", "running")}
+        new = {}
+        for item in items:
+            if item["id"] not in busy:
+                new.setdefault(item["id"], item)
+        if not new:
+            return []
+
+        now = time.time()
+        jobs = []
+        with self.db_lock:
+            with self.conn:
+                for item in new.values():
+                    job_id = self.conn.execute(
+                        "INSERT INTO download_jobs (video_id, title, kind, quality, status, created_at) VALUES (?, ?, ?, ?, 'queued', ?)",
+                        (item["id"], item["title"], kind, quality, now)
+                    ).lastrowid
+                    jobs.append(self._new_job(job_id, item["id"], item["title"], kind, quality, now))
+        with self.lock:
+            for job in jobs:
+                self.jobs[job["id"]] = job
+        for job in jobs:
+            self.pending.put(job["id"])
+        return jobs
+
+    def _journal(self, job, part_path, part_bytes, total_bytes):
+        job["journaled_at"] = time.monotonic()
+        with self.db_lock:
+            try:
+                with self.conn:
+                    self.conn.execute(
+                        "UPDATE download_jobs SET part_path = ?, part_bytes = ?, total_bytes = ?, part_paths = ?, updated_at = ? WHERE id = ?",
+                        (part_path, part_bytes, total_bytes, json.dumps(job["part_paths"]) if job["part_paths"] else None, time.time(), job["id"])
+                    )
+            except sqlite3.Error:
+                pass
+
+    @staticmethod
+    def _load_part_paths(part_paths, part_path=None):
+        try:
+            paths = json.loads(part_paths) if part_paths else []
+        except ValueError:
+            paths = []
+        if part_path and part_path not in paths:
+            paths.append(part_path)
+        return paths
+
+    @staticmethod
+    def _remove_partials(part_paths):
+        """Deletes yt-dlp's .part files and their fragment state (.ytdl)."""
+        for part_path in part_paths:
+            paths = [part_path]
+            if part_path.endswith(".part"):
+                paths.append(part_path[:-len(".part")] + ".ytdl")
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _discard_partial(self, job):
+        """Deletes a cancelled job's partial files - every format of a video+audio download."""
+        paths = self._load_part_paths(None, job.get("part_path"))
+        paths += [p for p in job["part_paths"] if p not in paths]
+        if not paths:
+            return
+        self._remove_partials(paths)
+        job["part_paths"] = []
+        self._journal(job, None, 0, None)
+
+    def partial_for(self, video_id, kind):
+        """Bytes already on disk for a queued/failed download of this track (0 if none)."""
+        with self.lock:
+            for job in self.jobs.values():
+                if job["video_id"] == video_id and job["kind"] == kind and job["part_path"]:
+                    return job["resume_from"] or job["downloaded"]
+        return 0
+
+    def cancel(self, job_id):
+        """Drops a queued job, or stops a running one at its next progress update."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if not job or job["status"] not in ("queued", "running"):
+                return False
+            job["cancel"] = True
+            was_queued = job["status"] == "queued"
+        if was_queued:
+            self._set_status(job, "cancelled")
+            self._discard_partial(job)
+        return True
+
+    def clear_finished(self):
+        with self.lock:
+            for job_id in [i for i, j in self.jobs.items() if j["status"] in ("done", "failed", "cancelled")]:
+                del self.jobs[job_id]
+            self.batches = [b for b in self.batches if any(i in self.jobs for i in b["job_ids"])]
+
+    # --- Workers ---
+
+    def _worker(self):
+        while True:
+            job_id = self.pending.get()
+            with self.lock:
+                job = self.jobs.get(job_id)
+                if not job or job["cancel"] or job["status"] != "queued":
+                    continue
+                job["status"] = "running"
+            self._set_status(job, "running")
+            self._run(job)
+
+    def ffmpeg_path(self):
+        if self._ffmpeg_path is None:
+            self._ffmpeg_path = self.ffmpeg_locator()
+        return self._ffmpeg_path
+
+    def _stem(self, job):
+        """
+        File name stem for a job: the sanitized title, plus the video ID
+        when another video's download already owns that name.
+        """
+        stem = title_key(job["title"])
+        exts = AUDIO_EXTENSIONS if job["kind"] == "audio" else (job["kind"],)
+        for ext in exts:
+            entry = self.library.local_file(os.path.join(self.download_dir, f"{stem}.{ext}"))
+            if entry and entry["video_id"] and entry["video_id"] != job["video_id"]:
+                return f"{stem} [{job['video_id']}]"
+        return stem
+
+    def target_path(self, job):
+        """Where a finished job's file is: what yt-dlp reported, else the expected name."""
+        if job.get("filepath"):
+            return job["filepath"]
+        stem = os.path.join(self.download_dir, self._stem(job))
+        if job["kind"] == "audio":
+            # Native audio keeps the source container (.m4a, or .opus remuxed from WebM)
+            for ext in AUDIO_EXTENSIONS:
+                if os.path.exists(f"{stem}.{ext}"):
+                    return f"{stem}.{ext}"
+        return f"{stem}.{job['kind']}"
+
+    def build_options(self, job):
+        """yt-dlp options for a job (same formats the interactive downloader used)."""
+        opts = {
+            'outtmpl': os.path.join(self.download_dir, f"{self._stem(job)}.%(ext)s"),
+            'quiet': True,
+            'no_warnings': True,
+            'noprogress': True,
+            'logger': _QuietLogger(),
+            'ffmpeg_location': self.ffmpeg_path(),
+            # Keep .part files and continue them with range requests
+            'continuedl': True,
+            'nopart': False,
+            'retries': 10,
+            'fragment_retries': 10,
+            # DASH/HLS fragments in parallel instead of one at a time
+            'concurrent_fragment_downloads': self.fragments,
+        }
+        if job["kind"] == "audio":
+            # Original stream: no transcoding, WebM/Opus is only remuxed to .opus
+            opts.update({
+                'format': 'bestaudio/best',
+                'postprocessors': [{
+                    'key': 'FFmpegExtractAudio',
+                    'preferredcodec': 'best',
+                }],
+            })
+        elif job["kind"] == "mp3":
+            opts.update({
+                'format': 'bestaudio/best',
+                'postprocessors': [{
+                    'key': 'FFmpegExtractAudio',
+                    'preferredcodec': 'mp3',
+                    'preferredquality': job["quality"] or "192",
+                }],
+            })
+        else:
+            height = job["quality"]
+            if height:
+                # "720" = exactly that height (picked from the menu), "<=720" = a profile cap
+                cond = f"height{height}" if height.startswith("<=") else f"height={height}"
+                fmt = f'bestvideo[{cond}][ext=mp4]+bestaudio[ext=m4a]/best[{cond}][ext=mp4]/best[{cond}]'
+            else:
+                fmt = 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best'
+            opts.update({'format': fmt, 'merge_output_format': 'mp4'})
+        # Tag the watch URL (purl/comment) so the file maps back to its video ID
+        opts['postprocessors'] = opts.get('postprocessors', []) + [{
+            'key': 'FFmpegMetadata',
+            'add_metadata': True,
+            'add_chapters': False,
+        }]
+        return opts
+
+    def _run(self, job):
+        def progress_hook(d):
+            if job["cancel"]:
+                raise DownloadCancelled()
+            journal = None
+            received = 0
+            with self.lock:
+                if d['status'] == 'downloading':
+                    downloaded = d.get('downloaded_bytes', 0)
+                    # Bytes since the last report (the first one of a file may be a resumed offset)
+                    if job["throttle_seen"] is not None and downloaded >= job["throttle_seen"]:
+                        received = downloaded - job["throttle_seen"]
+                    job["throttle_seen"] = downloaded
+                    job["phase"] = "downloading"
+                    job["total"] = d.get('total_bytes') or d.get('total_bytes_estimate') or job["total"]
+                    job["downloaded"] = downloaded
+                    job["speed"] = d.get('speed') or 0
+                    part_path = d.get('tmpfilename')
+                    if part_path and (part_path != job["part_path"] or time.monotonic() - job["journaled_at"] >= self.JOURNAL_INTERVAL):
+                        if part_path not in job["part_paths"]:
+                            # Merged MP4s download video and audio to separate .part files
+                            job["part_paths"].append(part_path)
+                        job["part_path"] = part_path
+                        journal = (part_path, job["downloaded"], job["total"])
+                elif d['status'] == 'finished':
+                    # Video+audio downloads finish two files; keep a running byte count
+                    job["bytes_done"] += d.get('total_bytes') or d.get('downloaded_bytes') or job["downloaded"]
+                    job["downloaded"] = 0
+                    job["throttle_seen"] = None
+                    job["phase"] = "processing"
+                    job["speed"] = 0
+            if journal:
+                self._journal(job, *journal)
+            if received and self.scheduler:
+                # Hooks run on the downloading thread (each fragment thread for DASH/HLS),
+                # so sleeping here holds back every kind of download, even mid-file
+                self.scheduler.throttle(received, cancelled=lambda: job["cancel"])
+
+        def postprocessor_hook(d):
+            # The last postprocessor to finish holds the final file (extension included)
+            if d['status'] == 'finished' and d.get('info_dict', {}).get('filepath'):
+                job["filepath"] = d['info_dict']['filepath']
+
+        job["filepath"] = None
+        job["throttle_seen"] = None
+        try:
+            os.makedirs(self.download_dir, exist_ok=True)
+            opts = self.build_options(job)
+            opts['progress_hooks'] = [progress_hook]
+            opts['postprocessor_hooks'] = [postprocessor_hook]
+            with yt_dlp.YoutubeDL(opts) as ydl:
+                self._download(ydl, job)
+        except Exception as e:
+            if job["cancel"]:
+                self._set_status(job, "cancelled")
+                self._discard_partial(job)
+            else:
+                # Partial bytes stay on disk (and in the journal) for a retry or the next launch
+                self._set_status(job, "failed", str(e).replace("ERROR: ", "")[:300])
+            return
+
+        self.library.add_local_file(self.target_path(job), job["video_id"])
+        job["part_path"] = None
+        job["part_paths"] = []
+        self._journal(job, None, 0, None)
+        self._set_status(job, "done")
+
+    def _download(self, ydl, job):
+        """
+        Downloads from the shared extraction result when there is one (no
+        second extraction), falling back to a fresh one if its URLs turned
+        out to be stale.
+        """
+        url = f"https://www.youtube.com/watch?v={job['video_id']}"
+        info = None
+        if self.format_cache:
+            try:
+                info = self.format_cache.get(job["video_id"])
+            except Exception:
+                info = None
+        if info:
+            try:
+                ydl.process_ie_result(ydl.sanitize_info(info, True), download=True)
+                return
+            except yt_dlp.utils.DownloadError:
+                # Stale URLs fail before any bytes arrive; anything later is a real error
+                if job["cancel"] or job["bytes_done"] or job["downloaded"]:
+                    raise
+                self.format_cache.invalidate(job["video_id"])
+        ydl.download([url])
+
+    # --- Status ---
+
+    def jobs_snapshot(self):
+        """Copies of all known jobs, oldest first."""
+        with self.lock:
+            return [dict(j) for j in sorted(self.jobs.values(), key=lambda j: j["id"])]
+
+    def has_active(self):
+        with self.lock:
+            return any(j["status"] in ("queued", "running") for j in self.jobs.values())
+
+    def batch_progress(self, batch):
+        """
+        Totals for a bulk download: {done, failed, total, active, rate, eta}.
+        rate is bytes/s over the batch so far; eta (seconds) extrapolates the
+        average size of finished tracks to the ones still queued.
+        """
+        with self.lock:
+            jobs = [self.jobs[i] for i in batch["job_ids"] if i in self.jobs]
+            done = [j for j in jobs if j["status"] == "done"]
+            running = [j for j in jobs if j["status"] == "running"]
+            queued = sum(1 for j in jobs if j["status"] == "queued")
+            failed = sum(1 for j in jobs if j["status"] in ("failed", "cancelled"))
+            moved = sum(j["bytes_done"] + j["downloaded"] for j in jobs)
+            left_running = sum(max(0, (j["total"] or 0) - j["downloaded"]) for j in running)
+            done_bytes = sum(j["bytes_done"] for j in done)
+
+        elapsed = max(time.time() - batch["started_at"], 0.001)
+        rate = moved / elapsed
+        eta = None
+        if rate > 0 and done:
+            eta = (left_running + queued * done_bytes / len(done)) / rate
+        return {
+            "done": len(done), "failed": failed, "total": len(batch["job_ids"]),
+            "active": bool(running or queued), "rate": rate, "eta": eta
+        }
+
+    def batch_summary(self, batch):
+        progress = self.batch_progress(batch)
+        text = f"{batch['label']}: {progress['done']}/{progress['total']}"
+        if progress["failed"]:
+            text += f" ({progress['failed']} failed)"
+        if progress["rate"]:
+            text += f" • avg {format_bytes(progress['rate'])}/s"
+        if progress["active"]:
+            text += f" • ETA {format_eta(progress['eta'])}"
+        return text
+
+    def active_batch(self):
+        with self.lock:
+            batches = list(self.batches)
+        for batch in batches:
+            if self.batch_progress(batch)["active"]:
+                return batch
+        return None
+
+    def summary(self):
+        """One-line aggregate status ("" when nothing is queued or running)."""
+        with self.lock:
+            running = [j for j in self.jobs.values() if j["status"] == "running"]
+            queued = sum(1 for j in self.jobs.values() if j["status"] == "queued")
+            failed = sum(1 for j in self.jobs.values() if j["status"] == "failed")
+            if not running and not queued:
+                return ""
+            downloaded = sum(j["downloaded"] for j in running)
+            total = sum(j["total"] or 0 for j in running)
+            speed = sum(j["speed"] for j in running)
+
+        parts = [f"⬇ {len(running)} downloading"]
+        if total:
+            parts.append(f"{min(100, downloaded * 100 / total):.0f}%")
+        if speed:
+            parts.append(f"{format_bytes(speed)}/s")
+        if queued:
+            parts.append(f"{queued} queued")
+        if failed:
+            parts.append(f"{failed} failed")
+        if self.scheduler and self.scheduler.is_throttling():
+            parts.append("slowed for playback")
+        batch = self.active_batch()
+        if batch:
+            parts.append(self.batch_summary(batch))
+        return " • ".join(parts)
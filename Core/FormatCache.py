@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs
+
+def url_expiry(url):
+    """The `expire=` timestamp of a signed googlevideo URL, or None."""
+    if not url:
+        return None
+    expire = parse_qs(urlparse(url).query).get("expire", [None])[0]
+    try:
+        return float(expire)
+    except (TypeError, ValueError):
+        return None
+
+def best_audio(info):
+    """The best audio-only format of an extraction result (or the combined stream)."""
+    audio = [f for f in info.get("formats") or [] if f.get("url") and f.get("vcodec") == "none" and f.get("acodec") not in (None, "none")]
+    if audio:
+        return max(audio, key=lambda f: (f.get("abr") or f.get("tbr") or 0))
+    return info if info.get("url") else None
+
+class FormatCache:
+    """
+    yt-dlp extraction results (formats + signed stream URLs) by video ID.
+    The MP4 quality menu, downloads, video playback and autoplay all read
+    from here, so picking a quality and then downloading or watching costs
+    one extraction. An entry lives until the earliest `expire=` of its
+    stream URLs (minus `margin` seconds); concurrent lookups of the same ID
+    wait for the one extraction already running. Kept in memory only: the
+    URLs are useless after a few hours anyway.
+    """
+    def __init__(self, max_entries=64, margin=300, default_ttl=3600):
+        self.max_entries = max_entries
+        self.margin = margin
+        self.default_ttl = default_ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict() # video_id -> (info, expires_at)
+        self.in_flight = {} # video_id -> Event
+
+    def _expires_at(self, info):
+        urls = [info.get("url")] + [f.get("url") for f in info.get("formats") or []]
+        expiries = [e for e in (url_expiry(u) for u in urls) if e]
+        return (min(expiries) if expiries else time.time() + self.default_ttl) - self.margin
+
+    def peek(self, video_id):
+        """Cached, still-valid info for the video, or None (never extracts)."""
+        with self.lock:
+            entry = self.entries.get(video_id)
+            if not entry:
+                return None
+            if entry[1] <= time.time():
+                del self.entries[video_id]
+                return None
+            self.entries.move_to_end(video_id)
+            return entry[0]
+
+    def expires_at(self, video_id):
+        with self.lock:
+            entry = self.entries.get(video_id)
+            return entry[1] if entry else 0
+
+    def put(self, video_id, info):
+        with self.lock:
+            self.entries[video_id] = (info, self._expires_at(info))
+            self.entries.move_to_end(video_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, video_id):
+        with self.lock:
+            self.entries.pop(video_id, None)
+
+    def get(self, video_id):
+        """Info for the video, extracting it if needed. Raises if extraction fails."""
+        while True:
+            info = self.peek(video_id)
+            if info:
+                return info
+            with self.lock:
+                event = self.in_flight.get(video_id)
+                if not event:
+                    event = self.in_flight[video_id] = threading.Event()
+                    owner = True
+                else:
+                    owner = False
+            if not owner:
+                event.wait()
+                if self.peek(video_id):
+                    continue
+                # The other extraction failed; try once ourselves
+            try:
+                info = self._extract(video_id)
+                self.put(video_id, info)
+                return info
+            finally:
+                if owner:
+                    with self.lock:
+                        self.in_flight.pop(video_id, None)
+                    event.set()
+
+    def _extract(self, video_id):
+        import yt_dlp
+
+        opts = {'quiet': True, 'no_warnings': True, 'skip_download': True}
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            return ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
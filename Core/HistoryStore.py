@@ -0,0 +1,142 @@
+import sqlite3
+import time
+from collections import OrderedDict
+
+class HistoryStore:
+    """
+    Unbounded play history in the library database.
+    Every play is a timestamped play_events row (with the listened seconds
+    filled in when the track ends). latest_plays keeps one row per video
+    pointing at its most recent play, so "history without duplicates" is an
+    index scan, and pages are fetched with keyset pagination (played_at
+    cursors), so any page costs the same however long the history gets.
+    The most recent `recent_size` tracks are mirrored in an OrderedDict for
+    O(1) dedupe and the autoplay lookups that happen on every track.
+    """
+    def __init__(self, library, recent_size=100):
+        self.library = library
+        self.conn = library.conn
+        self.lock = library.lock
+        self.recent_size = recent_size
+        self.recent = OrderedDict() # video_id -> title, oldest first
+        self._count = None
+
+        self._create_tables()
+        self._load_recent()
+
+    def _create_tables(self):
+        with self.lock:
+            with self.conn:
+                self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS latest_plays ("
+                    " video_id TEXT PRIMARY KEY, event_id INTEGER NOT NULL, played_at REAL NOT NULL) WITHOUT ROWID"
+                )
+                self.conn.execute("CREATE INDEX IF NOT EXISTS idx_latest_plays_time ON latest_plays(played_at)")
+                # Events imported before this table existed
+                if not self.conn.execute("SELECT 1 FROM latest_plays LIMIT 1").fetchone():
+                    self.conn.execute(
+                        "INSERT INTO latest_plays (video_id, event_id, played_at) "
+                        "SELECT video_id, MAX(id), MAX(played_at) FROM play_events GROUP BY video_id"
+                    )
+
+    def _load_recent(self):
+        items, _ = self.page(limit=self.recent_size)
+        for item in reversed(items):
+            self.recent[item["id"]] = item["title"]
+
+    def record_play(self, video_id, title, played_at=None):
+        """Stores one play event. Returns its id (for finish_play)."""
+        now = time.time() if played_at is None else played_at
+        event_id = None
+        with self.lock:
+            try:
+                with self.conn:
+                    seen = self.conn.execute("SELECT 1 FROM latest_plays WHERE video_id = ?", (video_id,)).fetchone()
+                    self.library._upsert_tracks([(video_id, title, None)], now)
+                    event_id = self.conn.execute(
+                        "INSERT INTO play_events (video_id, played_at, listened) VALUES (?, ?, NULL)",
+                        (video_id, now)
+                    ).lastrowid
+                    self.conn.execute(
+                        "INSERT INTO latest_plays (video_id, event_id, played_at) VALUES (?, ?, ?) "
+                        "ON CONFLICT(video_id) DO UPDATE SET event_id = excluded.event_id, played_at = excluded.played_at",
+                        (video_id, event_id, now)
+                    )
+                if self._count is not None and not seen:
+                    self._count += 1
+            except sqlite3.Error:
+                pass
+
+            self.recent.pop(video_id, None)
+            self.recent[video_id] = title
+            while len(self.recent) > self.recent_size:
+                self.recent.popitem(last=False)
+        return event_id
+
+    def finish_play(self, event_id, listened):
+        """Fills in how many seconds of a play were actually listened to."""
+        if not event_id:
+            return
+        with self.lock:
+            try:
+                with self.conn:
+                    self.conn.execute("UPDATE play_events SET listened = ? WHERE id = ?", (float(listened), event_id))
+            except sqlite3.Error:
+                pass
+
+    def last(self):
+        """{id, title} of the most recent play, or None."""
+        if not self.recent:
+            return None
+        video_id = next(reversed(self.recent))
+        return {"id": video_id, "title": self.recent[video_id]}
+
+    def recent_ids(self, count=20):
+        """IDs of the last `count` distinct tracks, oldest first."""
+        ids = list(self.recent)
+        return ids[-count:] if count else []
+
+    def recent_items(self):
+        return [{"id": vid_id, "title": title} for vid_id, title in self.recent.items()]
+
+    def is_empty(self):
+        return not self.recent
+
+    def count(self):
+        """Number of distinct tracks in the history (counted once, then kept up to date)."""
+        with self.lock:
+            if self._count is None:
+                self._count = self.conn.execute("SELECT COUNT(*) FROM latest_plays").fetchone()[0]
+            return self._count
+
+    def iter_all(self, batch_size=500):
+        """Every distinct track in the history, most recent first (read in pages)."""
+        cursor = None
+        while True:
+            items, cursor = self.page(cursor, batch_size)
+            yield from items
+            if cursor is None:
+                return
+
+    def page(self, before=None, limit=20):
+        """
+        Distinct tracks, most recent first, played strictly before the `before`
+        cursor (None = newest). Returns (items, next_cursor); items are
+        {id, title, played_at} and next_cursor is None on the last page.
+        """
+        query = (
+            "SELECT l.video_id, t.title, l.played_at FROM latest_plays l "
+            "JOIN tracks t ON t.id = l.video_id "
+        )
+        params = []
+        if before is not None:
+            query += "WHERE l.played_at < ? "
+            params.append(before)
+        query += "ORDER BY l.played_at DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        items = [{"id": r[0], "title": r[1], "played_at": r[2]} for r in rows[:limit]]
+        next_cursor = items[-1]["played_at"] if len(rows) > limit else None
+        return items, next_cursor
@@ -0,0 +1,96 @@
+import os
+import queue
+import time
+import threading
+from contextlib import contextmanager
+
+import httplib2
+
+class HttpPool:
+    """
+    Pool of keep-alive httplib2 transports shared by the whole app.
+    httplib2.Http is not thread-safe, so each request checks one out and
+    returns it afterwards; its open connections are then reused by the next
+    request instead of doing a new TCP/TLS handshake.
+    All transports share an on-disk response cache, so repeated requests are
+    revalidated with If-None-Match and a 304 is answered from the stored body.
+    """
+    # Google only gzips responses for clients whose user agent mentions gzip
+    USER_AGENT = "youtube-cli/1.0 (gzip)"
+
+    def __init__(self, cache_dir=None, size=8, timeout=30, cache_max_age=7 * 24 * 3600):
+        self.cache_dir = cache_dir
+        self.size = size
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+        self.lock = threading.Lock()
+        self.created = 0
+
+        if cache_dir:
+            self._prune_cache(cache_max_age)
+
+    def _prune_cache(self, max_age):
+        # httplib2's FileCache never evicts on its own
+        try:
+            cutoff = time.time() - max_age
+            for name in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, name)
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+        except OSError:
+            pass
+
+    def _new_http(self):
+        cache = None
+        if self.cache_dir:
+            try:
+                cache = httplib2.FileCache(self.cache_dir)
+            except OSError:
+                cache = None
+        with self.lock:
+            self.created += 1
+        return httplib2.Http(cache=cache, timeout=self.timeout)
+
+    def acquire(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            return self._new_http()
+
+    def release(self, http):
+        if self.idle.qsize() < self.size:
+            self.idle.put(http)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Checks out a transport; `timeout` (seconds) overrides the socket timeout for this use."""
+        http = self.acquire()
+        self._set_timeout(http, timeout or self.timeout)
+        try:
+            yield http
+        except Exception:
+            # Don't hand a transport with a half-read connection to the next caller
+            http.connections.clear()
+            raise
+        finally:
+            self.release(http)
+
+    @staticmethod
+    def _set_timeout(http, timeout):
+        # New connections take Http.timeout; kept-alive ones need their socket updated
+        http.timeout = timeout
+        for conn in http.connections.values():
+            conn.timeout = timeout
+            if getattr(conn, "sock", None) is not None:
+                try:
+                    conn.sock.settimeout(timeout)
+                except OSError:
+                    pass
+
+    def prepare(self, request):
+        """Adds the headers every Data API request should carry."""
+        headers = getattr(request, "headers", None)
+        if headers is not None:
+            headers["accept-encoding"] = "gzip, deflate"
+            if "gzip" not in headers.get("user-agent", ""):
+                headers["user-agent"] = (self.USER_AGENT + " " + headers.get("user-agent", "")).strip()
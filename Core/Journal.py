@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+
+def _apply(items, event, limit=None):
+    """Applies one journal event to a list of {id, title} dicts (in place)."""
+    op = event.get("op")
+    if op == "add":
+        if not any(item["id"] == event["id"] for item in items):
+            items.append({"id": event["id"], "title": event["title"]})
+    elif op == "play":
+        # Move to the end (most recent), keeping at most `limit` entries
+        items[:] = [item for item in items if item["id"] != event["id"]]
+        items.append({"id": event["id"], "title": event["title"]})
+        if limit and len(items) > limit:
+            del items[:len(items) - limit]
+    elif op == "remove":
+        items[:] = [item for item in items if item["id"] != event["id"]]
+
+class JournaledList:
+    """
+    A JSON list file (the snapshot) plus an append-only JSONL journal of changes.
+    Each mutation appends one line to the journal instead of rewriting the
+    whole file; loading replays the journal on top of the snapshot. Once the
+    journal grows past `compact_every` events it is folded into a new snapshot
+    on a background thread.
+    """
+    def __init__(self, path, limit=None, compact_every=200):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.limit = limit
+        self.compact_every = compact_every
+        self.lock = threading.Lock()
+        self.compacting = False
+        self.torn = False
+        self.items = self._load()
+        if self.torn:
+            self.compact() # Later appends must not land on the torn line
+
+    def _load(self):
+        items = []
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    items = json.load(f)
+            except:
+                items = []
+
+        self.pending = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        self.torn = True # Torn last line after a crash
+                        continue
+                    _apply(items, event, self.limit)
+                    self.pending += 1
+        return items
+
+    def record(self, *events):
+        """Applies events in memory and appends them to the journal."""
+        with self.lock:
+            for event in events:
+                _apply(self.items, event, self.limit)
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events))
+            self.pending += len(events)
+            if self.pending >= self.compact_every and not self.compacting:
+                self.compacting = True
+                threading.Thread(target=self.compact, daemon=True, name="yt-journal-compact").start()
+
+    def compact(self):
+        """Writes the current list as the snapshot and empties the journal."""
+        with self.lock:
+            try:
+                if self.pending or self.torn or not os.path.exists(self.path):
+                    tmp_path = self.path + ".tmp"
+                    with open(tmp_path, "w", encoding="utf-8") as f:
+                        json.dump(self.items, f, indent=2)
+                    os.replace(tmp_path, self.path)
+                    # Snapshot is durable before the journal goes away
+                    open(self.journal_path, "w").close()
+                    self.pending = 0
+                    self.torn = False
+            except OSError:
+                pass
+            finally:
+                self.compacting = False
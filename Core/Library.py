@@ -0,0 +1,515 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+
+AUDIO_EXTENSIONS = ("mp3", "m4a", "opus", "ogg") # MP3 downloads plus native (un-transcoded) audio
+MEDIA_EXTENSIONS = AUDIO_EXTENSIONS + ("mp4",)
+SAVED_LIST = "saved"
+
+# The whole tag value must be the watch URL (a description quoting another video never matches)
+VIDEO_URL = re.compile(r'https?://(?:(?:www|m|music)\.)?(?:youtube\.com/watch\?v=|youtu\.be/)([A-Za-z0-9_-]{11})(?:[&?#].*)?')
+# Where FFmpegMetadata puts the watch URL, per tag format (ID3 keys match with any ":suffix")
+URL_TAG_FIELDS = (
+    "purl", "TXXX:purl", "WXXX", "----:com.apple.iTunes:purl", # purl first: it holds nothing else
+    "comment", "TXXX:comment", "COMM", "©cmt",
+)
+
+def _tag_texts(tags, field):
+    for key in tags.keys():
+        if key.lower() != field.lower() and not key.startswith(field + ":"):
+            continue
+        value = tags[key]
+        # ID3 frames carry .text (or .url for WXXX); MP4/Vorbis give lists
+        items = getattr(value, "text", None) or ([value.url] if hasattr(value, "url") else value)
+        for item in items if isinstance(items, list) else [items]:
+            yield item.decode("utf-8", "replace") if isinstance(item, bytes) else str(item)
+
+def tagged_video_id(tags):
+    """Video ID from the purl/comment tag a download carries, or None."""
+    for field in URL_TAG_FIELDS:
+        for text in _tag_texts(tags, field):
+            match = VIDEO_URL.fullmatch(text.strip())
+            if match:
+                return match.group(1)
+    return None
+
+def read_media_tags(path):
+    """(video ID, duration) from a file's tags; downloads carry their watch URL in purl/comment."""
+    try:
+        from mutagen import File as MutagenFile
+        media = MutagenFile(path)
+    except Exception:
+        return None, None
+    if media is None:
+        return None, None
+    video_id = None
+    if media.tags is not None:
+        try:
+            video_id = tagged_video_id(media.tags)
+        except Exception:
+            pass
+    duration = getattr(media.info, "length", None) or None
+    return video_id, duration
+
+def title_key(title):
+    """The file name stem a download of `title` gets (same sanitizing as the downloaders)."""
+    return re.sub(r'[<>:"/\\|?*]', '', title or "").strip()
+
+class LibraryDB:
+    """
+    The user's library in one SQLite file: known tracks, every play event,
+    saved lists and the files in the download folder, all indexed by video ID.
+    Saved songs are the "saved" list among any number of named playlists;
+    list membership is answered from in-memory sets and lists are read a
+    page at a time. Play history lives in the same file but is managed by
+    Core.HistoryStore.
+    Downloaded files form a manifest (video ID -> files with format, size
+    and duration), taken from the ID tag each download embeds and held in
+    memory, so "is this downloaded?" never touches the disk or the title.
+    """
+    def __init__(self, db_path):
+        self.lock = threading.RLock()
+        try:
+            self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=10)
+            self._create_tables()
+        except sqlite3.Error:
+            self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+            self._create_tables()
+
+        self.members = {} # list name -> set of video IDs
+        self.versions = {} # list name -> write counter, so PlaylistViews drop stale chunks
+        self.manifest = None # path -> {path, kind, video_id, title_key, size, duration}, loaded on first use
+        self.files_by_video = {} # video ID -> {kind: entry}
+        self.files_by_title = {} # title key -> {kind: entry}, only files not tied to a video ID
+
+    def _create_tables(self):
+        with self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            # WAL + NORMAL: commits don't fsync, so a play per keypress stays cheap
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(
+                "CREATE TABLE IF NOT EXISTS tracks ("
+                " id TEXT PRIMARY KEY, title TEXT NOT NULL, title_key TEXT NOT NULL,"
+                " duration TEXT, updated_at REAL NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS idx_tracks_title_key ON tracks(title_key);"
+
+                "CREATE TABLE IF NOT EXISTS play_events ("
+                " id INTEGER PRIMARY KEY, video_id TEXT NOT NULL, played_at REAL NOT NULL, listened REAL);"
+                "CREATE INDEX IF NOT EXISTS idx_play_events_video ON play_events(video_id, played_at);"
+                "CREATE INDEX IF NOT EXISTS idx_play_events_time ON play_events(played_at);"
+
+                "CREATE TABLE IF NOT EXISTS saved_items ("
+                " list TEXT NOT NULL, video_id TEXT NOT NULL, position INTEGER NOT NULL, added_at REAL NOT NULL,"
+                " PRIMARY KEY (list, video_id)) WITHOUT ROWID;"
+                "CREATE INDEX IF NOT EXISTS idx_saved_items_position ON saved_items(list, position);"
+                "CREATE TABLE IF NOT EXISTS playlists ("
+                " name TEXT PRIMARY KEY, count INTEGER NOT NULL, created_at REAL NOT NULL);"
+
+                "CREATE TABLE IF NOT EXISTS local_files ("
+                " path TEXT PRIMARY KEY, title_key TEXT NOT NULL, kind TEXT NOT NULL, video_id TEXT,"
+                " size INTEGER, mtime REAL);"
+                "CREATE INDEX IF NOT EXISTS idx_local_files_title ON local_files(title_key, kind);"
+                "CREATE INDEX IF NOT EXISTS idx_local_files_video ON local_files(video_id, kind);"
+
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+            )
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(local_files)")}
+            if "duration" not in columns:
+                self.conn.execute("ALTER TABLE local_files ADD COLUMN duration REAL")
+            # Saved Songs always exists; counts for lists created before the playlists table
+            self.conn.execute(
+                "INSERT OR IGNORE INTO playlists (name, count, created_at) "
+                "SELECT list, COUNT(*), MIN(added_at) FROM saved_items GROUP BY list"
+            )
+            self.conn.execute("INSERT OR IGNORE INTO playlists (name, count, created_at) VALUES (?, 0, 0)", (SAVED_LIST,))
+            # Repairs counts left at 0 by the JSON import of earlier versions
+            self._recount_playlists()
+            self._compact_positions()
+
+    def _recount_playlists(self):
+        self.conn.execute("UPDATE playlists SET count = (SELECT COUNT(*) FROM saved_items WHERE list = playlists.name)")
+
+    def _compact_positions(self):
+        """Renumbers lists with gaps so positions run 0..count-1 (position = index)."""
+        gappy = [r[0] for r in self.conn.execute(
+            "SELECT list FROM saved_items GROUP BY list HAVING MIN(position) != 0 OR MAX(position) + 1 != COUNT(*)"
+        )]
+        for name in gappy:
+            ids = [r[0] for r in self.conn.execute("SELECT video_id FROM saved_items WHERE list = ? ORDER BY position", (name,))]
+            self.conn.executemany(
+                "UPDATE saved_items SET position = ? WHERE list = ? AND video_id = ?",
+                [(n, name, vid_id) for n, vid_id in enumerate(ids)]
+            )
+
+    def _changed(self, name):
+        self.versions[name] = self.versions.get(name, 0) + 1
+
+    # --- Tracks ---
+
+    def _upsert_tracks(self, tracks, now):
+        self.conn.executemany(
+            "INSERT INTO tracks (id, title, title_key, duration, updated_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET title = excluded.title, title_key = excluded.title_key,"
+            " duration = COALESCE(excluded.duration, tracks.duration), updated_at = excluded.updated_at",
+            [(vid_id, title, title_key(title), duration, now) for vid_id, title, duration in tracks if title]
+        )
+
+    def update_details(self, details):
+        """Stores durations from get_video_details for tracks already in the library."""
+        with self.lock:
+            try:
+                with self.conn:
+                    self.conn.executemany(
+                        "UPDATE tracks SET duration = ? WHERE id = ?",
+                        [(info.get("duration"), vid_id) for vid_id, info in details.items()]
+                    )
+            except sqlite3.Error:
+                pass
+
+    # --- Playlists ("saved" is the Saved Songs list) ---
+
+    def _members(self, name):
+        """Hash set of a list's video IDs, loaded on first use and kept in sync."""
+        members = self.members.get(name)
+        if members is None:
+            members = {r[0] for r in self.conn.execute("SELECT video_id FROM saved_items WHERE list = ?", (name,))}
+            self.members[name] = members
+        return members
+
+    def playlists(self):
+        """[{name, count}] - Saved Songs first, then by creation."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT name, count FROM playlists ORDER BY name != ?, created_at", (SAVED_LIST,)
+            ).fetchall()
+        return [{"name": name, "count": count} for name, count in rows]
+
+    def create_playlist(self, name):
+        with self.lock:
+            try:
+                with self.conn:
+                    self.conn.execute("INSERT OR IGNORE INTO playlists (name, count, created_at) VALUES (?, 0, ?)", (name, time.time()))
+            except sqlite3.Error:
+                pass
+
+    def delete_playlist(self, name):
+        if name == SAVED_LIST:
+            return
+        with self.lock:
+            try:
+                with self.conn:
+                    self.conn.execute("DELETE FROM saved_items WHERE list = ?", (name,))
+                    self.conn.execute("DELETE FROM playlists WHERE name = ?", (name,))
+            except sqlite3.Error:
+                return
+            self.members.pop(name, None)
+            self._changed(name)
+
+    def playlist_count(self, name=SAVED_LIST):
+        with self.lock:
+            row = self.conn.execute("SELECT count FROM playlists WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+
+    def playlist_page(self, name=SAVED_LIST, offset=0, limit=20):
+        """
+        One page of a list in order: [{id, title, duration}]. Positions are
+        kept dense (position = index), so a page is a keyset seek on
+        (list, position) and the last page costs the same as the first.
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT s.video_id, t.title, t.duration FROM saved_items s JOIN tracks t ON t.id = s.video_id "
+                "WHERE s.list = ? AND s.position >= ? ORDER BY s.position LIMIT ?", (name, offset, limit)
+            ).fetchall()
+        return [{"id": vid_id, "title": title, "duration": duration} for vid_id, title, duration in rows]
+
+    def playlist_view(self, name=SAVED_LIST):
+        return PlaylistView(self, name)
+
+    def in_playlist(self, video_id, name=SAVED_LIST):
+        with self.lock:
+            return video_id in self._members(name)
+
+    def is_saved(self, video_id):
+        return self.in_playlist(video_id, SAVED_LIST)
+
+    def add_saved(self, items, name=SAVED_LIST):
+        """Appends {id, title} items not yet in the list. Returns how many were new."""
+        with self.lock:
+            members = self._members(name)
+            new = {}
+            for item in items:
+                if item["id"] not in members:
+                    new.setdefault(item["id"], item)
+            new = list(new.values())
+            if not new:
+                return 0
+            now = time.time()
+            try:
+                with self.conn:
+                    self.conn.execute("INSERT OR IGNORE INTO playlists (name, count, created_at) VALUES (?, 0, ?)", (name, now))
+                    self._upsert_tracks([(i["id"], i["title"], i.get("duration")) for i in new], now)
+                    start = self.conn.execute(
+                        "SELECT COALESCE(MAX(position), -1) + 1 FROM saved_items WHERE list = ?", (name,)
+                    ).fetchone()[0]
+                    self.conn.executemany(
+                        "INSERT OR IGNORE INTO saved_items (list, video_id, position, added_at) VALUES (?, ?, ?, ?)",
+                        [(name, i["id"], start + n, now) for n, i in enumerate(new)]
+                    )
+                    self.conn.execute("UPDATE playlists SET count = count + ? WHERE name = ?", (len(new), name))
+            except sqlite3.Error:
+                return 0
+            members.update(i["id"] for i in new)
+            self._changed(name)
+            return len(new)
+
+    def remove_saved(self, video_id, name=SAVED_LIST):
+        with self.lock:
+            if video_id not in self._members(name):
+                return
+            try:
+                with self.conn:
+                    row = self.conn.execute("SELECT position FROM saved_items WHERE list = ? AND video_id = ?", (name, video_id)).fetchone()
+                    self.conn.execute("DELETE FROM saved_items WHERE list = ? AND video_id = ?", (name, video_id))
+                    if row:
+                        # Close the gap so positions stay equal to indexes
+                        self.conn.execute("UPDATE saved_items SET position = position - 1 WHERE list = ? AND position > ?", (name, row[0]))
+                    self.conn.execute("UPDATE playlists SET count = count - 1 WHERE name = ?", (name,))
+            except sqlite3.Error:
+                return
+            self.members[name].discard(video_id)
+            self._changed(name)
+
+    def saved_downloaded(self, kinds=AUDIO_EXTENSIONS, name=SAVED_LIST):
+        """
+        Saved songs with a local copy in one of `kinds` (first match wins),
+        in list order: [{id, title, duration, path}]. Duration is the track's
+        "M:SS" text, else the file's length in seconds from the manifest.
+        """
+        marks = ", ".join("?" * len(kinds))
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT s.video_id, t.title, COALESCE(t.duration, f.duration), f.path, f.kind FROM saved_items s "
+                "JOIN tracks t ON t.id = s.video_id "
+                f"JOIN local_files f ON f.video_id = s.video_id AND f.kind IN ({marks}) "
+                "WHERE s.list = ? ORDER BY s.position", (*kinds, name)
+            ).fetchall()
+        songs = {}
+        for vid_id, title, duration, path, kind in rows:
+            song = songs.get(vid_id)
+            if song is None or kinds.index(kind) < kinds.index(song["kind"]):
+                songs[vid_id] = {"id": vid_id, "title": title, "duration": duration, "path": path, "kind": kind}
+        return [{k: v for k, v in song.items() if k != "kind"} for song in songs.values()]
+
+    # --- Local files ---
+
+    def _manifest(self):
+        """The in-memory file index, built from local_files on first use."""
+        if self.manifest is None:
+            self.manifest = {}
+            self.files_by_video = {}
+            self.files_by_title = {}
+            for path, key, kind, video_id, size, duration in self.conn.execute(
+                "SELECT path, title_key, kind, video_id, size, duration FROM local_files"
+            ):
+                self._index_file({"path": path, "title_key": key, "kind": kind, "video_id": video_id, "size": size, "duration": duration})
+        return self.manifest
+
+    def _index_file(self, entry):
+        self._unindex_file(entry["path"])
+        self.manifest[entry["path"]] = entry
+        if entry["video_id"]:
+            self.files_by_video.setdefault(entry["video_id"], {})[entry["kind"]] = entry
+        else:
+            self.files_by_title.setdefault(entry["title_key"], {})[entry["kind"]] = entry
+
+    def _unindex_file(self, path):
+        entry = self.manifest.pop(path, None)
+        if not entry:
+            return
+        index, key = (self.files_by_video, entry["video_id"]) if entry["video_id"] else (self.files_by_title, entry["title_key"])
+        kinds = index.get(key, {})
+        if kinds.get(entry["kind"]) is entry:
+            del kinds[entry["kind"]]
+            if not kinds:
+                del index[key]
+
+    def sync_local_files(self, directory):
+        """Re-indexes the download folder (new, changed and deleted files)."""
+        found = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    stem, _, ext = entry.name.rpartition(".")
+                    if stem and ext.lower() in MEDIA_EXTENSIONS and entry.is_file():
+                        st = entry.stat()
+                        found[entry.path] = (stem, ext.lower(), st.st_size, st.st_mtime)
+        except OSError:
+            return
+
+        with self.lock:
+            try:
+                known = {p: (m, v) for p, m, v in self.conn.execute("SELECT path, mtime, video_id FROM local_files")}
+            except sqlite3.Error:
+                return
+        changed = [(p, info) for p, info in found.items() if known.get(p, (None,))[0] != info[3]]
+        # Tags are read outside the lock: only new or modified files, once.
+        # An ID already on record (set at download time) wins over the tag.
+        rows = []
+        for path, (stem, ext, size, mtime) in changed:
+            tagged_id, duration = read_media_tags(path)
+            rows.append((path, stem, ext, size, mtime, known.get(path, (None, None))[1] or tagged_id, duration))
+
+        with self.lock:
+            try:
+                with self.conn:
+                    gone = [(p,) for p in known if p not in found]
+                    self.conn.executemany("DELETE FROM local_files WHERE path = ?", gone)
+                    # Untagged files (downloaded before IDs were embedded) fall back to the title key
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO local_files (path, title_key, kind, size, mtime, video_id, duration) "
+                        "VALUES (?1, ?2, ?3, ?4, ?5, COALESCE(?6, (SELECT id FROM tracks WHERE title_key = ?2 LIMIT 1)), ?7)",
+                        rows
+                    )
+            except sqlite3.Error:
+                pass
+            self.manifest = None
+
+    def add_local_file(self, path, video_id=None):
+        """Registers one freshly downloaded file in the manifest."""
+        stem, _, ext = os.path.basename(path).rpartition(".")
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        tagged_id, duration = read_media_tags(path)
+        video_id = video_id or tagged_id
+        with self.lock:
+            try:
+                with self.conn:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO local_files (path, title_key, kind, size, mtime, video_id, duration) "
+                        "VALUES (?, ?, ?, ?, ?, COALESCE(?, (SELECT id FROM tracks WHERE title_key = ? LIMIT 1)), ?)",
+                        (path, stem, ext.lower(), st.st_size, st.st_mtime, video_id, stem, duration)
+                    )
+                    video_id = self.conn.execute("SELECT video_id FROM local_files WHERE path = ?", (path,)).fetchone()[0]
+            except sqlite3.Error:
+                return
+            self._manifest()
+            self._index_file({"path": path, "title_key": stem, "kind": ext.lower(), "video_id": video_id, "size": st.st_size, "duration": duration})
+
+    def remove_local_file(self, path):
+        """Drops a deleted file from the manifest."""
+        with self.lock:
+            try:
+                with self.conn:
+                    self.conn.execute("DELETE FROM local_files WHERE path = ?", (path,))
+            except sqlite3.Error:
+                pass
+            self._manifest()
+            self._unindex_file(path)
+
+    def local_files_for(self, title, video_id=None):
+        """
+        {kind: path} of downloaded copies. Files tagged with (or downloaded
+        as) a video ID match only that ID; untagged ones match by title.
+        """
+        with self.lock:
+            self._manifest()
+            files = {}
+            files.update(self.files_by_title.get(title_key(title), {}))
+            if video_id:
+                files.update(self.files_by_video.get(video_id, {}))
+            return {kind: entry["path"] for kind, entry in files.items()}
+
+    def local_file(self, path):
+        """Manifest entry of one file ({video_id, kind, size, duration, ...}) or None."""
+        with self.lock:
+            return self._manifest().get(path)
+
+    # --- One-time import ---
+
+    def needs_migration(self):
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_json'").fetchone() is None
+
+    def migrate_json(self, history, saved, history_mtime=None, download_dir=None):
+        """
+        Imports the pre-SQLite history.json / saved.json lists once.
+        History entries get synthetic timestamps ending at the file's mtime.
+        """
+        with self.lock:
+            if self.conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_json'").fetchone():
+                return False
+            end = history_mtime or time.time()
+            now = time.time()
+            try:
+                with self.conn:
+                    self._upsert_tracks([(h["id"], h.get("title"), None) for h in history + saved if h.get("id")], now)
+                    self.conn.executemany(
+                        "INSERT INTO play_events (video_id, played_at, listened) VALUES (?, ?, NULL)",
+                        [(h["id"], end - (len(history) - n)) for n, h in enumerate(history) if h.get("id")]
+                    )
+                    self.conn.executemany(
+                        "INSERT OR IGNORE INTO saved_items (list, video_id, position, added_at) VALUES ('saved', ?, ?, ?)",
+                        [(s["id"], n, now) for n, s in enumerate(saved) if s.get("id")]
+                    )
+                    self._recount_playlists()
+                    self._compact_positions()
+                    self.conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_json', ?)", (str(now),))
+            except sqlite3.Error:
+                return False
+        if download_dir:
+            self.sync_local_files(download_dir)
+        self.members.clear()
+        self._changed(SAVED_LIST)
+        return True
+
+class PlaylistView:
+    """
+    Read-only sequence over a stored playlist for play_queue() and the UI.
+    len() comes from the stored count and items are fetched in chunks on
+    demand, so handing a 10,000-track list to the player loads nothing up front.
+    Fetched chunks are dropped whenever the list is written to.
+    """
+    CHUNK = 100
+
+    def __init__(self, library, name):
+        self.library = library
+        self.name = name
+        self.chunks = {}
+        self.version = library.versions.get(name, 0)
+
+    def __len__(self):
+        return self.library.playlist_count(self.name)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        version = self.library.versions.get(self.name, 0)
+        if version != self.version:
+            self.chunks.clear()
+            self.version = version
+        chunk_no = index // self.CHUNK
+        chunk = self.chunks.get(chunk_no)
+        if chunk is None:
+            chunk = self.library.playlist_page(self.name, chunk_no * self.CHUNK, self.CHUNK)
+            self.chunks[chunk_no] = chunk
+        offset = index - chunk_no * self.CHUNK
+        if offset >= len(chunk):
+            raise IndexError(index)
+        return chunk[offset]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            try:
+                yield self[i]
+            except IndexError:
+                return
+
+    def __bool__(self):
+        return len(self) > 0
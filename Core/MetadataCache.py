@@ -0,0 +1,112 @@
+import json
+import sqlite3
+import threading
+import time
+
+class MetadataCache:
+    """
+    Persistent video metadata store (SQLite) keyed by video ID.
+    Entries expire after `ttl` seconds and the least recently used rows are
+    evicted once the table grows past `max_entries`.
+    """
+    def __init__(self, db_path, ttl=7 * 24 * 3600, max_entries=20000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+
+        try:
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._create_tables()
+        except sqlite3.Error:
+            # Read-only install dir etc. -> keep working with a session-only cache
+            self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+            self._create_tables()
+
+    def _create_tables(self):
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS video_meta ("
+                " id TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_video_meta_accessed ON video_meta(accessed_at)")
+
+    def get_many(self, video_ids, allow_stale=False):
+        """
+        Returns {video_id: details} for every ID with a cached entry.
+        Expired entries are skipped unless allow_stale is True.
+        """
+        ids = list(dict.fromkeys(v for v in video_ids if v))
+        if not ids:
+            return {}
+
+        now = time.time()
+        found = {}
+        with self.lock:
+            try:
+                # Stay well below SQLite's bound-parameter limit
+                for i in range(0, len(ids), 500):
+                    chunk = ids[i:i + 500]
+                    marks = ",".join("?" * len(chunk))
+                    rows = self.conn.execute(
+                        f"SELECT id, data, expires_at FROM video_meta WHERE id IN ({marks})", chunk
+                    ).fetchall()
+                    for vid_id, data, expires_at in rows:
+                        if expires_at < now and not allow_stale:
+                            continue
+                        found[vid_id] = json.loads(data)
+
+                if found:
+                    with self.conn:
+                        self.conn.executemany(
+                            "UPDATE video_meta SET accessed_at = ? WHERE id = ?",
+                            [(now, vid_id) for vid_id in found]
+                        )
+            except (sqlite3.Error, ValueError):
+                return {}
+        return found
+
+    def missing(self, video_ids):
+        """Returns the IDs that have no fresh entry (i.e. would need an API call)."""
+        cached = self.get_many(video_ids)
+        return [v for v in dict.fromkeys(video_ids) if v and v not in cached]
+
+    def put_many(self, details, ttl=None):
+        """Write-through: stores {video_id: details} and trims the table to max_entries."""
+        if not details:
+            return
+
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        rows = [(vid_id, json.dumps(info), expires_at, now) for vid_id, info in details.items()]
+
+        with self.lock:
+            try:
+                with self.conn:
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO video_meta (id, data, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                        rows
+                    )
+                    self._evict()
+            except sqlite3.Error:
+                pass
+
+    def _evict(self):
+        # LRU: drop the oldest accessed rows beyond the cap
+        count = self.conn.execute("SELECT COUNT(*) FROM video_meta").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self.conn.execute(
+                "DELETE FROM video_meta WHERE id IN "
+                "(SELECT id FROM video_meta ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def close(self):
+        with self.lock:
+            try:
+                self.conn.close()
+            except sqlite3.Error:
+                pass
@@ -0,0 +1,73 @@
+import json
+import sqlite3
+import threading
+import time
+
+class PageCache:
+    """
+    Small persistent TTL cache for paged API responses (search results etc.).
+    Rows live in a shared SQLite file and are separated by `namespace`;
+    keys are any JSON-serialisable value (e.g. [query, page_token]).
+    """
+    def __init__(self, db_path, namespace, ttl=6 * 3600, max_entries=2000):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+
+        try:
+            self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=10)
+            self._create_tables()
+        except sqlite3.Error:
+            self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+            self._create_tables()
+
+    def _create_tables(self):
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS page_cache ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " data TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+
+    def get(self, key, allow_stale=False):
+        """Returns the cached value, or None if missing/expired (unless allow_stale)."""
+        with self.lock:
+            try:
+                row = self.conn.execute(
+                    "SELECT data, expires_at FROM page_cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, json.dumps(key))
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+        if not row:
+            return None
+        if row[1] < time.time() and not allow_stale:
+            return None
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return None
+
+    def put(self, key, value, ttl=None):
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self.lock:
+            try:
+                with self.conn:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO page_cache (namespace, key, data, expires_at, stored_at) VALUES (?, ?, ?, ?, ?)",
+                        (self.namespace, json.dumps(key), json.dumps(value), expires_at, now)
+                    )
+                    # Keep the namespace bounded, oldest first
+                    self.conn.execute(
+                        "DELETE FROM page_cache WHERE namespace = ? AND key NOT IN "
+                        "(SELECT key FROM page_cache WHERE namespace = ? ORDER BY stored_at DESC LIMIT ?)",
+                        (self.namespace, self.namespace, self.max_entries)
+                    )
+            except sqlite3.Error:
+                pass
@@ -0,0 +1,74 @@
+import json
+import os
+import re
+
+YOUTUBE_ID = re.compile(r'(?:[?&]v=|youtu\.be/|/shorts/|/embed/)([a-zA-Z0-9_-]{11})')
+
+def _seconds(duration):
+    """'M:SS' / 'H:MM:SS' -> seconds, -1 if unknown (M3U convention)."""
+    try:
+        parts = [int(p) for p in str(duration).split(":")]
+        return sum(p * 60 ** i for i, p in enumerate(reversed(parts)))
+    except (TypeError, ValueError):
+        return -1
+
+def export_m3u(items, path):
+    """Writes an extended M3U with YouTube watch URLs. Returns the track count."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("#EXTM3U\n")
+        for item in items:
+            f.write(f"#EXTINF:{_seconds(item.get('duration'))},{item['title']}\n")
+            f.write(f"https://www.youtube.com/watch?v={item['id']}\n")
+            count += 1
+    return count
+
+def export_json(name, items, path):
+    tracks = [{"id": i["id"], "title": i["title"], "duration": i.get("duration")} for i in items]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"name": name, "tracks": tracks}, f, indent=2, ensure_ascii=False)
+    return len(tracks)
+
+def _import_m3u(path):
+    items, skipped = [], 0
+    title = None
+    with open(path, "r", encoding="utf-8-sig") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("#EXTINF:"):
+                title = line.split(",", 1)[1] if "," in line else None
+                continue
+            if line.startswith("#"):
+                continue
+            match = YOUTUBE_ID.search(line)
+            if match:
+                items.append({"id": match.group(1), "title": title or match.group(1)})
+            else:
+                skipped += 1 # Local files / other sites have no video ID
+            title = None
+    return items, skipped
+
+def _import_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    # Our export format, or a bare [{id, title}] list like saved.json
+    tracks = data.get("tracks", []) if isinstance(data, dict) else data
+    items = [t for t in tracks if isinstance(t, dict) and t.get("id")]
+    for item in items:
+        item.setdefault("title", item["id"])
+    name = data.get("name") if isinstance(data, dict) else None
+    return items, len(tracks) - len(items), name
+
+def import_file(path):
+    """
+    Reads an .m3u/.m3u8 or .json playlist.
+    Returns (suggested_name, [{id, title, ...}], skipped_entries).
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if path.lower().endswith(".json"):
+        items, skipped, name = _import_json(path)
+        return name or stem, items, skipped
+    items, skipped = _import_m3u(path)
+    return stem, items, skipped
@@ -0,0 +1,143 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+UNAVAILABLE_TITLES = ("Deleted video", "Private video")
+
+class StreamingQueue(list):
+    """
+    A play queue that keeps growing while a loader appends to it.
+    play_queue() can start on item 0 and call wait_for() when it catches up.
+    """
+    def __init__(self):
+        super().__init__()
+        self.cond = threading.Condition()
+        self.done = False
+
+    def add_items(self, items):
+        with self.cond:
+            self.extend(items)
+            self.cond.notify_all()
+
+    def finish(self):
+        with self.cond:
+            self.done = True
+            self.cond.notify_all()
+
+    def wait_for(self, index, timeout=None):
+        """Blocks until item `index` exists or loading is finished. True if it exists."""
+        with self.cond:
+            while len(self) <= index and not self.done:
+                if not self.cond.wait(timeout):
+                    break
+            return index < len(self)
+
+    def wait_done(self, timeout=None):
+        with self.cond:
+            return self.cond.wait_for(lambda: self.done, timeout)
+
+class PlaylistLoader:
+    """
+    Loads a playlist/mix into a StreamingQueue on a background thread.
+    Regular playlists page through playlistItems (50 per page); each page's
+    durations are resolved with batched videos().list calls in parallel with
+    fetching the next page. Mixes (RD...) and API failures fall back to yt-dlp
+    flat extraction.
+    """
+    def __init__(self, app, playlist_id, video_id=None):
+        self.app = app
+        self.playlist_id = playlist_id
+        self.video_id = video_id
+        self.queue = StreamingQueue()
+        self.total = None
+        self.error = None
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="yt-playlist")
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True, name="yt-playlist-loader").start()
+        return self
+
+    @property
+    def is_mix(self):
+        return self.playlist_id.startswith("RD")
+
+    def _run(self):
+        try:
+            if self.is_mix or not self.app.search_backends["api"].available():
+                self._load_extractor()
+            else:
+                try:
+                    self._load_api()
+                except Exception:
+                    if not self.queue:
+                        self._load_extractor()
+                    else:
+                        raise
+        except Exception as e:
+            self.error = e
+        finally:
+            self.queue.finish()
+            self.executor.shutdown(wait=False)
+
+    def _load_api(self):
+        page_token = None
+        while True:
+            request = self.app.youtube.playlistItems().list(
+                part="snippet,contentDetails",
+                playlistId=self.playlist_id,
+                maxResults=50,
+                pageToken=page_token,
+                fields="nextPageToken,pageInfo(totalResults),items(snippet(title),contentDetails(videoId))"
+            )
+            response = request.execute()
+            self.total = response.get("pageInfo", {}).get("totalResults", self.total)
+
+            items = []
+            for entry in response.get("items", []):
+                vid_id = entry.get("contentDetails", {}).get("videoId")
+                title = entry.get("snippet", {}).get("title", "")
+                if vid_id and title not in UNAVAILABLE_TITLES:
+                    items.append({"id": vid_id, "title": title, "duration": None})
+
+            # Items go into the queue right away; durations are filled in as they resolve
+            self.queue.add_items(items)
+            if items:
+                self.executor.submit(self._resolve_durations, items)
+
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+
+    def _resolve_durations(self, items):
+        ids = [item["id"] for item in items]
+        try:
+            details = self.app.metadata_cache.get_many(ids)
+            missing = [v for v in ids if v not in details]
+            if missing:
+                details.update(self.app.resolver.resolve(missing))
+        except Exception:
+            return
+        for item in items:
+            info = details.get(item["id"])
+            if info:
+                item["duration"] = info["duration"]
+
+    def _load_extractor(self):
+        import yt_dlp
+
+        if self.video_id:
+            url = f"https://www.youtube.com/watch?v={self.video_id}&list={self.playlist_id}"
+        else:
+            url = f"https://www.youtube.com/playlist?list={self.playlist_id}"
+
+        opts = {'quiet': True, 'no_warnings': True, 'extract_flat': 'in_playlist', 'skip_download': True}
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+
+        entries = [e for e in (info.get("entries") or []) if e and e.get("id")]
+        self.total = len(entries)
+        items = []
+        for entry in entries:
+            if entry.get("title") in UNAVAILABLE_TITLES:
+                continue
+            items.append({"id": entry["id"], "title": entry.get("title") or "", "duration": entry.get("duration")})
+        self.queue.add_items(items)
@@ -0,0 +1,32 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class Prefetcher:
+    """
+    Runs background fetches keyed by an arbitrary hashable key.
+    Submitting a key that is already pending returns the pending future,
+    and take() hands the future over to the caller that needs the data.
+    """
+    def __init__(self, max_workers=2):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="yt-prefetch")
+        self.lock = threading.Lock()
+        self.pending = {}
+
+    def submit(self, key, fn, *args):
+        with self.lock:
+            fut = self.pending.get(key)
+            if fut is None:
+                # Forget finished results nobody came back for (the caches still hold them)
+                if len(self.pending) > 32:
+                    self.pending = {k: f for k, f in self.pending.items() if not f.done()}
+                fut = self.executor.submit(fn, *args)
+                self.pending[key] = fut
+            return fut
+
+    def take(self, key):
+        """Removes and returns the future for key (or None if nothing was prefetched)."""
+        with self.lock:
+            return self.pending.pop(key, None)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,126 @@
+import datetime
+import json
+import os
+import threading
+
+from Core.WriteBehind import write_json_atomic
+
+# Units charged per call by the YouTube Data API v3
+QUOTA_COSTS = {
+    "search.list": 100,
+    "videos.list": 1,
+    "commentThreads.list": 1,
+    "playlistItems.list": 1,
+    "playlists.list": 1,
+    "channels.list": 1,
+}
+DEFAULT_COST = 1
+DEFAULT_DAILY_QUOTA = 10000
+
+class QuotaExhausted(Exception):
+    """Raised instead of sending a request the remaining budget can't cover."""
+    pass
+
+def quota_day():
+    """The API quota resets at midnight Pacific Time."""
+    try:
+        from zoneinfo import ZoneInfo
+        return datetime.datetime.now(ZoneInfo("America/Los_Angeles")).date().isoformat()
+    except Exception:
+        # No tz database (e.g. bare Windows Python) -> approximate with PST
+        return (datetime.datetime.utcnow() - datetime.timedelta(hours=8)).date().isoformat()
+
+class QuotaLedger:
+    """
+    Persists per-day Data API unit usage and plans around the budget.
+    Expensive calls (search) are refused once the remaining units fall into
+    the reserve, so cheap lookups (videos, comments) keep working all day.
+    """
+    def __init__(self, path, daily_budget=DEFAULT_DAILY_QUOTA, reserve_ratio=0.1, writer=None):
+        self.path = path
+        self.writer = writer
+        self.daily_budget = daily_budget
+        self.reserve_ratio = reserve_ratio
+        self.lock = threading.Lock()
+        self.state = self._load()
+
+    def _blank_state(self):
+        return {"day": quota_day(), "used": 0, "calls": {}, "exhausted": False}
+
+    def _load(self):
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+                if data.get("day") == quota_day():
+                    return data
+            except:
+                pass
+        return self._blank_state()
+
+    def _save(self):
+        if not self.path:
+            return # In-memory ledger
+        if self.writer is not None:
+            # Every API call charges the ledger: let the worker coalesce the writes
+            self.writer.schedule(self.path, self._snapshot)
+            return
+        try:
+            write_json_atomic(self.path, self.state)
+        except OSError:
+            pass
+
+    def _snapshot(self):
+        with self.lock:
+            return json.loads(json.dumps(self.state))
+
+    def _roll_day(self):
+        if self.state.get("day") != quota_day():
+            self.state = self._blank_state()
+
+    @staticmethod
+    def cost(endpoint):
+        return QUOTA_COSTS.get(endpoint, DEFAULT_COST)
+
+    @property
+    def used(self):
+        with self.lock:
+            self._roll_day()
+            return self.state["used"]
+
+    @property
+    def remaining(self):
+        with self.lock:
+            self._roll_day()
+            if self.state.get("exhausted"):
+                return 0
+            return max(0, self.daily_budget - self.state["used"])
+
+    def is_low(self):
+        return self.remaining <= self.daily_budget * self.reserve_ratio
+
+    def can_afford(self, endpoint):
+        """
+        True if the call fits the remaining budget.
+        Expensive calls must also leave the reserve untouched.
+        """
+        cost = self.cost(endpoint)
+        remaining = self.remaining
+        if cost >= 100:
+            return remaining - cost >= self.daily_budget * self.reserve_ratio
+        return remaining >= cost
+
+    def charge(self, endpoint):
+        with self.lock:
+            self._roll_day()
+            self.state["used"] += self.cost(endpoint)
+            calls = self.state.setdefault("calls", {})
+            calls[endpoint] = calls.get(endpoint, 0) + 1
+            self._save()
+
+    def mark_exhausted(self):
+        """The API answered quotaExceeded: trust it over our own count until the reset."""
+        with self.lock:
+            self._roll_day()
+            self.state["exhausted"] = True
+            self._save()
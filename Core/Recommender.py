@@ -0,0 +1,121 @@
+import heapq
+import sqlite3
+import threading
+import time
+
+class RecommendationGraph:
+    """
+    Local "played next" graph built from our own listening history.
+    Every time a track follows another, the (previous -> next) transition
+    count goes up by one. The whole graph is kept in memory as nested dicts,
+    so answering "what comes after X" is a dict lookup; SQLite only persists
+    it with one UPSERT per play.
+    """
+    def __init__(self, db_path):
+        self.lock = threading.Lock()
+        self.edges = {}    # src_id -> {dst_id: count}
+        self.incoming = {} # dst_id -> {src_id: count} (co-listening fallback)
+        self.titles = {}   # video_id -> title
+
+        try:
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._create_tables()
+        except sqlite3.Error:
+            self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+            self._create_tables()
+        self._load()
+
+    def _create_tables(self):
+        with self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS transitions ("
+                " src TEXT NOT NULL, dst TEXT NOT NULL, count INTEGER NOT NULL, last_at REAL NOT NULL,"
+                " PRIMARY KEY (src, dst)) WITHOUT ROWID"
+            )
+            self.conn.execute("CREATE TABLE IF NOT EXISTS titles (id TEXT PRIMARY KEY, title TEXT NOT NULL) WITHOUT ROWID")
+
+    def _load(self):
+        try:
+            for src, dst, count in self.conn.execute("SELECT src, dst, count FROM transitions"):
+                self.edges.setdefault(src, {})[dst] = count
+                self.incoming.setdefault(dst, {})[src] = count
+            for vid_id, title in self.conn.execute("SELECT id, title FROM titles"):
+                self.titles[vid_id] = title
+        except sqlite3.Error:
+            pass
+
+    def is_empty(self):
+        return not self.edges
+
+    def record(self, prev_id, video_id, title=None):
+        """Counts one prev_id -> video_id transition (incremental, O(1))."""
+        if not prev_id or not video_id or prev_id == video_id:
+            if video_id and title:
+                self._remember_title(video_id, title)
+            return
+        self.record_many([(prev_id, video_id)], {video_id: title} if title else {})
+
+    def record_many(self, pairs, titles=None):
+        now = time.time()
+        with self.lock:
+            for src, dst in pairs:
+                count = self.edges.setdefault(src, {}).get(dst, 0) + 1
+                self.edges[src][dst] = count
+                self.incoming.setdefault(dst, {})[src] = count
+            for vid_id, title in (titles or {}).items():
+                self.titles[vid_id] = title
+            try:
+                with self.conn:
+                    self.conn.executemany(
+                        "INSERT INTO transitions (src, dst, count, last_at) VALUES (?, ?, 1, ?) "
+                        "ON CONFLICT(src, dst) DO UPDATE SET count = count + 1, last_at = excluded.last_at",
+                        [(src, dst, now) for src, dst in pairs]
+                    )
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO titles (id, title) VALUES (?, ?)",
+                        list((titles or {}).items())
+                    )
+            except sqlite3.Error:
+                pass
+
+    def _remember_title(self, video_id, title):
+        with self.lock:
+            if self.titles.get(video_id) == title:
+                return
+            self.titles[video_id] = title
+            try:
+                with self.conn:
+                    self.conn.execute("INSERT OR REPLACE INTO titles (id, title) VALUES (?, ?)", (video_id, title))
+            except sqlite3.Error:
+                pass
+
+    def seed_from_history(self, history):
+        """One-off bootstrap from an ordered [{id, title}] history list."""
+        pairs = [(a["id"], b["id"]) for a, b in zip(history, history[1:]) if a["id"] != b["id"]]
+        titles = {h["id"]: h["title"] for h in history if h.get("title")}
+        if pairs:
+            self.record_many(pairs, titles)
+
+    def next_candidates(self, video_id, exclude=(), limit=10):
+        """
+        Returns [{id, title, duration}] of tracks that followed video_id most often,
+        topped up with tracks that led into it. Excluded IDs (recently played) are skipped.
+        """
+        exclude = set(exclude)
+        exclude.add(video_id)
+        with self.lock:
+            scores = {}
+            for dst, count in self.edges.get(video_id, {}).items():
+                if dst not in exclude:
+                    scores[dst] = count * 2 # Real "played next" beats co-listening
+            for src, count in self.incoming.get(video_id, {}).items():
+                if src not in exclude and src not in scores:
+                    scores[src] = count
+            best = heapq.nlargest(limit, scores.items(), key=lambda kv: kv[1])
+            return [
+                {"id": vid_id, "title": self.titles.get(vid_id, ""), "duration": None}
+                for vid_id, _ in best
+                if self.titles.get(vid_id)
+            ]
@@ -0,0 +1,92 @@
+import random
+import threading
+import time
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+# Seconds allowed per attempt; searches and comment pages are larger responses
+ENDPOINT_TIMEOUTS = {
+    "search.list": 8,
+    "videos.list": 5,
+    "commentThreads.list": 8,
+    "playlistItems.list": 8,
+}
+DEFAULT_TIMEOUT = 10
+
+# Server-side hiccups worth another attempt (4xx besides 429 won't fix themselves)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the API while the circuit breaker is open."""
+    pass
+
+def is_transient(error):
+    """True for network/timeout errors and retryable HTTP statuses."""
+    if isinstance(error, HttpError):
+        return error.resp.status in RETRY_STATUSES
+    # socket.timeout and ConnectionError are OSErrors; DNS failures are httplib2 errors
+    return isinstance(error, (OSError, httplib2.HttpLib2Error))
+
+class RetryPolicy:
+    """
+    Bounded retries with "full jitter" exponential backoff:
+    attempt n sleeps a random time in [0, min(cap, base * 2^n)].
+    The total time spent sleeping is capped by `budget`.
+    """
+    def __init__(self, attempts=3, base=0.4, cap=3.0, budget=5.0):
+        self.attempts = attempts
+        self.base = base
+        self.cap = cap
+        self.budget = budget
+
+    def delays(self):
+        spent = 0.0
+        for n in range(self.attempts - 1):
+            delay = random.uniform(0, min(self.cap, self.base * (2 ** n)))
+            delay = min(delay, self.budget - spent)
+            if delay < 0:
+                return
+            spent += delay
+            yield delay
+
+class CircuitBreaker:
+    """
+    Stops calling the API after `threshold` consecutive transient failures.
+    While open, calls fail immediately with CircuitOpenError (callers serve
+    stale cache). After `cooldown` seconds one trial call is let through
+    (half-open); success closes the breaker, failure re-opens it.
+    """
+    def __init__(self, threshold=4, cooldown=30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+
+    def is_open(self):
+        with self.lock:
+            return self.opened_at is not None and time.monotonic() - self.opened_at < self.cooldown
+
+    def before_call(self):
+        """Raises CircuitOpenError unless a call may go out now."""
+        with self.lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < self.cooldown or self.trial_running:
+                raise CircuitOpenError("YouTube API temporarily unreachable")
+            self.trial_running = True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial_running or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self.trial_running = False
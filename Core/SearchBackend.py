@@ -0,0 +1,224 @@
+import json
+import os
+import time
+import threading
+from abc import ABC, abstractmethod
+
+from googleapiclient.errors import HttpError
+
+def format_duration(total_seconds):
+    """Seconds -> 'M:SS' or 'H:MM:SS' (same format as get_video_details)."""
+    total_seconds = int(total_seconds)
+    minutes = total_seconds // 60
+    seconds = total_seconds % 60
+    if minutes >= 60:
+        return f"{minutes // 60}:{minutes % 60:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+def make_result(video_id, title, channel="", duration=None):
+    """Normalized search record shared by every backend."""
+    return {"id": video_id, "title": title or "", "channel": channel or "", "duration": duration}
+
+class SearchBackend(ABC):
+    """
+    Base class for search engines.
+    Subclasses implement _search(); search() wraps it with latency bookkeeping
+    so the app can compare backends and prefer the faster one.
+    Returns (results, next_page_token) where results are make_result() records.
+    """
+    name = "base"
+    label = "Base"
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.total_latency = 0.0
+        self.last_latency = None
+
+    def available(self):
+        return True
+
+    def search(self, query, limit=20, page_token=None):
+        start = time.perf_counter()
+        result = self._search(query, limit, page_token)
+        # Only successful searches count: a backend that fails fast is not fast
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.calls += 1
+            self.total_latency += elapsed
+            self.last_latency = elapsed
+        return result
+
+    @abstractmethod
+    def _search(self, query, limit, page_token):
+        """Returns (results, next_page_token) for one page."""
+
+    @property
+    def avg_latency(self):
+        """Mean seconds per search, or None if never used."""
+        with self.lock:
+            if not self.calls:
+                return None
+            return self.total_latency / self.calls
+
+    def latency_text(self):
+        avg = self.avg_latency
+        if avg is None:
+            return "n/a"
+        return f"{avg * 1000:.0f} ms avg ({self.calls}x)"
+
+class DataApiSearchBackend(SearchBackend):
+    """YouTube Data API search().list - 100 quota units per page."""
+    name = "api"
+    label = "YouTube Data API"
+
+    def __init__(self, app, default_key=None):
+        super().__init__()
+        self.app = app
+        self.default_key = default_key # The placeholder shipped in place of a real key
+        self.rejected_key = None # Key the API refused (400/401/403 other than quota)
+
+    def available(self):
+        if not self.app.api_key or self.app.api_key == self.default_key:
+            return False
+        if self.rejected_key == self.app.api_key:
+            return False
+        if self.app.api_breaker.is_open():
+            return False
+        return self.app.youtube is not None and self.app.quota.can_afford("search.list")
+
+    def _search(self, query, limit, page_token):
+        request = self.app.youtube.search().list(
+            part="snippet",
+            maxResults=limit,
+            q=query,
+            type="video",
+            pageToken=page_token,
+            fields="nextPageToken,items(id(videoId),snippet(title,channelTitle))" # Partial response
+        )
+        try:
+            response = request.execute()
+        except HttpError as e:
+            quota = b"quotaExceeded" in e.content or b"dailyLimitExceeded" in e.content
+            if e.resp.status in (400, 401, 403) and not quota:
+                # Bad or revoked key: stop offering the API until the key changes
+                self.rejected_key = self.app.api_key
+            raise
+
+        results = []
+        for item in response.get("items", []):
+            if "videoId" not in item["id"]:
+                continue
+            snippet = item["snippet"]
+            results.append(make_result(item["id"]["videoId"], snippet["title"], snippet.get("channelTitle")))
+        return results, response.get("nextPageToken")
+
+class YtDlpSearchBackend(SearchBackend):
+    """
+    API-free search through yt-dlp flat extraction ('ytsearchN:').
+    Flat results already carry durations, which are handed to on_metadata
+    (the metadata cache) so no videos().list call is needed afterwards.
+    """
+    name = "ytdlp"
+    label = "yt-dlp (no API key)"
+
+    def __init__(self, on_metadata=None):
+        super().__init__()
+        self.on_metadata = on_metadata
+
+    def _search(self, query, limit, page_token):
+        import yt_dlp
+
+        # ytsearch has no cursor: page tokens are result offsets
+        offset = 0
+        if page_token:
+            if not page_token.startswith("ytdlp:"):
+                return [], None
+            offset = int(page_token.split(":", 1)[1])
+
+        opts = {'quiet': True, 'no_warnings': True, 'extract_flat': 'in_playlist', 'skip_download': True}
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            info = ydl.extract_info(f"ytsearch{offset + limit}:{query}", download=False)
+
+        entries = [e for e in (info.get("entries") or []) if e and e.get("id")]
+        results = []
+        metadata = {}
+        for entry in entries[offset:offset + limit]:
+            duration = format_duration(entry["duration"]) if entry.get("duration") else None
+            results.append(make_result(entry["id"], entry.get("title"), entry.get("channel") or entry.get("uploader"), duration))
+            if duration:
+                metadata[entry["id"]] = {"title": entry.get("title") or "", "duration": duration}
+
+        if self.on_metadata and metadata:
+            self.on_metadata(metadata)
+
+        next_token = f"ytdlp:{offset + limit}" if len(entries) >= offset + limit else None
+        return results, next_token
+
+class FixtureSearchBackend(SearchBackend):
+    """
+    Offline backend serving records from a JSON fixture file
+    ({"latency_ms": int, "results": [records]}). Used for tests and benchmarks.
+    """
+    name = "fixture"
+    label = "Local fixture"
+
+    def __init__(self, path, latency_ms=None):
+        super().__init__()
+        self.path = path
+        self.latency_ms = latency_ms
+        self._data = None
+
+    def available(self):
+        return os.path.exists(self.path)
+
+    def _load(self):
+        if self._data is None:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._data = json.load(f)
+        return self._data
+
+    def _search(self, query, limit, page_token):
+        data = self._load()
+        latency = self.latency_ms if self.latency_ms is not None else data.get("latency_ms", 0)
+        if latency:
+            time.sleep(latency / 1000.0)
+
+        records = data.get("results", [])
+        words = [w for w in query.lower().split() if w]
+        matched = [r for r in records if all(w in r["title"].lower() for w in words)]
+        if not matched:
+            matched = records # Fixture always answers something
+
+        offset = int(page_token) if page_token and page_token.isdigit() else 0
+        page = matched[offset:offset + limit]
+        results = [make_result(r["id"], r.get("title"), r.get("channel"), r.get("duration")) for r in page]
+        next_token = str(offset + limit) if offset + limit < len(matched) else None
+        return results, next_token
+
+def pick_fastest(backends):
+    """
+    Returns the available backend with the lowest average latency.
+    Unmeasured backends win so each one gets timed at least once;
+    ties keep the given order (preference).
+    """
+    candidates = [b for b in backends if b.available()]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda b: b.avg_latency or 0.0)
+
+def benchmark(backends, queries, rounds=3):
+    """Runs every query `rounds` times per backend. Returns {name: avg seconds or None}."""
+    report = {}
+    for backend in backends:
+        if not backend.available():
+            report[backend.name] = None
+            continue
+        for _ in range(rounds):
+            for q in queries:
+                try:
+                    backend.search(q, 20)
+                except Exception:
+                    pass
+        report[backend.name] = backend.avg_latency
+    return report
@@ -0,0 +1,66 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class VideoResolver:
+    """
+    Resolves video IDs through videos().list without hitting its 50-ID limit.
+    ID sets are split into 50-ID chunks that run concurrently on a bounded
+    thread pool; lookups for IDs already in flight (from another caller)
+    wait on the existing request instead of issuing a new one.
+    """
+    CHUNK_SIZE = 50
+
+    def __init__(self, fetch_chunk, max_workers=4):
+        # fetch_chunk(list_of_ids) -> {video_id: details}
+        self.fetch_chunk = fetch_chunk
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="yt-resolver")
+        self.lock = threading.RLock()
+        self.in_flight = {} # video_id -> Future of the chunk containing it
+
+    def resolve(self, video_ids):
+        """
+        Returns {video_id: details} for the given IDs.
+        Failed chunks are left out; raises only if every chunk failed.
+        """
+        ids = list(dict.fromkeys(v for v in video_ids if v))
+        if not ids:
+            return {}
+
+        waits = {}
+        with self.lock:
+            to_fetch = []
+            for vid_id in ids:
+                fut = self.in_flight.get(vid_id)
+                if fut:
+                    waits[vid_id] = fut # Coalesce with the running lookup
+                else:
+                    to_fetch.append(vid_id)
+
+            for i in range(0, len(to_fetch), self.CHUNK_SIZE):
+                chunk = to_fetch[i:i + self.CHUNK_SIZE]
+                fut = self.executor.submit(self.fetch_chunk, chunk)
+                for vid_id in chunk:
+                    self.in_flight[vid_id] = fut
+                    waits[vid_id] = fut
+                fut.add_done_callback(lambda f, c=chunk: self._release(c, f))
+
+        results = {}
+        error = None
+        for fut in set(waits.values()):
+            try:
+                results.update(fut.result())
+            except Exception as e:
+                error = e
+
+        if error and not results:
+            raise error
+        return {vid_id: results[vid_id] for vid_id in ids if vid_id in results}
+
+    def _release(self, chunk, fut):
+        with self.lock:
+            for vid_id in chunk:
+                if self.in_flight.get(vid_id) is fut:
+                    del self.in_flight[vid_id]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,71 @@
+import json
+import os
+import threading
+import time
+
+def write_json_atomic(path, data, indent=2):
+    """Writes JSON to a temp file and renames it over `path` (never leaves a torn file)."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class WriteBehind:
+    """
+    Background JSON writer for small state files (config, quota ledger).
+    schedule() only records "this file is dirty" plus a callable producing
+    its latest contents; the worker writes it once things have been quiet
+    for `delay` seconds (or at most `max_delay` after the first change), so
+    a burst of changes costs one atomic write. flush() writes everything
+    still pending right away (used on exit).
+    """
+    def __init__(self, delay=0.5, max_delay=3.0):
+        self.delay = delay
+        self.max_delay = max_delay
+        self.cond = threading.Condition()
+        self.pending = {} # path -> [snapshot, indent, first_at, last_at]
+        self.write_lock = threading.Lock()
+        threading.Thread(target=self._run, daemon=True, name="yt-write-behind").start()
+
+    def schedule(self, path, snapshot, indent=2):
+        now = time.monotonic()
+        with self.cond:
+            entry = self.pending.get(path)
+            if entry:
+                entry[0], entry[1], entry[3] = snapshot, indent, now
+            else:
+                self.pending[path] = [snapshot, indent, now, now]
+            self.cond.notify()
+
+    def _due_at(self, entry):
+        return min(entry[2] + self.max_delay, entry[3] + self.delay)
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.pending:
+                    self.cond.wait()
+                now = time.monotonic()
+                due = {p: e for p, e in self.pending.items() if self._due_at(e) <= now}
+                if not due:
+                    self.cond.wait(min(self._due_at(e) for e in self.pending.values()) - now)
+                    continue
+                for path in due:
+                    del self.pending[path]
+            self._write_all(due)
+
+    def _write_all(self, entries):
+        with self.write_lock:
+            for path, (snapshot, indent, _, _) in entries.items():
+                try:
+                    write_json_atomic(path, snapshot(), indent)
+                except (OSError, TypeError, ValueError):
+                    pass
+
+    def flush(self):
+        with self.cond:
+            entries = dict(self.pending)
+            self.pending.clear()
+        self._write_all(entries)
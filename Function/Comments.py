@@ -6,56 +6,103 @@ from rich.prompt import Prompt
 from rich.text import Text
 import textwrap
 
+COMMENT_PAGE_SIZE = 30 # Increased limit
+
+def fetch_comment_page(app, video_id, page_token=None):
+    """
+    Returns (comments, next_page_token) for one page of top-level comments.
+    Pages are cached per video (30 min TTL) so reopening a video is instant.
+    """
+    key = [video_id, page_token]
+    cached = app.comment_cache.get(key)
+    if cached is not None:
+        return cached["comments"], cached.get("next")
+
+    request = app.youtube.commentThreads().list(
+        part="snippet",
+        videoId=video_id,
+        maxResults=COMMENT_PAGE_SIZE,
+        textFormat="plainText",
+        order="relevance",
+        pageToken=page_token,
+        fields="nextPageToken,items(snippet(topLevelComment(snippet(authorDisplayName,textDisplay,likeCount,publishedAt))))"
+    )
+    try:
+        response = request.execute()
+    except Exception:
+        # Flaky link or open circuit breaker: serve an expired copy if there is one
+        stale = app.comment_cache.get(key, allow_stale=True)
+        if stale is None:
+            raise
+        return stale["comments"], stale.get("next")
+
+    comments_data = []
+    for item in response.get("items", []):
+        comment = item["snippet"]["topLevelComment"]["snippet"]
+        comments_data.append({
+            "author": comment["authorDisplayName"],
+            "text": comment["textDisplay"],
+            "likes": str(comment["likeCount"]),
+            "date": comment["publishedAt"][:10]
+        })
+    new_token = response.get("nextPageToken")
+
+    app.comment_cache.put(key, {"comments": comments_data, "next": new_token})
+    return comments_data, new_token
+
+def prefetch_comment_page(app, video_id, page_token):
+    """Loads the following page in the background while the current one is read."""
+    if page_token:
+        app.prefetcher.submit(("comments", video_id, page_token), fetch_comment_page, app, video_id, page_token)
+
+def load_comment_page(app, video_id, page_token, status):
+    """Returns a page from the prefetcher, the cache or the API (in that order)."""
+    fut = app.prefetcher.take(("comments", video_id, page_token))
+    if fut is not None:
+        try:
+            if not fut.done():
+                with app.console.status(status):
+                    return fut.result()
+            return fut.result()
+        except Exception:
+            pass # Fall through to a foreground fetch
+
+    if app.comment_cache.get([video_id, page_token]) is not None:
+        return fetch_comment_page(app, video_id, page_token)
+
+    with app.console.status(status):
+        return fetch_comment_page(app, video_id, page_token)
+
+def get_comment_count(app, video_id):
+    """Comment count from the metadata cache (statistics come with get_video_details)."""
+    details = app.get_video_details([video_id]).get(video_id, {})
+    if "comments" not in details:
+        # Entry cached before statistics were stored: refresh it once
+        try:
+            with app.console.status("[bold blue]Fetching statistics...[/bold blue]"):
+                details = app.resolver.resolve([video_id]).get(video_id, {})
+        except Exception:
+            details = {}
+    return details.get("comments") or "Unknown"
+
 def show_comments(app, video_id, title):
     next_page_token = None
-    total_comments = "Unknown"
-    
-    # Fetch Statistics First
-    try:
-        with app.console.status("[bold blue]Fetching statistics...[/bold blue]"):
-            stat_req = app.youtube.videos().list(
-                part="statistics",
-                id=video_id
-            )
-            stat_resp = stat_req.execute()
-            if stat_resp.get("items"):
-                total_comments = stat_resp["items"][0]["statistics"].get("commentCount", "Unknown")
-    except: pass
+    total_comments = get_comment_count(app, video_id)
 
     current_idx = 0
     
     while True: # Page Loop
         try:
-            items = []
-            new_token = None
-            
-            with app.console.status(f"[bold blue]Loading comments ({total_comments} total)...[/bold blue]"):
-                request = app.youtube.commentThreads().list(
-                    part="snippet",
-                    videoId=video_id,
-                    maxResults=30, # Increased limit
-                    textFormat="plainText",
-                    order="relevance",
-                    pageToken=next_page_token
-                )
-                response = request.execute()
-                items = response.get("items", [])
-                new_token = response.get("nextPageToken")
-
-            if not items and not next_page_token:
+            status = f"[bold blue]Loading comments ({total_comments} total)...[/bold blue]"
+            comments_data, new_token = load_comment_page(app, video_id, next_page_token, status)
+
+            if not comments_data and not next_page_token:
                 app.console.print("[yellow]No comments found.[/yellow]")
                 Prompt.ask("Press Enter to return...")
                 return
 
-            comments_data = []
-            for item in items:
-                comment = item["snippet"]["topLevelComment"]["snippet"]
-                comments_data.append({
-                    "author": comment["authorDisplayName"],
-                    "text": comment["textDisplay"],
-                    "likes": str(comment["likeCount"]),
-                    "date": comment["publishedAt"][:10]
-                })
+            # Next page loads while this one is displayed
+            prefetch_comment_page(app, video_id, new_token)
             
             # Display Loop (Interaction within page)
             while True:
@@ -0,0 +1,179 @@
+from rich.table import Table
+from rich.panel import Panel
+from rich.live import Live
+from rich.align import Align
+from rich.text import Text
+from rich.console import Group
+from rich import box
+from rich.prompt import Prompt
+from Core.DownloadManager import format_bytes, DOWNLOAD_PROFILES
+import time
+
+STATUS_MARKS = {
+    "queued": "[dim]Queued[/dim]",
+    "running": "[cyan]Downloading[/cyan]",
+    "done": "[green]Done[/green]",
+    "failed": "[red]Failed[/red]",
+    "cancelled": "[dim]Cancelled[/dim]"
+}
+
+def job_progress(job):
+    if job["status"] == "running":
+        if job["phase"] == "processing":
+            return "Converting..."
+        if job["total"]:
+            text = f"{min(100, job['downloaded'] * 100 / job['total']):.0f}% of {format_bytes(job['total'])}"
+            if job["speed"]:
+                text += f" @ {format_bytes(job['speed'])}/s"
+            return text
+        return "Starting..."
+    if job["status"] == "queued" and job["resume_from"]:
+        return f"Resumes at {format_bytes(job['resume_from'])}"
+    if job["status"] == "failed":
+        return (job["error"] or "")[:40]
+    return ""
+
+def job_quality(job):
+    if job["kind"] == "audio":
+        return "Original"
+    if job["kind"] == "mp3":
+        return f"MP3 {job['quality'] or '192'}k"
+    if not job["quality"]:
+        return "MP4 best"
+    return f"MP4 ≤{job['quality'][2:]}p" if job["quality"].startswith("<=") else f"MP4 {job['quality']}p"
+
+def jobs_table(jobs, numbered=False):
+    table = Table(box=box.ROUNDED, expand=True)
+    if numbered:
+        table.add_column("No.", style="cyan", width=4)
+    table.add_column("Title", ratio=50, no_wrap=True, overflow="ellipsis")
+    table.add_column("Format", width=10)
+    table.add_column("Status", width=12)
+    table.add_column("Progress", ratio=30, no_wrap=True, overflow="ellipsis")
+    for idx, job in enumerate(jobs, 1):
+        row = [job["title"], job_quality(job), STATUS_MARKS.get(job["status"], job["status"]), job_progress(job)]
+        table.add_row(*([str(idx)] + row if numbered else row))
+    return table
+
+def watch_downloads(app):
+    """Live-updating queue view; any key returns."""
+    app.input_handler.flush()
+    with Live(console=app.console, screen=True, auto_refresh=False) as live:
+        while True:
+            summary = app.downloads.summary() or "No active downloads"
+            batch = app.downloads.active_batch()
+            live.update(Group(
+                Align.center(Text("Downloads ⬇️", style="bold gold1")),
+                Text(" "),
+                jobs_table(app.downloads.jobs_snapshot()),
+                Align.center(Text(summary, style="bold cyan")),
+                Align.center(Text(app.downloads.batch_summary(batch) if batch else "", style="cyan")),
+                Align.center(Text("Press any key to go back", style="dim"))
+            ), refresh=True)
+            if app.input_handler.kbhit():
+                app.input_handler.getch()
+                return
+            time.sleep(0.5)
+
+def job_action(app, job):
+    if job["status"] in ("queued", "running"):
+        if Prompt.ask(f"Cancel download of '{job['title']}'?", choices=["y", "n"], default="n") == "y":
+            app.downloads.cancel(job["id"])
+    elif job["status"] in ("failed", "cancelled"):
+        if job["error"]:
+            app.console.print(f"[red]{job['error']}[/red]")
+        if Prompt.ask("Retry this download?", choices=["y", "n"], default="y") == "y":
+            app.downloads.enqueue(job["video_id"], job["title"], job["kind"], job["quality"])
+
+def downloads_ui(app):
+    current_idx = 0
+    while True:
+        jobs = app.downloads.jobs_snapshot()
+        summary = app.downloads.summary() or f"{len(jobs)} downloads this session"
+
+        if app.gui_style == "arrow":
+            options = [{"key": "0", "title": "[ Back ]", "fmt": "", "status": "", "progress": ""}]
+            options.append({"key": "W", "title": "[bold cyan]Watch live[/bold cyan]", "fmt": "", "status": "", "progress": ""})
+            for idx, job in enumerate(jobs, 1):
+                options.append({
+                    "key": str(idx),
+                    "title": job["title"],
+                    "fmt": job_quality(job),
+                    "status": STATUS_MARKS.get(job["status"], job["status"]),
+                    "progress": job_progress(job),
+                    "raw": job
+                })
+            options.append({"key": "C", "title": "Clear finished", "fmt": "", "status": "", "progress": ""})
+            cols = [
+                ("Title", "title", 45, "left"),
+                ("Format", "fmt", 10, "left"),
+                ("Status", "status", 11, "left"),
+                ("Progress", "progress", 25, "left")
+            ]
+            if current_idx >= len(options): current_idx = len(options) - 1
+            selected, current_idx = app.render_interactive_menu(f"Downloads ⬇️  ({summary})", options, cols, current_idx)
+            if not selected: return
+            choice = selected["key"]
+            picked = selected.get("raw")
+        else:
+            app.console.clear()
+            if jobs:
+                app.console.print(jobs_table(jobs, numbered=True))
+            else:
+                app.console.print(Panel("[yellow]No downloads yet.[/yellow]", title="Downloads", border_style="yellow"))
+            app.console.print(f"[bold cyan]{summary}[/bold cyan]")
+            app.console.print("[dim][W] Watch live  [R] Refresh  [C] Clear finished  [0] Back[/dim]")
+            choice = Prompt.ask("Select", choices=[str(i) for i in range(1, len(jobs) + 1)] + ["W", "w", "R", "r", "C", "c", "0"], default="0").upper()
+            picked = jobs[int(choice) - 1] if choice.isdigit() and choice != "0" else None
+
+        if choice == "0":
+            return
+        elif choice == "W":
+            watch_downloads(app)
+        elif choice == "C":
+            app.downloads.clear_finished()
+        elif picked:
+            job_action(app, picked)
+
+def bulk_download_ui(app, items, label):
+    """
+    Queues every track of `items` (any iterable of {id, title}) with the
+    default quality profile, skipping tracks already downloaded.
+    """
+    if app.gui_style == "arrow":
+        options = [
+            {"key": "mp3", "desc": "MP3 (audio)"},
+            {"key": "audio", "desc": "Original audio (Opus/M4A, no re-encoding)"},
+            {"key": "mp4", "desc": "MP4 (video)"},
+            {"key": "0", "desc": "Cancel"}
+        ]
+        selected, _ = app.render_interactive_menu(f"Download all: {label}", options, [("Format", "desc", 30, "left")], 0)
+        if not selected or selected["key"] == "0":
+            return
+        kind = selected["key"]
+    else:
+        kind = Prompt.ask(f"Download all of {label} as (audio = original format, no re-encoding)", choices=["mp3", "audio", "mp4", "0"], default="mp3")
+        if kind == "0":
+            return
+
+    profile = DOWNLOAD_PROFILES.get(app.download_profile, DOWNLOAD_PROFILES["standard"])
+    # Any local audio file (MP3 or native) counts for the audio kinds
+    status_key = "mp4" if kind == "mp4" else "mp3"
+    todo, skipped = [], 0
+    with app.console.status("[bold blue]Checking the library...[/bold blue]"):
+        for item in items:
+            if app.get_download_status(item["title"], item["id"])[status_key]:
+                skipped += 1
+            else:
+                todo.append(item)
+        batch = app.downloads.enqueue_many(todo, kind, profile.get(kind), label=label) if todo else None
+
+    queued = len(batch["job_ids"]) if batch else 0
+    quality_note = "original quality" if kind == "audio" else f"{app.download_profile} quality"
+    app.console.print(f"[bold green]Queued {queued} {kind.upper()} downloads[/bold green] [dim]({quality_note})[/dim]")
+    if skipped:
+        app.console.print(f"[dim]{skipped} already downloaded, skipped.[/dim]")
+    if len(todo) > queued:
+        app.console.print(f"[dim]{len(todo) - queued} already in the download queue.[/dim]")
+    app.console.print("[dim]Progress, throughput and ETA show in the status line and under Downloads.[/dim]")
+    time.sleep(2)
@@ -2,35 +2,50 @@ from rich.panel import Panel
 from rich.table import Table
 from rich import box
 from rich.prompt import Prompt
+from Function import Downloads
 import time
 
+HISTORY_PAGE_SIZE = 20
+
 def history_ui(app):
+    """
+    Pages through the full play history, most recent first.
+    Only the visible page is read from the library (keyset cursors), so
+    opening and paging cost the same however long the history is.
+    """
     current_idx = 0
+    cursors = [None] # Start cursor of every page visited so far
     page = 0
     while True:
-        if not app.history:
-            app.console.print(Panel("[yellow]No play history yet.[/yellow]", title="Play History", border_style="yellow"))
-            time.sleep(1.5)
-            return
-        
-        rev_history = app.history[::-1]
-        
+        items, next_cursor = app.history_store.page(cursors[page], HISTORY_PAGE_SIZE)
+        if not items:
+            if page == 0:
+                app.console.print(Panel("[yellow]No play history yet.[/yellow]", title="Play History", border_style="yellow"))
+                time.sleep(1.5)
+                return
+            page -= 1
+            continue
+
+        if next_cursor is not None and len(cursors) == page + 1:
+            cursors.append(next_cursor)
+        has_next = next_cursor is not None
+        start = page * HISTORY_PAGE_SIZE
+        page_title = f"Play History 📜 (Page {page + 1}, {app.history_store.count()} tracks)"
+
         if app.gui_style == "arrow":
-            # Fetch durations for displayed items
-            ids = [item["id"] for item in rev_history]
-            details = {}
-            with app.console.status("[bold blue]Loading history details...[/bold blue]"):
-                details = app.get_video_details(ids)
+            # Fetch durations for the displayed page only
+            ids = [item["id"] for item in items]
+            details = app.get_video_details(ids, status="[bold blue]Loading history details...[/bold blue]")
 
             options = []
             options.append({"key": "0", "no": "←", "title": "[ Back ]", "dur": "", "mp3": "", "mp4": ""})
-            
-            for idx, item in enumerate(rev_history, 1):
+
+            for idx, item in enumerate(items, start + 1):
                 vid_id = item['id']
-                dl_status = app.get_download_status(item['title'])
+                dl_status = app.get_download_status(item['title'], vid_id)
                 mp3_mark = "[green]Yes[/green]" if dl_status["mp3"] else "[red]No[/red]"
                 mp4_mark = "[green]Yes[/green]" if dl_status["mp4"] else "[red]No[/red]"
-                
+
                 # Get duration from details or 'N/A'
                 duration = details.get(vid_id, {}).get("duration", "N/A")
 
@@ -44,61 +59,66 @@ def history_ui(app):
                     "raw": item
                 })
 
+            if has_next:
+                options.append({"key": "n", "no": ">>", "title": "[bold cyan]Next Page[/bold cyan]", "dur": "", "mp3": "", "mp4": ""})
+            if page > 0:
+                options.append({"key": "p", "no": "<<", "title": "[bold cyan]Prev Page[/bold cyan]", "dur": "", "mp3": "", "mp4": ""})
+            options.append({"key": "B", "no": "⬇", "title": "Download all", "dur": "", "mp3": "", "mp4": ""})
+
             cols = [
                 ("Title", "title", 60, "left"),
                 ("Duration", "dur", 8, "center"),
-                ("Mp3", "mp3", 8, "center"),
+                ("Audio", "mp3", 8, "center"),
                 ("Mp4", "mp4", 8, "center")
             ]
-            
+
             if current_idx >= len(options): current_idx = len(options) - 1
-            selected, current_idx = app.render_interactive_menu("Play History 📜", options, cols, current_idx)
-            
+            selected, current_idx = app.render_interactive_menu(page_title, options, cols, current_idx)
+
             if not selected: return
             choice = selected["key"]
-            
+
             if choice == "0": return
-            
-            if "raw" in selected:
+            elif choice == "n":
+                page += 1
+                current_idx = 0
+            elif choice == "p":
+                page -= 1
+                current_idx = 0
+            elif choice == "B":
+                Downloads.bulk_download_ui(app, app.history_store.iter_all(), "Play History")
+            elif "raw" in selected:
                 app.show_action_menu(selected["raw"])
 
         else:
-            MAX_PAGE = (len(rev_history) - 1) // 20
-            if page > MAX_PAGE: page = MAX_PAGE
-            if page < 0: page = 0
-            
-            start = page * 20
-            end = start + 20
-            view_items = rev_history[start:end]
-
-            table = Table(title=f"Play History (Page {page + 1}/{MAX_PAGE + 1})", box=box.ROUNDED)
+            table = Table(title=page_title, box=box.ROUNDED)
             table.add_column("No.", style="cyan", width=4)
             table.add_column("Title", style="white", width=60)
-            table.add_column("Mp3", justify="center", width=8)
+            table.add_column("Audio", justify="center", width=8)
             table.add_column("Mp4", justify="center", width=8)
 
             item_map = {}
-            for idx, item in enumerate(view_items, start + 1):
-                dl_status = app.get_download_status(item['title'])
+            for idx, item in enumerate(items, start + 1):
+                dl_status = app.get_download_status(item['title'], item['id'])
                 mp3_mark = "[green]Yes[/green]" if dl_status["mp3"] else "[red]No[/red]"
                 mp4_mark = "[green]Yes[/green]" if dl_status["mp4"] else "[red]No[/red]"
-                
+
                 table.add_row(str(idx), item['title'], mp3_mark, mp4_mark)
                 item_map[str(idx)] = item
-            
+
             app.console.print(table)
-            
-            choices = list(item_map.keys()) + ["0"]
-            nav_msg = ""
-            if len(rev_history) > end:
+
+            choices = list(item_map.keys()) + ["b", "0"]
+            nav_msg = ", 'b' Download all"
+            if has_next:
                 choices.append("n")
                 nav_msg += ", 'n' Next"
             if page > 0:
                  choices.append("p")
                  nav_msg += ", 'p' Prev"
-            
+
             choice = Prompt.ask(f"[dim]Select number{nav_msg} or 0 to back[/dim]", choices=choices, default="0")
-            
+
             if choice == "0": return
             elif choice == "n":
                 page += 1
@@ -106,5 +126,7 @@ def history_ui(app):
             elif choice == "p":
                 page -= 1
                 continue
+            elif choice == "b":
+                Downloads.bulk_download_ui(app, app.history_store.iter_all(), "Play History")
             elif choice in item_map:
                 app.show_action_menu(item_map[choice])
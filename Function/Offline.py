@@ -6,6 +6,7 @@ from rich.panel import Panel
 from rich.align import Align
 from rich import box
 from rich.prompt import Prompt
+from Core.Library import AUDIO_EXTENSIONS
 
 def offline_mode_ui(app):
     current_idx = 0
@@ -13,8 +14,9 @@ def offline_mode_ui(app):
         if app.gui_style == "arrow":
             options = [
                 {"key": "1", "action": "All Files"},
-                {"key": "2", "action": "MP3 Files (Audio)"},
+                {"key": "2", "action": "Audio Files (MP3/M4A/Opus)"},
                 {"key": "3", "action": "MP4 Files (Video)"},
+                {"key": "4", "action": "Saved Songs (Downloaded)"},
                 {"key": "0", "action": "[ Back ]"}
             ]
             
@@ -35,14 +37,15 @@ def offline_mode_ui(app):
             menu_table.add_column("Action", style="white")
             
             menu_table.add_row("[1]", "All Files")
-            menu_table.add_row("[2]", "MP3 Files (Audio Only)")
+            menu_table.add_row("[2]", "Audio Files (MP3/M4A/Opus)")
             menu_table.add_row("[3]", "MP4 Files (Video)")
+            menu_table.add_row("[4]", "Saved Songs (Downloaded)")
             menu_table.add_row("[0]", "Back")
             
             app.console.print(Align.center(menu_table))
             app.console.print("\n")
             
-            choice = Prompt.ask("Select", choices=["1", "2", "3", "0"], default="1")
+            choice = Prompt.ask("Select", choices=["1", "2", "3", "4", "0"], default="1")
         
         if choice == "1":
             offline_all_songs(app, "all")
@@ -50,6 +53,8 @@ def offline_mode_ui(app):
             offline_all_songs(app, "mp3")
         elif choice == "3":
             offline_all_songs(app, "mp4")
+        elif choice == "4":
+            offline_saved_songs(app)
         elif choice == "0":
             return
 
@@ -69,17 +74,22 @@ def offline_all_songs(app, filter_mode="all"):
             ftype = None
             path = os.path.join(DOWNLOAD_DIR, f)
             
-            if f.endswith(".mp3"):
-                base = f[:-4]
+            stem, _, ext = f.rpartition(".")
+            ext = ext.lower()
+            if ext in AUDIO_EXTENSIONS:
+                # MP3 or native M4A/Opus downloads all fill the audio ('mp3') slot
+                base = stem
                 ftype = 'mp3'
-            elif f.endswith(".mp4"):
-                base = f[:-4]
+            elif ext == "mp4":
+                base = stem
                 ftype = 'mp4'
             
             if base:
                 if base not in identities:
                     identities[base] = {'mp3': None, 'mp4': None, 'title': base}
-                identities[base][ftype] = path
+                # Prefer a native file over an MP3 of the same track
+                if not (ftype == 'mp3' and identities[base]['mp3'] and ext == "mp3"):
+                    identities[base][ftype] = path
 
         valid_items = []
         for k, v in identities.items():
@@ -91,14 +101,14 @@ def offline_all_songs(app, filter_mode="all"):
                  if v['mp4']: valid_items.append(v)
 
         if not valid_items:
-            app.console.print(f"[yellow]No {filter_mode.upper()} files found.[/yellow]")
+            app.console.print(f"[yellow]No {'audio' if filter_mode == 'mp3' else filter_mode.upper()} files found.[/yellow]")
             time.sleep(2)
             return
 
         valid_items.sort(key=lambda x: x['title'])
 
         title_suffix = ""
-        if filter_mode == "mp3": title_suffix = " (MP3)"
+        if filter_mode == "mp3": title_suffix = " (Audio)"
         elif filter_mode == "mp4": title_suffix = " (MP4)"
         
         menu_title = f"Offline Music{title_suffix}"
@@ -119,7 +129,9 @@ def offline_all_songs(app, filter_mode="all"):
                         path = item.get('mp3') or item.get('mp4')
                         
                     if path:
-                        seconds = app.get_track_duration(path)
+                        # Registered downloads carry their duration in the manifest
+                        entry = app.library.local_file(path)
+                        seconds = (entry and entry.get("duration")) or app.get_track_duration(path)
                         if seconds:
                             # Format MM:SS or HH:MM:SS
                             durations[item['title']] = str(datetime.timedelta(seconds=int(seconds)))
@@ -149,7 +161,7 @@ def offline_all_songs(app, filter_mode="all"):
             cols = [
                 ("Title", "title", 60, "left"),
                 ("Duration", "dur", 8, "center"),
-                ("Mp3", "mp3", 8, "center"),
+                ("Audio", "mp3", 8, "center"),
                 ("Mp4", "mp4", 8, "center")
             ]
             
@@ -168,7 +180,7 @@ def offline_all_songs(app, filter_mode="all"):
             table = Table(title=menu_title, box=box.ROUNDED)
             table.add_column("No.", style="cyan", width=4)
             table.add_column("Title", style="white", width=60)
-            table.add_column("Mp3", justify="center", width=8)
+            table.add_column("Audio", justify="center", width=8)
             table.add_column("Mp4", justify="center", width=8)
             
             item_map = {}
@@ -185,6 +197,49 @@ def offline_all_songs(app, filter_mode="all"):
             if choice in item_map:
                 handle_offline_selection(app, item_map[choice], filter_mode)
 
+def _duration_text(duration):
+    # Tracks store "M:SS"; files only known from the manifest carry seconds
+    if isinstance(duration, (int, float)):
+        return str(datetime.timedelta(seconds=int(duration)))
+    return duration or "N/A"
+
+def offline_saved_songs(app):
+    """Saved songs that have a local audio copy, playable without a network."""
+    current_idx = 1
+    songs = app.library.saved_downloaded()
+    if not songs:
+        app.console.print("[yellow]None of your saved songs are downloaded yet.[/yellow]")
+        time.sleep(2)
+        return
+    queue = [{"id": song["id"], "title": song["title"], "path": song["path"]} for song in songs]
+    menu_title = f"Saved Songs - Offline ({len(songs)})"
+
+    while True:
+        if app.gui_style == "arrow":
+            options = [{"key": "0", "no": "←", "title": "[ Back ]", "dur": ""}]
+            for idx, song in enumerate(songs, 1):
+                options.append({"key": str(idx), "no": str(idx), "title": song["title"], "dur": _duration_text(song["duration"])})
+            cols = [("Title", "title", 60, "left"), ("Duration", "dur", 8, "center")]
+
+            if current_idx >= len(options): current_idx = len(options) - 1
+            selected_item, current_idx = app.render_interactive_menu(menu_title, options, cols, current_idx)
+            if not selected_item or selected_item["key"] == "0": return
+            choice = selected_item["key"]
+        else:
+            table = Table(title=menu_title, box=box.ROUNDED)
+            table.add_column("No.", style="cyan", width=4)
+            table.add_column("Title", style="white", width=60)
+            table.add_column("Duration", justify="center", width=8)
+            for idx, song in enumerate(songs, 1):
+                table.add_row(str(idx), song["title"], _duration_text(song["duration"]))
+            app.console.print(table)
+            choice = Prompt.ask("[dim]Enter number to play from there or 0 to back[/dim]", default="0")
+            if choice == "0": return
+            if not choice.isdigit() or not 1 <= int(choice) <= len(songs): continue
+
+        # Plays the rest of the list from the selection, local files only
+        app.play_queue(queue, start_index=int(choice) - 1, enable_autoplay=False)
+
 def handle_offline_selection(app, item, filter_mode="all"):
     # Re-implemented stub/logic from Interactive/Classic. 
     # Since we are moving it here, we should include the FULL logic.
@@ -199,7 +254,7 @@ def handle_offline_selection(app, item, filter_mode="all"):
     while True:
         if app.gui_style == "arrow":
             options = [
-                {"key": "1", "action": "Play Audio (MP3)", "active": "✔" if item['mp3'] else "✖"},
+                {"key": "1", "action": "Play Audio", "active": "✔" if item['mp3'] else "✖"},
                 {"key": "2", "action": "Watch Video (MP4)", "active": "✔" if item['mp4'] else "✖"},
                 {"key": "3", "action": "Delete File", "active": "⚠"},
                 {"key": "0", "action": "[ Back ]", "active": ""}
@@ -211,7 +266,7 @@ def handle_offline_selection(app, item, filter_mode="all"):
             if choice == "0": return
         else:
              app.console.print(f"[bold gold1]Selected: {item['title']}[/bold gold1]")
-             app.console.print(f"[1] Play Audio (MP3)")
+             app.console.print(f"[1] Play Audio")
              app.console.print(f"[2] Watch Video (MP4)")
              app.console.print(f"[3] Delete File")
              app.console.print(f"[0] Back")
@@ -223,7 +278,7 @@ def handle_offline_selection(app, item, filter_mode="all"):
                 # Explicitly queue as audio
                 app.play_queue([{"title": item['title'], "path": item['mp3']}], start_index=0, enable_autoplay=False)
             else: 
-                app.console.print("[red]MP3 file not found![/red]")
+                app.console.print("[red]Audio file not found![/red]")
                 time.sleep(1)
         elif choice == "2":
             if item['mp4']: 
@@ -245,9 +300,9 @@ def handle_offline_selection(app, item, filter_mode="all"):
             # Deletion Logic
             del_opts = []
             if filter_mode == "mp4": del_opts = [{"key": "2", "action": "Delete MP4 Only"}]
-            elif filter_mode == "mp3": del_opts = [{"key": "1", "action": "Delete MP3 Only"}]
+            elif filter_mode == "mp3": del_opts = [{"key": "1", "action": "Delete Audio Only"}]
             else:
-                if item['mp3']: del_opts.append({"key": "1", "action": "Delete MP3 Only"})
+                if item['mp3']: del_opts.append({"key": "1", "action": "Delete Audio Only"})
                 if item['mp4']: del_opts.append({"key": "2", "action": "Delete MP4 Only"})
                 if item['mp3'] and item['mp4']: del_opts.append({"key": "3", "action": "Delete BOTH"})
             del_opts.append({"key": "0", "action": "Cancel"})
@@ -274,15 +329,20 @@ def handle_offline_selection(app, item, filter_mode="all"):
             try:
                 if del_choice == "1" and item['mp3']:
                     os.remove(item['mp3'])
-                    app.console.print("[green]MP3 deleted.[/green]")
+                    app.library.remove_local_file(item['mp3'])
+                    app.console.print("[green]Audio file deleted.[/green]")
                     item['mp3'] = None
                 elif del_choice == "2" and item['mp4']:
                     os.remove(item['mp4'])
+                    app.library.remove_local_file(item['mp4'])
                     app.console.print("[green]MP4 deleted.[/green]")
                     item['mp4'] = None
                 elif del_choice == "3":
-                     if item['mp3']: os.remove(item['mp3']); item['mp3'] = None
-                     if item['mp4']: os.remove(item['mp4']); item['mp4'] = None
+                     for kind in ('mp3', 'mp4'):
+                         if item[kind]:
+                             os.remove(item[kind])
+                             app.library.remove_local_file(item[kind])
+                             item[kind] = None
                      app.console.print("[green]Both deleted.[/green]")
                 time.sleep(1)
                 return
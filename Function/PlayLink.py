@@ -1,4 +1,5 @@
 from rich.prompt import Prompt
+from Core.PlaylistLoader import PlaylistLoader
 import time
 
 def play_link_ui(app):
@@ -9,6 +10,11 @@ def play_link_ui(app):
     url = Prompt.ask("Enter YouTube URL (Cancel with 0 or empty)")
     if not url or url == "0":
         return
+
+    playlist_id = app.extract_playlist_id(url)
+    if playlist_id:
+        playlist_ui(app, playlist_id, app.extract_video_id(url))
+        return
         
     vid_id = app.extract_video_id(url)
     if not vid_id:
@@ -16,9 +22,8 @@ def play_link_ui(app):
         time.sleep(2)
         return
         
-    with app.console.status("[bold blue]Fetching details...[/bold blue]"):
-        details = app.get_video_details([vid_id])
-        
+    details = app.get_video_details([vid_id], status="[bold blue]Fetching details...[/bold blue]")
+
     if not details or vid_id not in details:
         app.console.print("[red]Video not found or unavailable.[/red]")
         time.sleep(2)
@@ -33,3 +38,50 @@ def play_link_ui(app):
     }
     
     app.show_action_menu(video)
+
+def playlist_ui(app, playlist_id, video_id=None):
+    """Playlist/mix links: playback starts on the first page while the rest keeps loading."""
+    loader = PlaylistLoader(app, playlist_id, video_id).start()
+
+    with app.console.status("[bold blue]Loading playlist...[/bold blue]", spinner="dots"):
+        loader.queue.wait_for(0)
+
+    if not loader.queue:
+        reason = f" ({loader.error})" if loader.error else ""
+        app.console.print(f"[red]Playlist is empty or unavailable.{reason}[/red]")
+        time.sleep(2)
+        return
+
+    current_idx = 0
+    while True:
+        kind = "Mix" if loader.is_mix else "Playlist"
+        if loader.queue.done:
+            count = f"{len(loader.queue)} tracks"
+        else:
+            count = f"{len(loader.queue)}/{loader.total or '?'} tracks loaded"
+
+        if app.gui_style == "arrow":
+            options = [
+                {"key": "1", "action": "Play All 🎵"},
+                {"key": "2", "action": "Save All 💾"},
+                {"key": "0", "action": "Cancel"}
+            ]
+            cols = [("Action", "action", 30, "left")]
+            choice_item, current_idx = app.render_interactive_menu(f"{kind}: {count}", options, cols, current_idx)
+            if not choice_item: return
+            action = choice_item["key"]
+        else:
+            app.console.print(f"{kind}: [bold]{count}[/bold]")
+            app.console.print("Actions:\n[1] Play All 🎵\n[2] Save All 💾\n[0] Cancel")
+            action = Prompt.ask("Select action", choices=["1", "2", "0"], default="1")
+
+        if action == "1":
+            app.play_queue(loader.queue, start_index=0, enable_autoplay=False)
+        elif action == "2":
+            with app.console.status("[bold blue]Loading remaining tracks...[/bold blue]", spinner="dots"):
+                loader.queue.wait_done()
+            added = app.add_many_to_saved(loader.queue)
+            app.console.print(f"[green]Saved {added} new songs ({len(loader.queue) - added} already saved).[/green]")
+            time.sleep(1.5)
+        else:
+            return
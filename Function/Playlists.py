@@ -0,0 +1,238 @@
+from rich.table import Table
+from rich import box
+from rich.prompt import Prompt
+from Core.Library import SAVED_LIST
+from Core import PlaylistIO
+from Function import Downloads
+import os
+import time
+
+PLAYLIST_PAGE_SIZE = 20
+
+def display_name(name):
+    return "Saved Songs 💾" if name == SAVED_LIST else name
+
+def playlists_ui(app):
+    """Saved Songs plus the named playlists, with create and import."""
+    current_idx = 0
+    while True:
+        lists = app.library.playlists()
+
+        if app.gui_style == "arrow":
+            options = [{"key": "0", "name": "[ Back ]", "count": ""}]
+            for idx, pl in enumerate(lists, 1):
+                options.append({"key": str(idx), "name": display_name(pl["name"]), "count": str(pl["count"]), "raw": pl})
+            options.append({"key": "N", "name": "[bold cyan]+ New playlist[/bold cyan]", "count": ""})
+            options.append({"key": "I", "name": "[bold cyan]Import M3U / JSON...[/bold cyan]", "count": ""})
+            cols = [("Playlist", "name", 50, "left"), ("Tracks", "count", 8, "right")]
+
+            if current_idx >= len(options): current_idx = len(options) - 1
+            selected, current_idx = app.render_interactive_menu("Playlists 💾", options, cols, current_idx)
+            if not selected: return
+            choice = selected["key"]
+            picked = selected.get("raw")
+        else:
+            table = Table(title="Playlists", box=box.ROUNDED)
+            table.add_column("No.", style="cyan", width=4)
+            table.add_column("Playlist", style="white", width=50)
+            table.add_column("Tracks", justify="right", width=8)
+            for idx, pl in enumerate(lists, 1):
+                table.add_row(str(idx), display_name(pl["name"]), str(pl["count"]))
+            app.console.print(table)
+            app.console.print("[dim][N] New playlist  [I] Import M3U / JSON  [0] Back[/dim]")
+            choice = Prompt.ask("Select", choices=[str(i) for i in range(1, len(lists) + 1)] + ["N", "n", "I", "i", "0"], default="0").upper()
+            picked = lists[int(choice) - 1] if choice.isdigit() and choice != "0" else None
+
+        if choice == "0":
+            return
+        elif choice == "N":
+            name = Prompt.ask("New playlist name (empty to cancel)").strip()
+            if name:
+                app.library.create_playlist(name)
+        elif choice == "I":
+            import_playlist_ui(app)
+        elif picked:
+            playlist_ui(app, picked["name"])
+
+def playlist_ui(app, name):
+    """
+    One playlist, PLAYLIST_PAGE_SIZE rows at a time.
+    Only the visible page is read (and only its missing durations fetched),
+    so large playlists open as fast as small ones.
+    """
+    page = 0
+    current_idx = 0
+    while True:
+        total = app.library.playlist_count(name)
+        if not total:
+            app.console.print(f"[yellow]{display_name(name)} is empty.[/yellow]")
+            time.sleep(1.5)
+            return
+
+        max_page = (total - 1) // PLAYLIST_PAGE_SIZE
+        page = max(0, min(page, max_page))
+        start = page * PLAYLIST_PAGE_SIZE
+        items = app.library.playlist_page(name, start, PLAYLIST_PAGE_SIZE)
+
+        missing = [item["id"] for item in items if not item.get("duration")]
+        if missing:
+            details = app.get_video_details(missing, status="[bold blue]Loading details...[/bold blue]")
+            for item in items:
+                if not item.get("duration"):
+                    item["duration"] = details.get(item["id"], {}).get("duration")
+
+        page_title = f"{display_name(name)} (Page {page + 1}/{max_page + 1}, {total} tracks)"
+
+        if app.gui_style == "arrow":
+            options = [{"key": "0", "no": "←", "title": "[ Back ]", "dur": "", "mp3": "", "mp4": ""}]
+            for idx, song in enumerate(items, start + 1):
+                dl_status = app.get_download_status(song['title'], song['id'])
+                options.append({
+                    "key": str(idx),
+                    "no": str(idx),
+                    "title": song['title'],
+                    "dur": song.get("duration") or "N/A",
+                    "mp3": "[green]Yes[/green]" if dl_status["mp3"] else "[red]No[/red]",
+                    "mp4": "[green]Yes[/green]" if dl_status["mp4"] else "[red]No[/red]",
+                    "raw": song
+                })
+            if page < max_page:
+                options.append({"key": "n", "no": ">>", "title": "[bold cyan]Next Page[/bold cyan]", "dur": "", "mp3": "", "mp4": ""})
+            if page > 0:
+                options.append({"key": "p", "no": "<<", "title": "[bold cyan]Prev Page[/bold cyan]", "dur": "", "mp3": "", "mp4": ""})
+            options.append({"key": "A", "no": "▶", "title": "[bold green]Play all[/bold green]", "dur": "", "mp3": "", "mp4": ""})
+            options.append({"key": "B", "no": "⬇", "title": "Download all", "dur": "", "mp3": "", "mp4": ""})
+            options.append({"key": "E", "no": "⇪", "title": "Export M3U / JSON...", "dur": "", "mp3": "", "mp4": ""})
+            if name != SAVED_LIST:
+                options.append({"key": "D", "no": "✖", "title": "[red]Delete playlist[/red]", "dur": "", "mp3": "", "mp4": ""})
+
+            cols = [
+                ("Title", "title", 60, "left"),
+                ("Duration", "dur", 8, "center"),
+                ("Audio", "mp3", 8, "center"),
+                ("Mp4", "mp4", 8, "center")
+            ]
+            if current_idx >= len(options): current_idx = len(options) - 1
+            selected, current_idx = app.render_interactive_menu(page_title, options, cols, current_idx)
+            if not selected: return
+            choice = selected["key"]
+        else:
+            table = Table(title=page_title, box=box.ROUNDED)
+            table.add_column("No.", style="cyan", width=5)
+            table.add_column("Title", style="white", width=60)
+            table.add_column("Duration", style="yellow", width=8)
+            table.add_column("Audio", justify="center", width=8)
+            table.add_column("Mp4", justify="center", width=8)
+            for idx, song in enumerate(items, start + 1):
+                dl_status = app.get_download_status(song['title'], song['id'])
+                mp3_mark = "[green]Yes[/green]" if dl_status["mp3"] else "[red]No[/red]"
+                mp4_mark = "[green]Yes[/green]" if dl_status["mp4"] else "[red]No[/red]"
+                table.add_row(str(idx), song['title'], song.get("duration") or "N/A", mp3_mark, mp4_mark)
+            app.console.print(table)
+
+            choices = [str(i) for i in range(start + 1, start + len(items) + 1)] + ["A", "a", "B", "b", "E", "e", "0"]
+            nav_msg = ", 'a' Play all, 'b' Download all, 'e' Export"
+            if page < max_page:
+                choices += ["n"]
+                nav_msg += ", 'n' Next"
+            if page > 0:
+                choices += ["p"]
+                nav_msg += ", 'p' Prev"
+            if name != SAVED_LIST:
+                choices += ["D", "d"]
+                nav_msg += ", 'd' Delete"
+            choice = Prompt.ask(f"[dim]Select number{nav_msg} or 0 to back[/dim]", choices=choices, default="0")
+            if choice in ("a", "b", "e", "d"):
+                choice = choice.upper()
+
+        if choice == "0":
+            return
+        elif choice == "n":
+            page += 1
+            current_idx = 0
+        elif choice == "p":
+            page -= 1
+            current_idx = 0
+        elif choice == "A":
+            app.play_queue(app.library.playlist_view(name), start_index=0, enable_autoplay=False)
+        elif choice == "B":
+            Downloads.bulk_download_ui(app, app.library.playlist_view(name), display_name(name))
+        elif choice == "E":
+            export_playlist_ui(app, name)
+        elif choice == "D":
+            if Prompt.ask(f"Delete playlist '{name}'?", choices=["y", "n"], default="n") == "y":
+                app.library.delete_playlist(name)
+                return
+        elif choice.isdigit():
+            p_idx = int(choice) - 1
+            song = items[p_idx - start]
+            # The whole list as play context, still loaded lazily
+            app.show_action_menu(song, playlist=app.library.playlist_view(name), playlist_index=p_idx)
+
+def add_to_playlist_ui(app, video):
+    """Adds one track to a chosen (or new) playlist."""
+    lists = app.library.playlists()
+    if app.gui_style == "arrow":
+        options = [{"key": str(i), "name": display_name(pl["name"]), "raw": pl} for i, pl in enumerate(lists, 1)]
+        options.append({"key": "N", "name": "[bold cyan]+ New playlist[/bold cyan]"})
+        options.append({"key": "0", "name": "Cancel"})
+        selected, _ = app.render_interactive_menu(f"Add to playlist: {video['title']}", options, [("Playlist", "name", 50, "left")], 0)
+        if not selected or selected["key"] == "0":
+            return
+        choice = selected["key"]
+    else:
+        for i, pl in enumerate(lists, 1):
+            app.console.print(f"[{i}] {display_name(pl['name'])}")
+        app.console.print("[N] New playlist\n[0] Cancel")
+        choice = Prompt.ask("Add to", choices=[str(i) for i in range(1, len(lists) + 1)] + ["N", "n", "0"], default="0").upper()
+        if choice == "0":
+            return
+
+    if choice == "N":
+        name = Prompt.ask("New playlist name (empty to cancel)").strip()
+        if not name:
+            return
+    else:
+        name = lists[int(choice) - 1]["name"]
+
+    if app.library.add_saved([video], name):
+        app.console.print(f"[green]Added to {display_name(name)}.[/green]")
+    else:
+        app.console.print(f"[yellow]Already in {display_name(name)}.[/yellow]")
+    time.sleep(1)
+
+def export_playlist_ui(app, name):
+    file_stem = "saved_songs" if name == SAVED_LIST else name
+    default_path = os.path.join(app.BASE_DIR, f"{file_stem}.m3u")
+    path = Prompt.ask("Export to (.m3u or .json)", default=default_path).strip()
+    if not path:
+        return
+    try:
+        items = app.library.playlist_view(name)
+        if path.lower().endswith(".json"):
+            count = PlaylistIO.export_json(name, items, path)
+        else:
+            count = PlaylistIO.export_m3u(items, path)
+        app.console.print(f"[green]Exported {count} tracks to {path}[/green]")
+    except OSError as e:
+        app.console.print(f"[red]Export failed: {e}[/red]")
+    time.sleep(1.5)
+
+def import_playlist_ui(app):
+    path = Prompt.ask("Playlist file (.m3u, .m3u8 or .json; empty to cancel)").strip().strip('"')
+    if not path:
+        return
+    try:
+        suggested, items, skipped = PlaylistIO.import_file(path)
+    except (OSError, ValueError) as e:
+        app.console.print(f"[red]Import failed: {e}[/red]")
+        time.sleep(2)
+        return
+
+    name = Prompt.ask("Import into playlist", default=suggested).strip() or suggested
+    added = app.library.add_saved(items, name)
+    msg = f"[green]Imported {added} tracks into {display_name(name)}"
+    if skipped:
+        msg += f" ({skipped} entries without a YouTube ID skipped)"
+    app.console.print(msg + ".[/green]")
+    time.sleep(2)
@@ -3,6 +3,96 @@ from rich.table import Table
 from rich import box
 import time
 
+SEARCH_PAGE_SIZE = 20
+
+def _cached_page(app, backend, query, page_token):
+    cached = app.search_cache.get([backend.name, query, page_token])
+    if cached is None and backend.name != "api" and not app.search_backends["api"].available():
+        # API out of quota/unusable: an expired API page beats a fresh extraction
+        cached = app.search_cache.get(["api", query, page_token], allow_stale=True)
+    return cached
+
+def _backend_for(app, page_token):
+    # Page tokens only make sense to the backend that issued them
+    if not page_token:
+        return app.get_search_backend()
+    if page_token.startswith("ytdlp:"):
+        return app.search_backends["ytdlp"]
+    if page_token.isdigit():
+        return app.search_backends["fixture"]
+    return app.search_backends["api"]
+
+def fetch_search_page(app, query, page_token=None):
+    """
+    Returns (results, next_page_token) for one results page.
+    Results are normalized records from Core.SearchBackend ({id, title, channel, duration}).
+    Pages are cached by (backend, query, pageToken) so repeated queries are free.
+    """
+    backend = _backend_for(app, page_token)
+    try:
+        return _fetch_page(app, backend, query, page_token)
+    except Exception:
+        fallback = app.fallback_search_backend(backend)
+        if fallback is None or page_token:
+            raise
+        # 'auto' mode: a rejected key or API outage shouldn't cost the search
+        return _fetch_page(app, fallback, query, None)
+
+def _fetch_page(app, backend, query, page_token):
+    cached = _cached_page(app, backend, query, page_token)
+    if cached is not None:
+        return cached["items"], cached.get("next")
+
+    try:
+        results, new_token = backend.search(query, SEARCH_PAGE_SIZE, page_token)
+    except Exception:
+        # Flaky link: an expired copy of the page beats an error
+        stale = app.search_cache.get([backend.name, query, page_token], allow_stale=True)
+        if stale is None:
+            raise
+        return stale["items"], stale.get("next")
+    app.search_cache.put([backend.name, query, page_token], {"items": results, "next": new_token})
+    return results, new_token
+
+def _missing_details(items):
+    # Records from yt-dlp/fixtures already carry durations
+    return [item["id"] for item in items if not item.get("duration")]
+
+def _prefetch_job(app, query, page_token):
+    items, new_token = fetch_search_page(app, query, page_token)
+    # Warm the metadata cache so the page renders without a details request
+    missing = app.metadata_cache.missing(_missing_details(items))
+    if missing and app.search_backends["api"].available():
+        app.resolver.resolve(missing)
+    return items, new_token
+
+def prefetch_search_page(app, query, page_token):
+    """Fetches a page and its video details in the background."""
+    if not page_token:
+        return
+    if _backend_for(app, page_token).name == "api" and app.quota.is_low():
+        # A speculative search.list costs 100 units: only spend them when the user pages
+        return
+    app.prefetcher.submit(("search", query, page_token), _prefetch_job, app, query, page_token)
+
+def load_search_page(app, query, page_token=None):
+    """Returns a page from the prefetcher, the cache or the search backend (in that order)."""
+    fut = app.prefetcher.take(("search", query, page_token))
+    if fut is not None:
+        try:
+            if not fut.done():
+                with app.console.status(f"[bold green]Searching for '{query}'...[/bold green]", spinner="dots"):
+                    return fut.result()
+            return fut.result()
+        except Exception:
+            pass # Fall through to a foreground fetch
+
+    if _cached_page(app, _backend_for(app, page_token), query, page_token) is not None:
+        return fetch_search_page(app, query, page_token)
+
+    with app.console.status(f"[bold green]Searching for '{query}'...[/bold green]", spinner="dots"):
+        return fetch_search_page(app, query, page_token)
+
 def search_ui(app):
     query = Prompt.ask("Enter search query")
     if not query:
@@ -12,31 +102,18 @@ def search_ui(app):
     
     while True:
         try:
-            items = []
-            new_token = None
-            
-            with app.console.status(f"[bold green]Searching for '{query}'...[/bold green]", spinner="dots"):
-                request = app.youtube.search().list(
-                    part="snippet",
-                    maxResults=20,
-                    q=query,
-                    type="video",
-                    pageToken=next_page_token
-                )
-                response = request.execute()
-                items = response.get("items", [])
-                new_token = response.get("nextPageToken")
+            items, new_token = load_search_page(app, query, next_page_token)
             
             if not items:
                 app.console.print("[red]No results found.[/red]")
                 time.sleep(2)
                 return
 
-            # Collect video IDs
-            video_ids = [item["id"]["videoId"] for item in items if "videoId" in item["id"]]
+            # Fetch details (duration) for records that lack it - cached IDs skip the API
+            details_map = app.get_video_details(_missing_details(items), status="[bold blue]Loading details...[/bold blue]")
             
-            # Fetch details (duration)
-            details_map = app.get_video_details(video_ids)
+            # Start loading the next page while this one is browsed
+            prefetch_search_page(app, query, new_token)
             
             # Table Interaction Loop
             current_idx = 0
@@ -50,12 +127,10 @@ def search_ui(app):
                     seen_titles = set()
                     
                     for item in items:
-                        if "videoId" not in item["id"]: continue
-                        vid_id = item["id"]["videoId"]
+                        vid_id = item["id"]
                         
-                        snippet = item["snippet"]
                         info = details_map.get(vid_id, {})
-                        title_full = info.get("title", snippet["title"])
+                        title_full = info.get("title", item["title"])
                         # Sanitize immediately for comparison
                         title = app.sanitize_text(title_full) 
                         
@@ -66,16 +141,14 @@ def search_ui(app):
                         seen_ids.add(vid_id)
                         seen_titles.add(title)
                         
-                        duration = info.get("duration", "N/A")
-                        title = app.sanitize_text(title_full)
-                        duration = info.get("duration", "N/A")
+                        duration = info.get("duration") or item.get("duration") or "N/A"
                         
                         # Channel name
-                        channel_full = snippet["channelTitle"]
+                        channel_full = item["channel"]
                         channel = app.sanitize_text(channel_full)
                         
                         saved_mark = "Yes" if app.is_saved(vid_id) else ""
-                        dl_status = app.get_download_status(title_full)
+                        dl_status = app.get_download_status(title_full, vid_id)
                         mp3_mark = "[green]Yes[/green]" if dl_status["mp3"] else "[red]No[/red]"
                         mp4_mark = "[green]Yes[/green]" if dl_status["mp4"] else "[red]No[/red]"
                         
@@ -103,7 +176,7 @@ def search_ui(app):
                         ("Duration", "dur", 8, "center"),
                         ("Channel", "chan", 20, "left"),
                         ("Saved", "saved", 6, "center"),
-                        ("Mp3", "mp3", 6, "center"),
+                        ("Audio", "mp3", 6, "center"),
                         ("Mp4", "mp4", 6, "center")
                     ]
                     
@@ -135,22 +208,20 @@ def search_ui(app):
                     # Simplified for brevity in tool call, will rely on full implementation logic if I copy fully?
                     # Ensure I copy correctly.
                     table.add_column("Saved", style="green", width=6, justify="center")
-                    table.add_column("Mp3", justify="center", width=8)
+                    table.add_column("Audio", justify="center", width=8)
                     table.add_column("Mp4", justify="center", width=8)
                     
                     video_map = {}
                     idx_counter = 1
                     for item in items:
-                        if "videoId" not in item["id"]: continue
-                        vid_id = item["id"]["videoId"]
-                        snippet = item["snippet"]
+                        vid_id = item["id"]
                         info = details_map.get(vid_id, {})
-                        title_full = info.get("title", snippet["title"])
+                        title_full = info.get("title", item["title"])
                         title = app.sanitize_text(title_full)
-                        duration = info.get("duration", "N/A")
-                        channel = app.sanitize_text(snippet["channelTitle"])
+                        duration = info.get("duration") or item.get("duration") or "N/A"
+                        channel = app.sanitize_text(item["channel"])
                         saved_mark = "Yes" if app.is_saved(vid_id) else ""
-                        dl_status = app.get_download_status(title_full)
+                        dl_status = app.get_download_status(title_full, vid_id)
                         mp3_mark = "[green]Yes[/green]" if dl_status["mp3"] else "[red]No[/red]"
                         mp4_mark = "[green]Yes[/green]" if dl_status["mp4"] else "[red]No[/red]"
                         
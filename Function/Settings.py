@@ -3,12 +3,21 @@ from rich.table import Table
 from rich.align import Align
 from rich import box
 import time
+from Core.DownloadManager import DOWNLOAD_PROFILES
 from Mode.Interactive import InteractiveMode # Import for type hinting if needed, but mostly dynamic
 
 def settings_ui(app):
     while True:
         # Toggle Autoplay is now here
         autoplay_status = "ON" if app.autoplay else "OFF"
+        quota_status = f"{app.quota.remaining}/{app.quota.daily_budget} left"
+        if app.quota.is_low():
+            quota_status += " (low)"
+        active_backend = app.get_search_backend()
+        backend_status = f"{app.search_backend_pref.upper()} -> {active_backend.name} ({active_backend.latency_text()})"
+        profile = DOWNLOAD_PROFILES.get(app.download_profile, {})
+        profile_status = f"{app.download_profile.upper()} (MP3 {profile.get('mp3')}k, MP4 {profile.get('mp4')}p)"
+        rate_status = f"{app.download_rate_limit} KB/s" if app.download_rate_limit else "Unlimited"
         
         if app.gui_style == "arrow":
             options = [
@@ -16,12 +25,17 @@ def settings_ui(app):
                 {"key": "2", "label": "Set Volume", "val": f"{app.volume}%"},
                 {"key": "3", "label": "GUI Style", "val": app.gui_style.upper()},
                 {"key": "4", "label": "Autoplay", "val": autoplay_status, "desc": "Toggle Autoplay"},
+                {"key": "5", "label": "API Quota (today)", "val": quota_status},
+                {"key": "6", "label": "Search Backend", "val": backend_status},
+                {"key": "7", "label": "Download Workers", "val": str(app.download_workers)},
+                {"key": "8", "label": "Bulk Download Quality", "val": profile_status},
+                {"key": "9", "label": "Download Speed Limit", "val": rate_status},
                 {"key": "0", "label": "[ Back ]", "val": ""}
             ]
             
             cols = [
                 ("Option", "label", 30, "left"),
-                ("Value", "val", 20, "center")
+                ("Value", "val", 25, "center")
             ]
             
             selected, _ = app.render_interactive_menu("Settings 🔧", options, cols, 0)
@@ -34,7 +48,6 @@ def settings_ui(app):
                 new_key = Prompt.ask("Enter new API Key (leave empty to cancel)")
                 if new_key:
                     app.save_api_key(new_key)
-                    app.init_youtube_client()
             elif choice == "2":
                 new_vol = Prompt.ask("Enter volume (0-100)", default=str(app.volume))
                 try:
@@ -54,6 +67,16 @@ def settings_ui(app):
                 msg = "[green]Autoplay ON[/green]" if app.autoplay else "[red]Autoplay OFF[/red]"
                 app.console.print(msg)
                 time.sleep(0.5)
+            elif choice == "5":
+                set_quota_budget(app)
+            elif choice == "6":
+                cycle_search_backend(app)
+            elif choice == "7":
+                set_download_workers(app)
+            elif choice == "8":
+                cycle_download_profile(app)
+            elif choice == "9":
+                set_download_rate_limit(app)
 
         else:
             # Classic
@@ -70,17 +93,21 @@ def settings_ui(app):
             table.add_row("[2]", "Volume", f"{app.volume}%")
             table.add_row("[3]", "GUI Style", app.gui_style.upper())
             table.add_row("[4]", "Autoplay", autoplay_status)
+            table.add_row("[5]", "API Quota (today)", quota_status)
+            table.add_row("[6]", "Search Backend", backend_status)
+            table.add_row("[7]", "Download Workers", str(app.download_workers))
+            table.add_row("[8]", "Bulk Download Quality", profile_status)
+            table.add_row("[9]", "Download Speed Limit", rate_status)
             table.add_row("[0]", "Back")
             
             app.console.print(Align.center(table))
-            choice = Prompt.ask("Select", choices=["1", "2", "3", "4", "0"], default="1")
+            choice = Prompt.ask("Select", choices=["1", "2", "3", "4", "5", "6", "7", "8", "9", "0"], default="1")
             
             if choice == "0": return
             elif choice == "1":
                 new_key = Prompt.ask("Enter new API Key")
                 if new_key:
                     app.save_api_key(new_key)
-                    app.init_youtube_client()
             elif choice == "2":
                 # ... same logic ...
                 new_vol = Prompt.ask("Enter volume (0-100)", default=str(app.volume))
@@ -101,3 +128,61 @@ def settings_ui(app):
                 msg = "[green]Autoplay ON[/green]" if app.autoplay else "[red]Autoplay OFF[/red]"
                 app.console.print(msg)
                 time.sleep(0.5)
+            elif choice == "5":
+                set_quota_budget(app)
+            elif choice == "6":
+                cycle_search_backend(app)
+            elif choice == "7":
+                set_download_workers(app)
+            elif choice == "8":
+                cycle_download_profile(app)
+            elif choice == "9":
+                set_download_rate_limit(app)
+
+def set_quota_budget(app):
+    app.console.print(f"[dim]Used today: {app.quota.used} units. Searches cost 100, video/comment lookups cost 1.[/dim]")
+    new_budget = Prompt.ask("Daily quota budget (units)", default=str(app.quota.daily_budget))
+    try:
+        budget = int(new_budget)
+        if budget > 0:
+            app.quota.daily_budget = budget
+            app.save_config()
+    except: pass
+
+def set_download_workers(app):
+    new_count = Prompt.ask("Parallel downloads (1-8, applies on next start)", default=str(app.download_workers))
+    try:
+        count = int(new_count)
+        if 1 <= count <= 8:
+            app.download_workers = count
+            app.save_config()
+    except: pass
+
+def set_download_rate_limit(app):
+    app.console.print("[dim]Total speed for background downloads. They also slow down on their own while a stream is buffering.[/dim]")
+    new_limit = Prompt.ask("Limit in KB/s (0 = unlimited)", default=str(app.download_rate_limit))
+    try:
+        limit = int(new_limit)
+        if limit >= 0:
+            app.download_rate_limit = limit
+            app.bandwidth.limit = limit * 1024
+            app.save_config()
+    except: pass
+
+def cycle_download_profile(app):
+    order = list(DOWNLOAD_PROFILES)
+    current = app.download_profile if app.download_profile in order else order[0]
+    app.download_profile = order[(order.index(current) + 1) % len(order)]
+    app.save_config()
+    app.console.print(f"[green]Bulk download quality: {app.download_profile.upper()}[/green]")
+    time.sleep(0.5)
+
+def cycle_search_backend(app):
+    order = ["auto", "api", "ytdlp", "fixture"]
+    current = app.search_backend_pref if app.search_backend_pref in order else "auto"
+    app.search_backend_pref = order[(order.index(current) + 1) % len(order)]
+    app.save_config()
+    app.console.print(f"[green]Search backend: {app.search_backend_pref.upper()}[/green]")
+    for backend in app.search_backends.values():
+        app.console.print(f"[dim]{backend.label}: {backend.latency_text()}[/dim]")
+    time.sleep(1)
@@ -22,15 +22,19 @@ class ClassicMode:
         
         menu_table.add_row("[1]", "🔍", "Search", "Search YouTube and play audio")
         menu_table.add_row("[2]", "🌐", "Play from link", "Play directly from YouTube URL")
-        menu_table.add_row("[3]", "💾", "Saved Songs", "Your personal playlist")
+        menu_table.add_row("[3]", "💾", "Playlists", "Saved songs and your playlists")
         menu_table.add_row("[4]", "📜", "Play History", "Recently played tracks")
         # Autoplay removed
         menu_table.add_row("[5]", "🔧", "Settings", "API Key, Volume, Autoplay")
         menu_table.add_row("[6]", "📂", "Offline Mode", "Play downloaded music")
         menu_table.add_row("[7]", "🚀", "Internet Speed Test", "Check connection speed")
+        menu_table.add_row("[8]", "⬇️", "Downloads", "Background download queue")
         menu_table.add_row("[0]", "🚪", "Exit", "Close application")
         
         self.console.print(Align.center(menu_table))
+        download_status = self.app.downloads.summary()
+        if download_status:
+            self.console.print(Align.center(f"[bold cyan]{download_status}[/bold cyan]"))
         self.console.print("\n")
-        choice = Prompt.ask("[bold cyan]Select[/bold cyan]", choices=["1", "2", "3", "4", "5", "6", "7", "0"])
+        choice = Prompt.ask("[bold cyan]Select[/bold cyan]", choices=["1", "2", "3", "4", "5", "6", "7", "8", "0"])
         return choice
@@ -79,6 +79,11 @@ class InteractiveMode:
             # 4. Footer
             if footer_text:
                 render_group.append(Align.center(Text(footer_text, style="dim")))
+
+            # 5. Background downloads (only while something is queued/running)
+            download_status = self.app.downloads.summary() if hasattr(self.app, 'downloads') else ""
+            if download_status:
+                render_group.append(Align.center(Text(download_status, style="bold cyan")))
             
             return Group(*render_group)
 
@@ -114,12 +119,13 @@ class InteractiveMode:
         options = [
             {"key": "1", "icon": "🔍", "action": "Search", "desc": "Search YouTube and Play"},
             {"key": "2", "icon": "🌐", "action": "Play from link", "desc": "Play directly from YouTube URL"},
-            {"key": "3", "icon": "💾", "action": "Saved Songs", "desc": "Your personal playlist"},
+            {"key": "3", "icon": "💾", "action": "Playlists", "desc": "Saved songs and your playlists"},
             {"key": "4", "icon": "📜", "action": "Play History", "desc": "Recently played tracks"},
             # Autoplay removed (moved to settings)
             {"key": "5", "icon": "🔧", "action": "Settings", "desc": "API Key, Volume, Autoplay, Style"},
             {"key": "6", "icon": "📂", "action": "Offline Mode", "desc": "Play downloaded content"},
             {"key": "7", "icon": "🚀", "action": "Internet Speed Test", "desc": "Check network connection speed"},
+            {"key": "8", "icon": "⬇️", "action": "Downloads", "desc": "Background download queue"},
             {"key": "0", "icon": "🚪", "action": "[ Exit ]", "desc": "Close application"}
         ]
         cols = [("Icon", "icon", 4, "center"), ("Action", "action", 25, "left"), ("Desc", "desc", 40, "left")]
@@ -0,0 +1,16 @@
+"""
+Compares the offline-capable search backends.
+Usage: python bench_search.py [query ...]
+"""
+import os
+import sys
+
+from Core.SearchBackend import FixtureSearchBackend, YtDlpSearchBackend, benchmark
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if __name__ == "__main__":
+    queries = sys.argv[1:] or ["touhou"]
+    engines = [FixtureSearchBackend(os.path.join(BASE_DIR, "fixtures", "search.json")), YtDlpSearchBackend()]
+    for name, avg in benchmark(engines, queries).items():
+        print(f"{name:10s} {'unavailable' if avg is None else f'{avg * 1000:.1f} ms'}")
@@ -8,7 +8,8 @@ import re
 import signal
 import datetime
 import uuid # For unique IPC pipe names
-import yt_dlp # For downloading video/audio
+import threading
+import atexit
 import imageio_ffmpeg # For bundling ffmpeg binary automatically
 from pyfiglet import Figlet # For ASCII Art Banner
 from mutagen import File as MutagenFile # For Metadata
@@ -155,15 +156,34 @@ from rich import box
 from rich.live import Live
 from rich.progress import Progress, BarColumn, TextColumn, TimeElapsedColumn, TimeRemainingColumn
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, DownloadColumn, TransferSpeedColumn, TimeRemainingColumn
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document
 from rich import box
 from rich.live import Live
 from rich.progress import Progress, BarColumn, TextColumn, TimeElapsedColumn, TimeRemainingColumn
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, DownloadColumn, TransferSpeedColumn, TimeRemainingColumn
-from googleapiclient.discovery import build
 from Mode.Interactive import InteractiveMode
 from Mode.Classic import ClassicMode
-from Function import Search, History, Saved, Offline, Settings, PlayLink, Comments
+from Function import Search, History, Saved, Offline, Settings, PlayLink, Comments, Playlists, Downloads
+from Core.MetadataCache import MetadataCache
+from Core.VideoResolver import VideoResolver
+from Core.PageCache import PageCache
+from Core.Prefetcher import Prefetcher
+from Core.Quota import QuotaLedger, DEFAULT_DAILY_QUOTA
+from Core.ApiClient import ApiClient
+from Core.HttpTransport import HttpPool
+from Core.DiscoveryCache import DiscoveryCache
+from Core.Autoplay import AutoplayQueue
+from Core.Recommender import RecommendationGraph
+from Core.Resilience import CircuitBreaker, CircuitOpenError
+from Core.ApiReplay import ReplayTransport, replay_settings
+from Core.Journal import JournaledList
+from Core.Library import LibraryDB, AUDIO_EXTENSIONS
+from Core.HistoryStore import HistoryStore
+from Core.WriteBehind import WriteBehind
+from Core.FormatCache import FormatCache, best_audio
+from Core.BandwidthScheduler import BandwidthScheduler
+from Core.DownloadManager import DownloadManager, DEFAULT_PROFILE, format_bytes
+from Core.SearchBackend import DataApiSearchBackend, YtDlpSearchBackend, FixtureSearchBackend, pick_fastest, format_duration
 
 # Initialize Rich Console
 # Force UTF-8 on Windows for Unicode support (Emojis)
@@ -189,27 +209,83 @@ KEY_FILE = os.path.join(BASE_DIR, "key.txt")
 HISTORY_FILE = os.path.join(BASE_DIR, "history.json")
 SAVED_FILE = os.path.join(BASE_DIR, "saved.json")
 DOWNLOAD_DIR = os.path.join(BASE_DIR, "downloaded")
+CACHE_DB = os.path.join(BASE_DIR, "cache.db")
+QUOTA_FILE = os.path.join(BASE_DIR, "quota.json")
+SEARCH_FIXTURE = os.path.join(BASE_DIR, "fixtures", "search.json")
+DISCOVERY_FILE = os.path.join(BASE_DIR, "discovery_youtube_v3.json")
+HTTP_CACHE_DIR = os.path.join(BASE_DIR, ".http_cache")
+RECOMMEND_DB = os.path.join(BASE_DIR, "recommend.db")
+LIBRARY_DB = os.path.join(BASE_DIR, "library.db")
+HISTORY_RECENT = 100 # Recent plays mirrored in memory (the full history stays in library.db)
+API_FIXTURE_DIR = os.path.join(BASE_DIR, "fixtures", "api")
+DEFAULT_DOWNLOAD_WORKERS = 2 # Parallel background downloads
+DEFAULT_DOWNLOAD_FRAGMENTS = 4 # Parallel DASH fragments per download
 DEFAULT_KEY = "Insert your key here" 
 
 class YouTubeCLI:
     def __init__(self, console, autoplay=True):
         self.console = console
         self.api_key = self.load_api_key()
-        self.youtube = None
-        self.history = self.load_history()
-        self.saved_songs = self.load_saved_songs()
+        self._youtube = None
+        self._client_ready = threading.Event()
+        self._client_generation = 0
+        self.discovery = DiscoveryCache(DISCOVERY_FILE)
+        # Tracks, play events, saved songs and downloaded files
+        self.library = LibraryDB(LIBRARY_DB)
+        self.migrate_library()
+        self.history_store = HistoryStore(self.library, recent_size=HISTORY_RECENT)
         self.current_video_id = None
         self.autoplay = autoplay
         self.audio_analyzer = None
-        
+
+        # Small JSON state files are written off the UI thread
+        self.writer = WriteBehind()
+        atexit.register(self.writer.flush)
+
         # Load Config
         config = self.load_config()
+        self.api_replay_config = config.get("api_replay")
+        self.api_replay = replay_settings(config)
+        # Record/replay runs start cold and keep fixture data out of the real cache
+        replaying = self.api_replay["mode"] in ("replay", "record")
+        cache_db = ":memory:" if replaying else CACHE_DB
+
+        self.metadata_cache = MetadataCache(cache_db)
+        self.resolver = VideoResolver(self._fetch_and_cache_details)
+        self.http_pool = HttpPool(HTTP_CACHE_DIR)
+        self.api_breaker = CircuitBreaker() # Shared across client rebuilds
+        self.search_cache = PageCache(cache_db, "search", ttl=6 * 3600)
+        self.comment_cache = PageCache(cache_db, "comments", ttl=30 * 60)
+        self.prefetcher = Prefetcher()
+        self.format_cache = FormatCache() # yt-dlp extractions shared by playback, the MP4 menu and downloads
+        self.autoplay_queue = AutoplayQueue(self)
+        self.recommender = RecommendationGraph(RECOMMEND_DB)
+        if self.recommender.is_empty() and len(self.history_store.recent) > 1:
+            self.recommender.seed_from_history(self.history_store.recent_items())
+        
         self.volume = config.get("volume", 100)
         self.volume = config.get("volume", 100)
         self.gui_style = config.get("gui_style", "choice") # 'choice' or 'arrow'
+        # Replayed calls cost nothing, so they get a throwaway in-memory ledger
+        self.quota = QuotaLedger(None if self.api_replay["mode"] == "replay" else QUOTA_FILE, daily_budget=config.get("quota_budget", DEFAULT_DAILY_QUOTA), writer=self.writer)
+        self.search_backend_pref = config.get("search_backend", "auto") # 'auto', 'api', 'ytdlp' or 'fixture'
+        # Downloads run in the background; unfinished jobs resume on the next launch
+        self.download_workers = config.get("download_workers", DEFAULT_DOWNLOAD_WORKERS)
+        self.download_profile = config.get("download_profile", DEFAULT_PROFILE) # Quality for bulk downloads
+        self.download_rate_limit = config.get("download_rate_limit", 0) # KB/s for all downloads together, 0 = no cap
+        self.download_fragments = config.get("download_fragments", DEFAULT_DOWNLOAD_FRAGMENTS)
+        self.bandwidth = BandwidthScheduler(limit=self.download_rate_limit * 1024)
+        self.downloads = DownloadManager(self.library, DOWNLOAD_DIR, imageio_ffmpeg.get_ffmpeg_exe, workers=self.download_workers, format_cache=self.format_cache,
+                                         scheduler=self.bandwidth, fragments=self.download_fragments)
+        self.search_backends = {
+            "api": DataApiSearchBackend(self, default_key=DEFAULT_KEY),
+            "ytdlp": YtDlpSearchBackend(on_metadata=self.metadata_cache.put_many),
+            "fixture": FixtureSearchBackend(SEARCH_FIXTURE)
+        }
         self.main_menu_idx = 0 # Persistent cursor for Main Menu
         
         self.DOWNLOAD_DIR = DOWNLOAD_DIR
+        self.BASE_DIR = BASE_DIR
         self.input_handler = InputHandler
         self.interactive_ui = InteractiveMode(self, InputHandler)
         self.classic_ui = ClassicMode(self)
@@ -220,7 +296,7 @@ class YouTubeCLI:
     CONFIG_FILE = os.path.join(BASE_DIR, "config.json")
 
     def load_config(self):
-        defaults = {"gui_style": "choice", "volume": 100}
+        defaults = {"gui_style": "choice", "volume": 100, "quota_budget": DEFAULT_DAILY_QUOTA, "search_backend": "auto", "download_workers": DEFAULT_DOWNLOAD_WORKERS, "download_profile": DEFAULT_PROFILE, "download_rate_limit": 0, "download_fragments": DEFAULT_DOWNLOAD_FRAGMENTS}
         if os.path.exists(self.CONFIG_FILE):
             try:
                 with open(self.CONFIG_FILE, "r") as f:
@@ -231,61 +307,67 @@ class YouTubeCLI:
         return defaults
 
     def save_config(self):
+        """Queues config.json for the write-behind worker (coalesced, atomic)."""
+        self.writer.schedule(self.CONFIG_FILE, self.config_snapshot)
+
+    def config_snapshot(self):
         config = {
             "gui_style": self.gui_style,
-            "volume": self.volume
+            "volume": self.volume,
+            "quota_budget": self.quota.daily_budget,
+            "search_backend": self.search_backend_pref,
+            "download_workers": self.download_workers,
+            "download_profile": self.download_profile,
+            "download_rate_limit": self.download_rate_limit,
+            "download_fragments": self.download_fragments
         }
-        with open(self.CONFIG_FILE, "w") as f:
-            json.dump(config, f, indent=2)
-
-    def load_history(self):
-        if os.path.exists(HISTORY_FILE):
-            try:
-                with open(HISTORY_FILE, "r") as f:
-                    return json.load(f)
-            except:
-                pass
-        return []
-
-    def save_history(self):
-        with open(HISTORY_FILE, "w") as f:
-            json.dump(self.history, f, indent=2)
+        if self.api_replay_config is not None:
+            config["api_replay"] = self.api_replay_config
+        return config
+
+    def migrate_library(self):
+        """One-time import of history.json / saved.json (and their journals) into library.db."""
+        if self.library.needs_migration():
+            history = JournaledList(HISTORY_FILE).items
+            saved = JournaledList(SAVED_FILE).items
+            mtime = os.path.getmtime(HISTORY_FILE) if os.path.exists(HISTORY_FILE) else None
+            self.library.migrate_json(history, saved, mtime)
+        # Pick up files added/removed outside the app
+        threading.Thread(target=self.library.sync_local_files, args=(DOWNLOAD_DIR,), daemon=True, name="yt-library-scan").start()
+
+    def last_played(self):
+        """{id, title} of the most recent play, or None."""
+        return self.history_store.last()
+
+    @property
+    def saved_songs(self):
+        """Lazy, paged view of the Saved Songs list."""
+        return self.library.playlist_view()
 
     def add_to_history(self, video_id, title):
-        # Remove if exists to push to top/end (most recent)
-        self.history = [h for h in self.history if h['id'] != video_id]
-        self.history.append({"id": video_id, "title": title})
-        # Keep last 50
-        if len(self.history) > 100:
-            self.history.pop(0)
-        self.save_history()
-
-    def load_saved_songs(self):
-        if os.path.exists(SAVED_FILE):
-            try:
-                with open(SAVED_FILE, "r") as f:
-                    return json.load(f)
-            except:
-                pass
-        return []
-
-    def save_saved_songs(self):
-        with open(SAVED_FILE, "w") as f:
-            json.dump(self.saved_songs, f, indent=2)
+        """Records a play event. Returns its id for finish_play()."""
+        # Feed the local recommendation graph (previous track -> this one)
+        last = self.last_played()
+        self.recommender.record(last['id'] if last else None, video_id, title)
+        
+        return self.history_store.record_play(video_id, title)
 
     def add_to_saved(self, video_id, title):
         # Check if already exists
-        for song in self.saved_songs:
-            if song['id'] == video_id:
-                console.print("[yellow]Song already saved![/yellow]")
-                time.sleep(1)
-                return
+        if self.is_saved(video_id):
+            console.print("[yellow]Song already saved![/yellow]")
+            time.sleep(1)
+            return
         
-        self.saved_songs.append({"id": video_id, "title": title})
-        self.save_saved_songs()
+        self.library.add_saved([{"id": video_id, "title": title}])
         console.print("[green]Song saved for later![/green]")
         time.sleep(1)
 
+    def add_many_to_saved(self, items):
+        """Saves a batch of {id, title} items in one transaction. Returns how many were new."""
+        unique = list({item['id']: item for item in items}.values())
+        return self.library.add_saved(unique)
+
     def load_api_key(self):
         if os.path.exists(KEY_FILE):
             with open(KEY_FILE, "r") as f:
@@ -302,56 +384,137 @@ class YouTubeCLI:
         console.print("[green]API Key saved![/green]")
 
     def init_youtube_client(self):
-        try:
-            self.youtube = build("youtube", "v3", developerKey=self.api_key)
-        except Exception as e:
-            console.print(f"[red]Error initializing YouTube API: {e}[/red]")
-            self.youtube = None
+        """
+        Builds the API client on a background thread from the on-disk discovery
+        document, so startup (and API key changes) never wait on the network.
+        Accessing self.youtube blocks until the build has finished.
+        """
+        self._client_generation += 1
+        generation = self._client_generation
+        self._client_ready.clear()
+        api_key = self.api_key
 
-    def get_video_details(self, video_ids):
+        def build_client():
+            client = None
+            try:
+                service = build_from_document(self.discovery.document(), developerKey=api_key)
+                # Every call is metered against the daily quota ledger
+                client = ApiClient(service, self.quota, self.api_transport(), self.api_breaker)
+            except Exception as e:
+                self._client_error = e
+            if generation == self._client_generation:
+                self._youtube = client
+                self._client_ready.set()
+
+            # Revalidate the cached document after the client is up
+            if self.discovery.is_stale() and self.api_replay["mode"] != "replay":
+                try:
+                    self.discovery.refresh()
+                except Exception:
+                    pass
+
+        self._client_error = None
+        threading.Thread(target=build_client, daemon=True, name="yt-client-init").start()
+
+    def api_transport(self):
+        """The shared HTTP pool, or the record/replay stand-in when api_replay is on."""
+        settings = self.api_replay
+        if settings["mode"] not in ("replay", "record"):
+            return self.http_pool
+        return ReplayTransport(
+            settings.get("fixtures") or API_FIXTURE_DIR,
+            mode=settings["mode"],
+            pool=self.http_pool,
+            latency_ms=settings.get("latency_ms", 0),
+            error_rate=settings.get("error_rate", 0.0)
+        )
+
+    @property
+    def youtube(self):
+        self._client_ready.wait()
+        if self._youtube is None and self._client_error:
+            console.print(f"[red]Error initializing YouTube API: {self._client_error}[/red]")
+            self._client_error = None
+        return self._youtube
+
+    @youtube.setter
+    def youtube(self, client):
+        self._client_generation += 1
+        self._youtube = client
+        self._client_ready.set()
+
+    def get_video_details(self, video_ids, status=None):
         """
-        Fetches details (title, duration) for a list of video IDs.
-        Returns a dictionary mapping video_id -> {'title': str, 'duration': str}
+        Fetches details (title, duration, comment count) for a list of video IDs.
+        Returns a dictionary mapping video_id -> {'title': str, 'duration': str, 'comments': str}
+        Cached IDs are served from the metadata cache; only unseen IDs hit the API.
+        If status is given, a spinner with that text is shown while the API is queried.
         """
         if not video_ids:
             return {}
         
-        try:
-            # Join IDs with comma
-            ids_str = ",".join(video_ids)
-            request = self.youtube.videos().list(
-                part="snippet,contentDetails",
-                id=ids_str
-            )
-            response = request.execute()
-            
-            details = {}
-            for item in response.get("items", []):
-                vid_id = item["id"]
-                title = item["snippet"]["title"]
-                
-                # Parse duration
-                iso_dur = item["contentDetails"]["duration"]
-                dur = isodate.parse_duration(iso_dur)
-                
-                # Format duration (e.g., 0:04:13 -> 4:13)
-                total_seconds = int(dur.total_seconds())
-                minutes = total_seconds // 60
-                seconds = total_seconds % 60
-                formatted_dur = f"{minutes}:{seconds:02d}"
-                if minutes >= 60:
-                   hours = minutes // 60
-                   minutes = minutes % 60
-                   formatted_dur = f"{hours}:{minutes:02d}:{seconds:02d}"
-
-                details[vid_id] = {
-                    "title": title,
-                    "duration": formatted_dur
-                }
+        details = self.metadata_cache.get_many(video_ids)
+        missing = [v for v in dict.fromkeys(video_ids) if v not in details]
+        if not missing:
             return details
+
+        # API unreachable: answer from expired entries instead of waiting on timeouts
+        if self.api_breaker.is_open():
+            details.update(self.metadata_cache.get_many(missing, allow_stale=True))
+            return details
+        
+        try:
+            # Resolver splits into 50-ID chunks and runs them in parallel
+            if status:
+                with console.status(status):
+                    fetched = self.resolver.resolve(missing)
+            else:
+                fetched = self.resolver.resolve(missing)
+            details.update(fetched)
         except Exception as e:
-            console.print(f"[red]Error fetching details: {e}[/red]")
-            return {}
+            stale = self.metadata_cache.get_many(missing, allow_stale=True)
+            details.update(stale)
+            if not stale and not isinstance(e, CircuitOpenError):
+                console.print(f"[red]Error fetching details: {e}[/red]")
+        return details
+
+    def _fetch_and_cache_details(self, video_ids):
+        # Write-through before the in-flight entry is released, so late callers hit the cache
+        details = self.fetch_video_details(video_ids)
+        self.metadata_cache.put_many(details)
+        self.library.update_details(details)
+        return details
+
+    def fetch_video_details(self, video_ids):
+        """Queries videos().list for up to 50 IDs (no cache). Runs on resolver threads."""
+        # Join IDs with comma
+        ids_str = ",".join(video_ids)
+        # statistics costs no extra quota and saves Comments its own request
+        request = self.youtube.videos().list(
+            part="snippet,contentDetails,statistics",
+            id=ids_str,
+            fields="items(id,snippet(title),contentDetails(duration),statistics(commentCount))" # Partial response
+        )
+        response = request.execute()
+        
+        details = {}
+        for item in response.get("items", []):
+            vid_id = item["id"]
+            title = item["snippet"]["title"]
+            
+            # Parse duration
+            iso_dur = item["contentDetails"]["duration"]
+            dur = isodate.parse_duration(iso_dur)
+            
+            # Format duration (e.g., 0:04:13 -> 4:13)
+            formatted_dur = format_duration(dur.total_seconds())
+
+            details[vid_id] = {
+                "title": title,
+                "duration": formatted_dur,
+                "comments": item.get("statistics", {}).get("commentCount")
+            }
+        return details
 
     def sanitize_text(self, text):
         """
@@ -414,7 +577,7 @@ class YouTubeCLI:
             elif choice == "2":
                 PlayLink.play_link_ui(self)
             elif choice == "3":
-                Saved.saved_songs_ui(self)
+                Playlists.playlists_ui(self)
             elif choice == "4":
                 History.history_ui(self)
             elif choice == "5":
@@ -423,9 +586,14 @@ class YouTubeCLI:
                 Offline.offline_mode_ui(self)
             elif choice == "7":
                 speed_test.run_test(self.console, self.gui_style, InputHandler)
+            elif choice == "8":
+                Downloads.downloads_ui(self)
             elif choice == "0":
                 self.console.clear()
                 self.kill_proc(None)
+                self.writer.flush()
+                if self.downloads.has_active():
+                    console.print("[dim]Unfinished downloads will resume next time.[/dim]")
                 sys.exit(0)
 
     # Delegates to Function Modules (kept for compatibility or internal calls)
@@ -453,28 +621,25 @@ class YouTubeCLI:
             self.save_api_key(new_key)
 
     def remove_from_saved(self, video_id):
-        initial_len = len(self.saved_songs)
-        self.saved_songs = [s for s in self.saved_songs if s['id'] != video_id]
-        if len(self.saved_songs) < initial_len:
-            self.save_saved_songs()
+        if self.is_saved(video_id):
+            self.library.remove_saved(video_id)
             console.print("[green]Song removed from saved![/green]")
         else:
             console.print("[yellow]Song was not in saved list.[/yellow]")
         time.sleep(1)
 
     def is_saved(self, video_id):
-        return any(s['id'] == video_id for s in self.saved_songs)
+        return self.library.is_saved(video_id)
 
     def download_video(self, video_id, title):
         if not os.path.exists(DOWNLOAD_DIR):
             os.makedirs(DOWNLOAD_DIR)
             
-        # Check if file already exists (Basic sanitization for Windows check)
+        # Check if the video is already downloaded (manifest lookup by video ID)
         # Remove invalid chars for Windows filenames < > : " / \ | ? *
         clean_title = re.sub(r'[<>:"/\\|?*]', '', title)
-        target_file = os.path.join(DOWNLOAD_DIR, f"{clean_title}.mp3")
-        
-        if os.path.exists(target_file):
+
+        if self.get_download_status(title, video_id)["mp3"]:
              console.print(f"\n[yellow]File '{clean_title}.mp3' already exists![/yellow]")
              
              overwrite = "n"
@@ -525,61 +690,20 @@ class YouTubeCLI:
             return
             
         audio_quality = '320' if choice == '1' else '128'
-        
-        # Get path to bundled ffmpeg binary
-        ffmpeg_path = imageio_ffmpeg.get_ffmpeg_exe()
-        
-        ydl_opts = {
-            'format': 'bestaudio/best',
-            'outtmpl': os.path.join(DOWNLOAD_DIR, '%(title)s.%(ext)s'),
-            'ffmpeg_location': ffmpeg_path, # Explicitly tell yt-dlp where ffmpeg is
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': audio_quality,
-            }],
-            'quiet': True,
-            'no_warnings': True,
-        }
-        
-        try:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]{task.fields[filename]}", justify="right"),
-                BarColumn(bar_width=None),
-                "[progress.percentage]{task.percentage:>3.1f}%",
-                "•",
-                DownloadColumn(),
-                "•",
-                TransferSpeedColumn(),
-                "•",
-                TimeRemainingColumn(),
-                console=console
-            ) as progress:
-                task_id = progress.add_task("Downloading...", filename=title, start=False)
-                
-                def progress_hook(d):
-                    if d['status'] == 'downloading':
-                        total = d.get('total_bytes') or d.get('total_bytes_estimate')
-                        downloaded = d.get('downloaded_bytes', 0)
-                        if total:
-                            progress.update(task_id, total=total, completed=downloaded)
-                            progress.start_task(task_id)
-                    elif d['status'] == 'finished':
-                         progress.update(task_id, description="[green]Converting...[/green]", completed=None)
-
-                ydl_opts['progress_hooks'] = [progress_hook]
-
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    ydl.download([f"https://www.youtube.com/watch?v={video_id}"])
-            
-            console.print(f"[bold green]Download Complete![/bold green]")
-            console.print(f"Saved to: [underline]{DOWNLOAD_DIR}[/underline]")
-            time.sleep(2)
-        except Exception as e:
-            console.print(f"[bold red]Download Failed: {e}[/bold red]")
-            console.print("[dim]Make sure ffmpeg is installed/recognized if converting to mp3[/dim]")
-            time.sleep(3)
+        self.queue_download(video_id, title, "mp3", audio_quality)
+
+    def queue_download(self, video_id, title, kind, quality=None):
+        """Hands a download to the background manager and returns right away."""
+        job = self.downloads.enqueue(video_id, title, kind, quality)
+        if job:
+            console.print(f"[bold green]Queued {kind.upper()} download:[/bold green] {title}")
+            partial = self.downloads.partial_for(video_id, kind)
+            if partial:
+                console.print(f"[dim]Continuing the interrupted download ({format_bytes(partial)} already on disk).[/dim]")
+            console.print(f"[dim]{self.downloads.summary()} — see Downloads in the main menu[/dim]")
+        else:
+            console.print(f"[yellow]'{title}' is already in the download queue.[/yellow]")
+        time.sleep(1)
 
     def show_action_menu(self, selected_video, playlist=None, playlist_index=0):
         """
@@ -601,7 +725,8 @@ class YouTubeCLI:
                     {"key": "V", "action": "Watch Video (MP4) 📺"},
                     {"key": "C", "action": "Read Comments 💬"},
                     {"key": "2", "action": save_option_text},
-                    {"key": "3", "action": "Download MP3 ⬇️"},
+                    {"key": "L", "action": "Add to playlist ➕"},
+                    {"key": "3", "action": "Download Audio ⬇️"},
                     {"key": "4", "action": "Download Video (MP4) 🎞️"},
                     {"key": "0", "action": "Cancel"}
                 ]
@@ -616,8 +741,8 @@ class YouTubeCLI:
             
             else:
                 console.print(f"Selected: [bold]{title}[/bold]")
-                console.print(f"Actions:\n[1] Play Audio 🎵\n[V] Watch Video (MP4) 📺\n[C] Read Comments 💬\n[2] {save_option_text}\n[3] Download MP3\n[4] Download MP4\n[0] Cancel")
-                action = Prompt.ask("Select action", choices=["1", "V", "v", "C", "c", "2", "3", "4", "0"], default="1")
+                console.print(f"Actions:\n[1] Play Audio 🎵\n[V] Watch Video (MP4) 📺\n[C] Read Comments 💬\n[2] {save_option_text}\n[L] Add to playlist ➕\n[3] Download Audio\n[4] Download MP4\n[0] Cancel")
+                action = Prompt.ask("Select action", choices=["1", "V", "v", "C", "c", "2", "L", "l", "3", "4", "0"], default="1")
                 action = action.upper()
             
             if action == "1":
@@ -631,15 +756,16 @@ class YouTubeCLI:
             elif action == "V":
                 # Video Mode
                 # Check for local MP4 first
-                clean_title = re.sub(r'[<>:"/\\|?*]', '', title).strip()
-                local_mp4 = os.path.join(DOWNLOAD_DIR, f"{clean_title}.mp4")
-                
-                if os.path.exists(local_mp4):
+                local_mp4 = self.get_downloaded_path(title, video_id, kinds=("mp4",))
+
+                stream_args = []
+                if local_mp4:
                     url = local_mp4
                     source_type = "cis_local"
                 else:
                     url = f"https://www.youtube.com/watch?v={video_id}"
                     source_type = "cis_net"
+                    url, stream_args = self.video_stream(video_id, url)
                     
                 console.print("[dim]Stopping background audio utils...[/dim]")
                 if HAVE_REAL_VIZ and hasattr(self, 'audio_analyzer') and self.audio_analyzer:
@@ -648,7 +774,7 @@ class YouTubeCLI:
                          self.audio_analyzer = None
                      except: pass
                 
-                video_player.play_video(url, title, self.console)
+                video_player.play_video(url, title, self.console, extra_args=stream_args)
                 continue
             elif action == "C":
                 Comments.show_comments(self, video_id, title)
@@ -659,6 +785,9 @@ class YouTubeCLI:
                 else:
                     self.add_to_saved(video_id, title)
                 continue
+            elif action == "L":
+                Playlists.add_to_playlist_ui(self, selected_video)
+                continue
             elif action == "3":
                 self.download_content(video_id, title, "mp3")
                 continue
@@ -668,6 +797,34 @@ class YouTubeCLI:
             elif action == "0":
                 return
 
+    def video_stream(self, video_id, watch_url):
+        """
+        Direct stream URL(s) + mpv args for watching a video, from the shared
+        format cache, so mpv skips its own ytdl resolution. Falls back to the
+        watch URL (mpv resolves it) if extraction fails.
+        """
+        try:
+            info = self.format_cache.peek(video_id)
+            if not info:
+                with console.status("[bold blue]Resolving video stream...[/bold blue]"):
+                    info = self.format_cache.get(video_id)
+        except Exception:
+            return watch_url, []
+
+        requested = info.get("requested_formats")
+        if requested and len(requested) == 2 and requested[0].get("url") and requested[1].get("url"):
+            url, args = requested[0]["url"], [f"--audio-file={requested[1]['url']}"]
+        elif info.get("url"):
+            url, args = info["url"], []
+        else:
+            return watch_url, []
+
+        args += ["--ytdl=no", f"--force-media-title={info.get('title', video_id)}"]
+        user_agent = (info.get("http_headers") or {}).get("User-Agent")
+        if user_agent:
+            args.append(f"--user-agent={user_agent}")
+        return url, args
+
     def offline_mode_ui(self):
         if self.gui_style == "arrow":
             self.interactive_ui.offline_mode_ui()
@@ -696,71 +853,58 @@ class YouTubeCLI:
             return match.group(1)
         return None
 
+    def extract_playlist_id(self, url):
+        """Returns the `list=` playlist/mix ID of a YouTube URL, or None."""
+        match = re.search(r'[?&]list=([a-zA-Z0-9_-]+)', url)
+        if match:
+            return match.group(1)
+        return None
+
 
 
 
 
-    def get_downloaded_path(self, title):
+    def get_downloaded_path(self, title, video_id=None, kinds=AUDIO_EXTENSIONS + ("mp4",)):
         """
-        Checks if a song with the given title exists in the download directory.
+        Path of a downloaded copy (download manifest lookup), audio preferred.
         Returns absolute path if found, else None.
         """
-        if not title: return None
-        # Same sanitization as download_video
-        clean_title = re.sub(r'[<>:"/\\|?*]', '', title).strip()
-        
-        mp3_path = os.path.join(DOWNLOAD_DIR, f"{clean_title}.mp3")
-        if os.path.exists(mp3_path):
-            return mp3_path
-            
-        mp4_path = os.path.join(DOWNLOAD_DIR, f"{clean_title}.mp4")
-        if os.path.exists(mp4_path):
-            return mp4_path
-            
+        if not title and not video_id: return None
+        files = self.library.local_files_for(title, video_id)
+        for kind in kinds:
+            path = files.get(kind)
+            if not path:
+                continue
+            # About to be opened: one stat, and forget files deleted behind our back
+            if os.path.exists(path):
+                return path
+            self.library.remove_local_file(path)
         return None
 
-    def get_download_status(self, title):
-        """Returns dict indicating presence of mp3 and mp4."""
-        if not title: return {"mp3": False, "mp4": False}
-        clean_title = re.sub(r'[<>:"/\\|?*]', '', title).strip()
-        
-        mp3_path = os.path.join(DOWNLOAD_DIR, f"{clean_title}.mp3")
-        mp4_path = os.path.join(DOWNLOAD_DIR, f"{clean_title}.mp4")
-        
+    def get_download_status(self, title, video_id=None):
+        """
+        Returns dict indicating presence of audio ("mp3": MP3 or native M4A/Opus)
+        and mp4 (in-memory download manifest, keyed by video ID).
+        """
+        if not title and not video_id: return {"mp3": False, "mp4": False}
+        files = self.library.local_files_for(title, video_id)
         return {
-            "mp3": os.path.exists(mp3_path),
-            "mp4": os.path.exists(mp4_path)
+            "mp3": any(ext in files for ext in AUDIO_EXTENSIONS),
+            "mp4": "mp4" in files
         }
 
     def download_content(self, video_id, title, format_type='mp3'):
         """
-        Downloads content in specified format (mp3 or mp4).
+        Asks for a quality and queues the download (mp3 or mp4).
         fetches available qualities for MP4.
         """
-        if not os.path.exists(DOWNLOAD_DIR):
-            os.makedirs(DOWNLOAD_DIR)
-            
-        clean_title = re.sub(r'[<>:"/\\|?*]', '', title).strip()
-        output_template = os.path.join(DOWNLOAD_DIR, f"{clean_title}.%(ext)s")
-        
         # Check existence
-        ext = "mp3" if format_type == "mp3" else "mp4"
-        final_path = os.path.join(DOWNLOAD_DIR, f"{clean_title}.{ext}")
-        if os.path.exists(final_path):
-            console.print(f"[yellow]File already exists: {final_path}[/yellow]")
+        existing = self.get_downloaded_path(title, video_id, kinds=AUDIO_EXTENSIONS if format_type == "mp3" else ("mp4",))
+        if existing:
+            console.print(f"[yellow]File already exists: {existing}[/yellow]")
             time.sleep(1.5)
             return
 
-        # Common Options
-        ydl_opts = {
-            'outtmpl': output_template,
-            'quiet': True,
-            'no_warnings': True,
-            'ffmpeg_location': imageio_ffmpeg.get_ffmpeg_exe()
-        }
-        
-        msg = f"Downloading {format_type.upper()}..."
-
         # MP3 Quality Selection
         if format_type == "mp3":
             qualities = [
@@ -768,6 +912,7 @@ class YouTubeCLI:
                 {"key": "2", "label": "256 kbps", "val": "256"},
                 {"key": "3", "label": "192 kbps (Standard)", "val": "192"},
                 {"key": "4", "label": "128 kbps", "val": "128"},
+                {"key": "5", "label": "Original (Opus/M4A, no re-encoding)", "val": "native"},
                 {"key": "0", "label": "Cancel", "val": "0"}
             ]
             
@@ -791,23 +936,21 @@ class YouTubeCLI:
                     selected_kbps = q["val"]
                     break
             
-            msg = f"Downloading MP3 ({selected_kbps} kbps)..."
-            
-            ydl_opts.update({
-                'format': 'bestaudio/best',
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': selected_kbps,
-                }],
-            })
+            if selected_kbps == "native":
+                # Keeps the downloaded stream as-is: done as soon as the bytes land
+                self.queue_download(video_id, title, "audio")
+            else:
+                self.queue_download(video_id, title, "mp3", selected_kbps)
             
         else: # This is the MP4 logic
             # Video (MP4) - Fetch Formats First
+            selected_height = None
             try:
-                with console.status("[bold blue]Checking available qualities...[/bold blue]"):
-                    with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True}) as ydl:
-                        info = ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
+                # Cached for the download itself (and video playback)
+                info = self.format_cache.peek(video_id)
+                if not info:
+                    with console.status("[bold blue]Checking available qualities...[/bold blue]"):
+                        info = self.format_cache.get(video_id)
                         
                 formats = info.get('formats', [])
                 available_heights = set()
@@ -829,10 +972,6 @@ class YouTubeCLI:
                 for i, h in enumerate(sorted_heights, 1):
                     qualities.append({"key": str(i), "label": f"{h}p", "height": h})
                 
-                # Add "Best" fallback if empty (unlikely) or as top option? 
-                # User asked for SPECIFIC options only.
-                
-                selected_height = None
                 choice = "0"
                 
                 if not qualities:
@@ -861,76 +1000,14 @@ class YouTubeCLI:
                     if q["key"] == choice:
                         selected_height = q["height"]
                         break
-                
-                if selected_height:
-                    # Specific height
-                    fmt = f'bestvideo[height={selected_height}][ext=mp4]+bestaudio[ext=m4a]/best[height={selected_height}][ext=mp4]/best[height={selected_height}]'
-                    msg = f"Downloading Video ({selected_height}p)..."
-                else:
-                    # Fallback
-                    fmt = 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best'
-                    msg = "Downloading Video (Best)..."
-
-                ydl_opts.update({
-                    'format': fmt,
-                    'merge_output_format': 'mp4',
-                })
 
             except Exception as e:
                 console.print(f"[red]Error fetching formats: {e}[/red]")
                 # Fallback to generic best
-                ydl_opts.update({
-                    'format': 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best',
-                    'merge_output_format': 'mp4',
-                })
-                msg = "Downloading Video (Best - Fallback)..."
+                console.print("[dim]Queueing best available quality instead.[/dim]")
 
-
-        try:
-            # Progress Hook Logic
-            # We need to define it here to capture the 'progress' object scope or use a class attribute
-            # But simpler: use a context manager and a local hook
-            
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]{task.fields[desc]}", justify="right"),
-                BarColumn(bar_width=None),
-                "[progress.percentage]{task.percentage:>3.1f}%",
-                "•",
-                DownloadColumn(),
-                "•",
-                TransferSpeedColumn(),
-                "•",
-                TimeRemainingColumn(),
-                console=console
-            ) as progress:
-                
-                task_id = progress.add_task("Starting...", total=None, desc=msg)
-                
-                def progress_hook(d):
-                    if d['status'] == 'downloading':
-                        try:
-                            total = d.get('total_bytes') or d.get('total_bytes_estimate')
-                            downloaded = d.get('downloaded_bytes', 0)
-                            
-                            progress.update(task_id, total=total, completed=downloaded, desc=msg)
-                        except: pass
-                        
-                    elif d['status'] == 'finished':
-                        progress.update(task_id, total=None, completed=None, desc="Processing...")
-
-                ydl_opts['progress_hooks'] = [progress_hook]
-                # Ensure quiet is True so we don't conflict, but we removed console.status wrapper
-                ydl_opts['quiet'] = True
-                
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    ydl.download([f"https://www.youtube.com/watch?v={video_id}"])
-            
-            console.print(f"[bold green]Download Complete ({format_type.upper()})![/bold green]")
-            time.sleep(1.5)
-        except Exception as e:
-            console.print(f"[bold red]Download Error:[/bold red] {e}")
-            time.sleep(3)
+            # None = best available
+            self.queue_download(video_id, title, "mp4", selected_height)
 
 
     def get_track_duration(self, path):
@@ -1110,20 +1187,36 @@ class YouTubeCLI:
 
 
 
+    def _queue_has_next(self, queue, idx):
+        """True if queue[idx] exists, waiting for streaming (playlist) queues to catch up."""
+        if idx < len(queue):
+            return True
+        if not hasattr(queue, "wait_for") or queue.done:
+            return False
+        with console.status("[bold blue]Loading playlist...[/bold blue]", spinner="dots"):
+            return queue.wait_for(idx)
+
+    def _queue_has_more(self, queue, idx):
+        """Non-blocking: could queue[idx] still be played (already there or still loading)?"""
+        return idx < len(queue) or (hasattr(queue, "wait_for") and not queue.done)
+
     def play_queue(self, queue, start_index=0, enable_autoplay=True):
         idx = start_index
         
-        while idx < len(queue) or enable_autoplay:
+        while self._queue_has_next(queue, idx) or enable_autoplay:
             # Determine next video
             video = None
-            if idx < len(queue):
+            if self._queue_has_next(queue, idx):
                 video = queue[idx]
                 idx += 1
                 is_queue_item = True
-            elif enable_autoplay and self.current_video_id and self.history:
-                 current_title = self.history[-1]["title"]
-                 with console.status("[bold blue]Finding next song...[/bold blue]", spinner="earth"):
-                     next_vid = self.get_related_video(self.current_video_id, current_title)
+            elif enable_autoplay and self.current_video_id and self.last_played():
+                 current_title = self.last_played()["title"]
+                 # Normally already resolved in the background while the last track played
+                 next_vid = self.autoplay_queue.take(self.current_video_id, current_title, wait=False)
+                 if not next_vid:
+                     with console.status("[bold blue]Finding next song...[/bold blue]", spinner="earth"):
+                         next_vid = self.autoplay_queue.take(self.current_video_id, current_title)
                      
                  if next_vid:
                      video = next_vid
@@ -1136,7 +1229,7 @@ class YouTubeCLI:
 
             video_id = video.get("id") 
             title = video["title"]
-            local_path = self.get_downloaded_path(title)
+            local_path = self.get_downloaded_path(title, video_id)
             
             # Explicit local path provided in queue item (legacy 'path' or 'url' if no ID)
             if not video_id:
@@ -1146,16 +1239,38 @@ class YouTubeCLI:
                     local_path = video["url"]
 
             self.current_video_id = video_id
+            play_event = None
             if video_id: 
-                self.add_to_history(video_id, title)
+                play_event = self.add_to_history(video_id, title)
+                # Line up the next autoplay track while this one plays
+                if enable_autoplay and not self._queue_has_more(queue, idx):
+                    # A track the user picked (not an autoplay one) seeds a fresh pool
+                    self.autoplay_queue.prime(video_id, title, reseed=is_queue_item)
             
             # console.clear() # Removed to keep flow smooth, Live(screen=True) handles it
             
             source_msg = "[bold cyan]Playing from Local File 📂[/bold cyan]" if local_path else "[bold red]Streaming from YouTube 📡[/bold red]"
             # Removed static print to prevent ghosting on main buffer. UI is handled by Live loop.
             
+            stream_args = []
+            # Already extracted (quality menu / video / download): reuse its audio stream
+            cached_info = self.format_cache.peek(video_id) if video_id and not local_path else None
+            cached_stream = best_audio(cached_info) if cached_info else None
             if local_path:
                 url = local_path
+            elif video.get("stream_url") and video.get("stream_expires", 0) > time.time() + 60:
+                # Pre-resolved by the autoplay queue: skip mpv's own ytdl lookup
+                url = video["stream_url"]
+                stream_args = ["--ytdl=no", f"--force-media-title={title}"]
+                user_agent = (video.get("stream_headers") or {}).get("User-Agent")
+                if user_agent:
+                    stream_args.append(f"--user-agent={user_agent}")
+            elif cached_stream:
+                url = cached_stream["url"]
+                stream_args = ["--ytdl=no", f"--force-media-title={title}"]
+                user_agent = (cached_stream.get("http_headers") or {}).get("User-Agent")
+                if user_agent:
+                    stream_args.append(f"--user-agent={user_agent}")
             else:
                 url = f"https://www.youtube.com/watch?v={video_id}"
                 
@@ -1182,6 +1297,7 @@ class YouTubeCLI:
             InputHandler.flush()
             
             song_start_time = time.time()
+            elapsed = 0
             cooldown_seconds = 5 if os.name == 'nt' else 2.5
             last_key_time = 0
             
@@ -1198,6 +1314,7 @@ class YouTubeCLI:
                     "--demuxer-max-bytes=128MiB",   # 128MB buffer
                     "--demuxer-readahead-secs=20",  # Read ahead 20s
                     "--audio-buffer=1",             # 1s audio buffer (prevents underruns)
+                    *stream_args,
                     url
                 ]
                 
@@ -1214,6 +1331,10 @@ class YouTubeCLI:
                      try:
                         if isinstance(video["duration"], (int, float)):
                                 total_seconds = float(video["duration"])
+                        elif ":" in video["duration"]:
+                                # "M:SS" / "H:MM:SS" from get_video_details
+                                parts = [int(p) for p in video["duration"].split(":")]
+                                total_seconds = float(sum(p * 60 ** i for i, p in enumerate(reversed(parts))))
                         else:
                                 total_seconds = isodate.parse_duration(video["duration"]).total_seconds()
                      except: pass
@@ -1235,6 +1356,7 @@ class YouTubeCLI:
                 # CRITICAL FIX: Initialize elapsed OUTSIDE the loop to prevent resetting
                 elapsed = 0
                 last_duration_check = 0
+                last_cache_check = 0
                 
                 # Safety: Clear Main Buffer ensures no "Ghost text" remains when we switch back from Alt Buffer
                 console.clear()
@@ -1262,6 +1384,15 @@ class YouTubeCLI:
                         buf_res = self.send_ipc_command(ipc_path, {"command": ["get_property", "paused-for-cache"]})
                         if buf_res and buf_res.get("data") is True:
                             is_buffering = True # Timer will hold steady
+
+                        # Let background downloads yield when the stream runs low
+                        if not local_path and time.time() - last_cache_check > 1:
+                            last_cache_check = time.time()
+                            cache_res = self.send_ipc_command(ipc_path, {"command": ["get_property", "demuxer-cache-duration"]})
+                            cache_seconds = None
+                            if cache_res and isinstance(cache_res.get("data"), (int, float)):
+                                cache_seconds = float(cache_res["data"])
+                            self.bandwidth.report_playback(is_buffering, cache_seconds)
                             
                         # Get Time Position from MPV
                         if not is_buffering:
@@ -1325,6 +1456,9 @@ class YouTubeCLI:
                             Text("\n"),
                             controls_render
                         )
+                        download_status = self.downloads.summary()
+                        if download_status:
+                            panel_content = Group(panel_content, Text(download_status, style="dim cyan", justify="center"))
                         live.update(Panel(panel_content, border_style="green"))
                         
                         # Handle Input
@@ -1387,6 +1521,8 @@ class YouTubeCLI:
                 time.sleep(2)
             finally:
                 self.kill_proc(proc)
+                self.bandwidth.playback_stopped()
+                self.history_store.finish_play(play_event, elapsed)
                 if self.audio_analyzer:
                      self.audio_analyzer.close()
                      self.audio_analyzer = None
@@ -1399,202 +1535,82 @@ class YouTubeCLI:
     def play_video(self, video_id, title):
         self.play_queue([{"id": video_id, "title": title}], start_index=0, enable_autoplay=self.autoplay)
 
-    def get_related_video(self, video_id, current_title=None):
+    def get_search_backend(self):
         """
-        Finds a related video to play next.
-        Since 'relatedToVideoId' is deprecated, we search for the current title to find similar songs.
+        Returns the search backend to use right now.
+        'auto' picks the fastest measured backend among the Data API (while
+        the quota allows searches) and yt-dlp; a fixed choice falls back to
+        yt-dlp when it is unavailable.
         """
-        if not current_title:
-             console.print("[yellow]No title info for autoplay, skipping...[/yellow]")
-             return None
+        pref = self.search_backend_pref
+        if pref in self.search_backends and self.search_backends[pref].available():
+            return self.search_backends[pref]
+        if pref == "auto":
+            fastest = pick_fastest([self.search_backends["api"], self.search_backends["ytdlp"]])
+            if fastest:
+                return fastest
+        return self.search_backends["ytdlp"]
+
+    def fallback_search_backend(self, failed):
+        """In 'auto' mode a failed Data API search is retried with yt-dlp; otherwise None."""
+        if self.search_backend_pref == "auto" and failed.name == "api":
+            return self.search_backends["ytdlp"]
+        return None
 
-        console.print("[yellow]Finding recommendations...[/yellow]")
-        try:
-            # Search for similar content
-            # Adding "mix" or "radio" or "official audio" can help find relevant music
-            request = self.youtube.search().list(
-                part="snippet",
-                q=f"{current_title} official audio", 
-                type="video",
-                maxResults=10
-            )
-            response = request.execute()
-            items = response.get("items", [])
-            
-            # Avoid loops
-            recent_ids = [h['id'] for h in self.history[-20:]] # Check last 20 songs
+    def recent_history_ids(self, count=20):
+        return self.history_store.recent_ids(count)
 
+    def get_related_candidates(self, video_id, current_title, limit=10):
+        """
+        Returns candidate tracks [{id, title, duration}] to follow video_id,
+        skipping the current video and recently played ones.
+        The local recommendation graph is asked first; only when it has no
+        fresh candidates does this run one related search.
+        Silent (used from background threads); raises on search errors
+        unless the graph has any (even recently played) neighbour to offer.
+        """
+        # Avoid loops
+        recent_ids = self.recent_history_ids(20) # Check last 20 songs
+        
+        local = self.recommender.next_candidates(video_id, exclude=recent_ids, limit=limit)
+        if local:
+            return local
+        
+        # Adding "mix" or "radio" or "official audio" can help find relevant music
+        backend = self.get_search_backend()
+        query = f"{current_title} official audio"
+        try:
+            try:
+                items, _ = backend.search(query, limit)
+            except Exception:
+                fallback = self.fallback_search_backend(backend)
+                if not fallback:
+                    raise
+                items, _ = fallback.search(query, limit)
+        except Exception:
+            # Degraded network: a recently played neighbour beats silence
+            fallback = self.recommender.next_candidates(video_id, limit=limit)
+            if fallback:
+                return fallback
+            raise
+        
+        candidates = [
+            {"id": item["id"], "title": item["title"], "duration": item.get("duration")}
+            for item in items
+            if item["id"] != video_id and item["id"] not in recent_ids
+        ]
+        
+        # If all are in history, just pick the first different one to keep playing something
+        if not candidates:
             for item in items:
-                 vid_id = item["id"]["videoId"]
-                 # Skip if effectively the same video or recently played
-                 if vid_id != video_id and vid_id not in recent_ids:
-                     return {
-                         "id": vid_id,
-                         "title": item["snippet"]["title"]
-                     }
-            
-            # If all 10 are in history, just pick the first different one to keep playing something
-            if items:
-                 first = items[0]
-                 if first["id"]["videoId"] != video_id:
-                      return {"id": first["id"]["videoId"], "title": first["snippet"]["title"]}
-
-        except Exception as e:
-            console.print(f"[red]Autoplay Search Error: {e}[/red]")
-            
-        return None
+                if item["id"] != video_id:
+                    candidates.append({"id": item["id"], "title": item["title"], "duration": item.get("duration")})
+                    break
+        return candidates
 
     def play_previous(self):
-        page = 0
-        current_idx = 0
-        page_size = 20
-        
-        while True:
-            if not self.history:
-                console.print("[yellow]No history available.[/yellow]")
-                time.sleep(2)
-                return
-
-            rev_history = list(reversed(self.history))
-            total_items = len(rev_history)
-            max_page = (total_items - 1) // page_size
-            
-            # Clamp page
-            if page < 0: page = 0
-            if page > max_page: page = max_page
-            
-            start = page * page_size
-            end = start + page_size
-            display_items = rev_history[start:end]
-            
-            # Fetch durations (with loading indicator)
-            ids = [item["id"] for item in display_items]
-            details = {}
-            with console.status("[bold blue]Loading history details...[/bold blue]"):
-                details = self.get_video_details(ids)
-
-            if self.gui_style == "arrow":
-                options = []
-                # Add content items
-                for idx, item in enumerate(display_items, start + 1):
-                    vid_id = item["id"]
-                    title_full = item["title"]
-                    title = self.sanitize_text(title_full)
-                    duration = details.get(vid_id, {}).get("duration", "N/A")
-                    saved_mark = "Yes" if self.is_saved(vid_id) else ""
-                    
-                    dl_status = self.get_download_status(title_full)
-                    mp3_mark = "[green]Yes[/green]" if dl_status["mp3"] else "[red]No[/red]"
-                    mp4_mark = "[green]Yes[/green]" if dl_status["mp4"] else "[red]No[/red]"
-                    
-                    options.append({
-                        "key": str(idx),
-                        "no": str(idx),
-                        "title": title,
-                        "dur": duration,
-                        "saved": saved_mark,
-                        "mp3": mp3_mark,
-                        "mp4": mp4_mark,
-                        "raw_item": item,
-                        "type": "content"
-                    })
-                
-                # Add Navigation Items
-                if page < max_page:
-                    options.append({"key": "n", "no": ">>", "title": "[bold cyan]Next Page[/bold cyan]", "type": "nav", "dur": "", "saved": "", "mp3": "", "mp4": ""})
-                if page > 0:
-                    options.append({"key": "p", "no": "<<", "title": "[bold cyan]Prev Page[/bold cyan]", "type": "nav", "dur": "", "saved": "", "mp3": "", "mp4": ""})
-                
-                options.append({"key": "0", "no": "←", "title": "[ Back ]", "type": "nav", "dur": "", "saved": "", "mp3": "", "mp4": ""})
-
-                cols = [
-                    ("No.", "no", 4, "right"),
-                    ("Title", "title", 100, "left"),
-                    ("Duration", "dur", 8, "center"),
-                    ("Saved", "saved", 6, "center"),
-                    ("Mp3", "mp3", 6, "center"),
-                    ("Mp4", "mp4", 6, "center")
-                ]
-                
-                title_text = f"History (Page {page + 1}/{max_page + 1})"
-                
-                # We need to default selection to top of list when changing pages?
-                # Or keep index? generic function keeps index. 
-                # Let's just pass 0 for now.
-                if current_idx >= len(options): current_idx = len(options) - 1
-                selected_item, current_idx = self.render_interactive_menu(title_text, options, cols, current_idx)
-                if not selected_item: return
-                
-                choice = selected_item["key"]
-                
-                if choice == "n":
-                    page += 1
-                elif choice == "p":
-                    page -= 1
-                elif choice == "0":
-                    return
-                elif selected_item.get("type") == "content":
-                    selected = selected_item["raw_item"]
-                    self.show_action_menu(selected)
-                
-            else:
-                console.clear()
-                
-                table = Table(title=f"Play History (Page {page + 1}/{max_page + 1})", box=box.ROUNDED)
-                table.add_column("No.", style="cyan", no_wrap=True, width=4)
-                table.add_column("Title", style="white", width=100, overflow="ellipsis", no_wrap=True)
-                table.add_column("Duration", style="yellow", width=8, no_wrap=True)
-                table.add_column("Saved", style="green", width=6, justify="center")
-                table.add_column("Mp3", justify="center", width=8)
-                table.add_column("Mp4", justify="center", width=8)
-                
-                for idx, item in enumerate(display_items, start + 1): 
-                    vid_id = item["id"]
-                    title_full = item["title"]
-                    title = self.sanitize_text(title_full)
-                    duration = details.get(vid_id, {}).get("duration", "N/A")
-                    saved_mark = "Yes" if self.is_saved(vid_id) else ""
-                    
-                    dl_status = self.get_download_status(title_full)
-                    mp3_mark = "[green]Yes[/green]" if dl_status["mp3"] else "[red]No[/red]"
-                    mp4_mark = "[green]Yes[/green]" if dl_status["mp4"] else "[red]No[/red]"
-                    
-                    table.add_row(str(idx), title, duration, saved_mark, mp3_mark, mp4_mark)
-                    
-                console.print(table)
-                console.print("[dim]Enter number to select, 'n' For Next, 'p' for Prev, 'c' to Back[/dim]")
-                
-                # Allow n/p always to handle custom error messages
-                valid_choices = [str(i) for i in range(start + 1, end + 1)] + ["c", "n", "p"]
-                
-                choice = Prompt.ask("Select option", choices=valid_choices)
-                
-                if choice == "c":
-                    return
-                elif choice == "n":
-                    if page < max_page:
-                        page += 1
-                    else:
-                        console.print("[yellow]You have reached the end of the history list.[/yellow]")
-                        time.sleep(1.5)
-                elif choice == "p":
-                    if page > 0:
-                        page -= 1
-                    else:
-                         console.print("[yellow]You are already on the first page.[/yellow]")
-                         time.sleep(1.5)
-                else:
-                    idx = int(choice)
-                    # Find item in ORIGINAL full list OR use display_items
-                    # index in display_items = idx - start - 1
-                    local_idx = idx - start - 1
-                    if 0 <= local_idx < len(display_items):
-                        selected = display_items[local_idx]
-                        self.show_action_menu(selected)
-                    else:
-                         # Should be covered by valid_choices, but safety net
-                         console.print("[red]Invalid selection.[/red]")
-                         time.sleep(1)
+        # Legacy entry point: same paged browser as the History menu
+        History.history_ui(self)
 
 if __name__ == "__main__":
     app = YouTubeCLI(console)
@@ -0,0 +1,45 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Core.Library import read_media_tags
+
+imageio_ffmpeg = pytest.importorskip("imageio_ffmpeg")
+pytest.importorskip("mutagen")
+
+DECOY = "Original upload: https://youtu.be/AAAAAAAAAAA\nhttps://www.youtube.com/watch?v=AAAAAAAAAAA"
+URL = "https://www.youtube.com/watch?v=BBBBBBBBBBB"
+
+def _tagged_file(tmp_path, ext, description=DECOY):
+    """A short tone tagged the way yt-dlp's FFmpegMetadata tags a download."""
+    path = str(tmp_path / f"song.{ext}")
+    subprocess.run([
+        imageio_ffmpeg.get_ffmpeg_exe(), "-loglevel", "error", "-f", "lavfi", "-i", "sine=d=1",
+        "-metadata", f"description={description}", "-metadata", f"synopsis={description}",
+        "-metadata", f"purl={URL}", "-metadata", f"comment={URL}", path
+    ], check=True)
+    return path
+
+@pytest.mark.parametrize("ext", ["mp3", "m4a", "opus"])
+def test_id_comes_from_purl_or_comment_not_description(tmp_path, ext):
+    video_id, duration = read_media_tags(_tagged_file(tmp_path, ext))
+    assert video_id == "BBBBBBBBBBB"
+    assert duration and duration > 0.5
+
+def test_untagged_file_has_no_id(tmp_path):
+    path = str(tmp_path / "plain.mp3")
+    subprocess.run([imageio_ffmpeg.get_ffmpeg_exe(), "-loglevel", "error", "-f", "lavfi", "-i", "sine=d=1", path], check=True)
+    assert read_media_tags(path)[0] is None
+
+def test_stored_id_wins_over_tag(tmp_path):
+    from Core.Library import LibraryDB
+    path = _tagged_file(tmp_path, "mp3")
+    library = LibraryDB(str(tmp_path / "library.db"))
+    library.add_local_file(path, "CCCCCCCCCCC")
+    os.utime(path, (1, 1)) # Looks modified: the next scan re-reads the tags
+    library.sync_local_files(str(tmp_path))
+    assert library.local_file(path)["video_id"] == "CCCCCCCCCCC"
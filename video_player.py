@@ -4,10 +4,11 @@ import time
 from rich.console import Console
 from rich.panel import Panel
 
-def play_video(url, title, console: Console):
+def play_video(url, title, console: Console, extra_args=None):
     """
     Launches MPV in video mode (windowed).
     This function blocks until the MPV window is closed.
+    extra_args: mpv options for pre-resolved streams (e.g. --audio-file, --ytdl=no).
     """
     source_msg = "[bold red]Streaming from YouTube 📡[/bold red]"
     if os.path.exists(url):
@@ -23,7 +24,8 @@ def play_video(url, title, console: Console):
         "--force-window",  # Ensure window opens even for audio-only inputs (though we expect video)
         "--title=YouTube CLI - " + title,
         "--osc",           # On Screen Controller
-        "--no-terminal"    # Verify if we want terminal output. Usually clean is better.
+        "--no-terminal",   # Verify if we want terminal output. Usually clean is better.
+        *(extra_args or [])
     ]
     
     try: